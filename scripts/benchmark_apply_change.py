@@ -0,0 +1,137 @@
+#!/usr/bin/env python
+
+"""Time applyChange() over a trace of final edits, as FontHandler applies them.
+
+The trace is read from a JSON-lines file with one change per line, such as a
+change journal written by `fontra --change-journal`. Without a trace file, a
+trace is made up from the glyphs of the font: point drags, advance width edits
+and component moves, for every layer of every glyph.
+
+    scripts/benchmark_apply_change.py test-py/data/mutatorsans/MutatorSans.designspace
+"""
+
+import argparse
+import asyncio
+import json
+import pathlib
+import time
+from copy import deepcopy
+
+from fontra.backends import getFileSystemBackend
+from fontra.core.changes import applyChange, collectChangePaths
+from fontra.core.classes import Font
+
+rootDataGetters = {
+    "axes": "getAxes",
+    "customData": "getCustomData",
+    "fontInfo": "getFontInfo",
+    "glyphMap": "getGlyphMap",
+    "sources": "getSources",
+    "unitsPerEm": "getUnitsPerEm",
+}
+
+
+def makeTrace(glyphs):
+    trace = []
+    for glyphName, glyph in glyphs.items():
+        for layerName, layer in glyph.layers.items():
+            glyphPath = ["glyphs", glyphName, "layers", layerName, "glyph"]
+            coordinates = layer.glyph.path.coordinates
+            trace.append(
+                {
+                    "p": glyphPath + ["path"],
+                    "c": [
+                        {"f": "=xy", "a": [i // 2, x + 10, y + 10]}
+                        for i, x, y in zip(
+                            range(0, len(coordinates), 2),
+                            coordinates[::2],
+                            coordinates[1::2],
+                        )
+                    ],
+                }
+            )
+            trace.append(
+                {"p": glyphPath, "f": "=", "a": ["xAdvance", layer.glyph.xAdvance + 10]}
+            )
+            for componentIndex, component in enumerate(layer.glyph.components):
+                trace.append(
+                    {
+                        "p": glyphPath
+                        + ["components", componentIndex, "transformation"],
+                        "c": [
+                            {"f": "=", "a": ["translateX", 10]},
+                            {"f": "=", "a": ["translateY", 10]},
+                        ],
+                    }
+                )
+    return trace
+
+
+async def loadSubjects(backend, trace):
+    # Load the data the changes apply to, like FontHandler does
+    paths = [path for change in trace for path in collectChangePaths(change, 2)]
+    glyphNames = sorted(
+        {path[1] for path in paths if path[0] == "glyphs" and len(path) > 1}
+    )
+    glyphs = {glyphName: await backend.getGlyph(glyphName) for glyphName in glyphNames}
+    rootData = {}
+    for rootKey in sorted({path[0] for path in paths} - {"glyphs"}):
+        rootData[rootKey] = await getattr(backend, rootDataGetters[rootKey])()
+    return glyphs, rootData
+
+
+def makeRootObject(glyphs, rootData):
+    rootObject = Font()
+    rootObject.glyphs = deepcopy(glyphs)
+    for rootKey, value in rootData.items():
+        setattr(rootObject, rootKey, deepcopy(value))
+    return rootObject
+
+
+def benchmark(trace, glyphs, rootData, rounds):
+    timings = []
+    for _ in range(rounds):
+        rootObject = makeRootObject(glyphs, rootData)
+        t = time.perf_counter()
+        for change in trace:
+            applyChange(rootObject, change)
+        timings.append(time.perf_counter() - t)
+    return min(timings)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("font", help="The font to apply the changes to")
+    parser.add_argument("--trace", help="A JSON-lines file with one change per line")
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    backend = getFileSystemBackend(pathlib.Path(args.font).resolve())
+    if args.trace:
+        lines = pathlib.Path(args.trace).read_text(encoding="utf-8").splitlines()
+        trace = [json.loads(line) for line in lines if line]
+    else:
+        glyphMap = await backend.getGlyphMap()
+        trace = makeTrace(
+            {glyphName: await backend.getGlyph(glyphName) for glyphName in glyphMap}
+        )
+    glyphs, rootData = await loadSubjects(backend, trace)
+    await backend.aclose()
+
+    numChanges = sum(1 for change in trace for _ in iterLeafChanges(change))
+    seconds = benchmark(trace, glyphs, rootData, args.rounds)
+    print(
+        f"{len(trace)} changes, {numChanges} operations: {seconds * 1000:.2f} ms, "
+        f"{seconds / numChanges * 1_000_000:.2f} µs per operation"
+    )
+
+
+def iterLeafChanges(change):
+    if "f" in change:
+        yield change
+    for childChange in change.get("c", []):
+        yield from iterLeafChanges(childChange)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+
+"""Time reading the .glif files of a UFO or .designspace, with glifLib and a
+point pen, and with the fast outline reader the designspace backend uses.
+
+Both readers are run for every glyph of every UFO layer, and their results are
+checked to be the same.
+
+    scripts/benchmark_glif_parsing.py test-py/data/mutatorsans/MutatorSans.designspace
+"""
+
+import argparse
+import pathlib
+import time
+
+from fontTools.designspaceLib import DesignSpaceDocument
+from fontTools.ufoLib import UFOReader
+
+from fontra.backends.designspace import UFOGlyph, readGlyphAndPath
+from fontra.backends.ufo_utils import splitGLIFOutline
+from fontra.core.path import PackedPathPointPen
+
+
+def getGlyphSets(fontPath):
+    if fontPath.suffix == ".designspace":
+        dsDoc = DesignSpaceDocument.fromfile(fontPath)
+        ufoPaths = list(dict.fromkeys(source.path for source in dsDoc.sources))
+    else:
+        ufoPaths = [fontPath]
+    glyphSets = []
+    for ufoPath in ufoPaths:
+        reader = UFOReader(ufoPath, validate=False)
+        for layerName in reader.getLayerNames():
+            glyphSets.append(reader.getGlyphSet(layerName, validateRead=False))
+    return glyphSets
+
+
+def readWithGlifLib(glyphSet, glyphName):
+    glyph = UFOGlyph()
+    pen = PackedPathPointPen()
+    glyphSet.readGlyph(glyphName, glyph, pen, validate=False)
+    return glyph, pen.getPath(), pen.components
+
+
+def readWithFastReader(glyphSet, glyphName):
+    glyph = UFOGlyph()
+    path, components = readGlyphAndPath(glyphSet, glyphName, glyph)
+    return glyph, path, components
+
+
+def benchmark(readFunc, glyphSets, rounds):
+    timings = []
+    for _ in range(rounds):
+        t = time.perf_counter()
+        for glyphSet in glyphSets:
+            for glyphName in glyphSet.keys():
+                readFunc(glyphSet, glyphName)
+        timings.append(time.perf_counter() - t)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("font", help="A .ufo or .designspace file")
+    parser.add_argument("--rounds", type=int, default=10)
+    args = parser.parse_args()
+
+    glyphSets = getGlyphSets(pathlib.Path(args.font).resolve())
+
+    numGlyphs = 0
+    numFallbacks = 0
+    for glyphSet in glyphSets:
+        for glyphName in glyphSet.keys():
+            numGlyphs += 1
+            if splitGLIFOutline(glyphSet.getGLIF(glyphName)) is None:
+                numFallbacks += 1
+            if readWithGlifLib(glyphSet, glyphName) != readWithFastReader(
+                glyphSet, glyphName
+            ):
+                print(f"results differ for {glyphName!r} in {glyphSet.dirName}")
+
+    print(f"{numGlyphs} glyphs, {numFallbacks} read with glifLib by the fast reader")
+    for readFunc in [readWithGlifLib, readWithFastReader]:
+        seconds = benchmark(readFunc, glyphSets, args.rounds)
+        print(
+            f"{readFunc.__name__}: {seconds * 1000:.2f} ms, "
+            f"{seconds / numGlyphs * 1_000_000:.2f} µs per glyph"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,7 @@ from importlib.metadata import entry_points
 from . import __version__ as fontraVersion
 from .core.protocols import ProjectManager, ProjectManagerFactory
 from .core.server import FontraServer, findFreeTCPPort
+from .core.subprocess import configureProcessPool
 
 DEFAULT_PORT = 8000
 
@@ -27,6 +28,30 @@ def main() -> None:
     parser.add_argument(
         "--launch", action="store_true", help="Launch the default browser"
     )
+    parser.add_argument(
+        "--process-pool-size",
+        type=int,
+        help="The number of worker processes for background jobs. "
+        "Defaults to the number of CPUs",
+    )
+    parser.add_argument(
+        "--process-pool-max-tasks-per-child",
+        type=int,
+        help="Restart a worker process after it has run this many jobs "
+        "(requires Python 3.11 or later)",
+    )
+    parser.add_argument(
+        "--process-pool-warm-up",
+        action="store_true",
+        help="Start the worker processes at server startup, instead of on demand",
+    )
+    parser.add_argument(
+        "--no-websocket-compression",
+        dest="websocket_compression",
+        action="store_false",
+        help="Don't compress websocket messages (permessage-deflate). Compression "
+        "helps for remote clients on slow links, but costs CPU time",
+    )
     parser.add_argument(
         "-V",
         "--version",
@@ -51,12 +76,18 @@ def main() -> None:
     host = args.host
     httpPort = args.http_port
     manager: ProjectManager = args.getProjectManager(args)
+    configureProcessPool(
+        maxWorkers=args.process_pool_size,
+        maxTasksPerChild=args.process_pool_max_tasks_per_child,
+    )
     server = FontraServer(
         host=host,
         httpPort=httpPort if httpPort is not None else findFreeTCPPort(DEFAULT_PORT),
         projectManager=manager,
         launchWebBrowser=args.launch,
         versionToken=secrets.token_hex(4),
+        warmUpProcessPool=args.process_pool_warm_up,
+        websocketCompression=args.websocket_compression,
     )
     server.setup()
     server.run()
@@ -2,6 +2,7 @@ import logging
 import pathlib
 from importlib.metadata import entry_points
 from os import PathLike
+from typing import Any
 
 from ..core.protocols import ReadableFontBackend, WritableFontBackend
 
@@ -20,6 +21,18 @@ def newFileSystemBackend(path: PathLike) -> WritableFontBackend:
     return _getFileSystemBackend(path, True)
 
 
+def getFileSystemBackendClass(path: PathLike) -> type[Any]:
+    fileType = pathlib.Path(path).suffix.lstrip(".").lower()
+    backendEntryPoints = entry_points(group="fontra.filesystem.backends")
+    try:
+        entryPoint = backendEntryPoints[fileType]
+    except KeyError:
+        raise UnknownFileType(
+            f"Can't find backend for files with extension '.{fileType}'"
+        )
+    return entryPoint.load()
+
+
 def _getFileSystemBackend(path: PathLike, create: bool) -> WritableFontBackend:
     logVerb = "creating" if create else "loading"
 
@@ -30,14 +43,7 @@ def _getFileSystemBackend(path: PathLike, create: bool) -> WritableFontBackend:
 
     logger.info(f"{logVerb} project {path.name}...")
     fileType = path.suffix.lstrip(".").lower()
-    backendEntryPoints = entry_points(group="fontra.filesystem.backends")
-    try:
-        entryPoint = backendEntryPoints[fileType]
-    except KeyError:
-        raise UnknownFileType(
-            f"Can't find backend for files with extension '.{fileType}'"
-        )
-    backendClass = entryPoint.load()
+    backendClass = getFileSystemBackendClass(path)
 
     if create:
         if not hasattr(backendClass, "createFromPath"):
@@ -3,15 +3,21 @@ import asyncio
 import logging
 import pathlib
 import shutil
-from contextlib import aclosing, asynccontextmanager
+from collections import deque
+from contextlib import AsyncExitStack, aclosing, asynccontextmanager
+from typing import NamedTuple
 
+from ..core.classes import ImageData, VariableGlyph
 from ..core.protocols import (
+    FlushWrites,
     ReadableFontBackend,
     ReadBackgroundImage,
     WritableFontBackend,
     WriteBackgroundImage,
+    WriteGlyphFiles,
 )
-from . import getFileSystemBackend, newFileSystemBackend
+from ..core.subprocess import configureProcessPool
+from . import getFileSystemBackend, getFileSystemBackendClass, newFileSystemBackend
 
 logger = logging.getLogger(__name__)
 
@@ -22,9 +28,34 @@ async def copyFont(
     *,
     glyphNames=None,
     numTasks=1,
+    numProcesses=1,
+    sourcePath: pathlib.Path | None = None,
+    destPath: pathlib.Path | None = None,
     progressInterval=0,
     continueOnError=False,
 ) -> None:
+    if numProcesses > 1:
+        # The worker processes open sourcePath themselves, so sourceBackend must
+        # be exactly what they would get from it, and not a wrapped backend
+        if sourcePath is None:
+            raise ValueError("copying with multiple processes requires sourcePath")
+        if type(sourceBackend) is not getFileSystemBackendClass(sourcePath):
+            raise ValueError(
+                "copying with multiple processes requires sourceBackend to be "
+                "the file system backend for sourcePath"
+            )
+        # Likewise for destPath, which is optional: without it, or if the
+        # destination backend doesn't support WriteGlyphFiles, the glyphs are
+        # written by this process
+        destBackendClass = (
+            getFileSystemBackendClass(destPath) if destPath is not None else None
+        )
+        if destPath is not None and type(destBackend) is not destBackendClass:
+            raise ValueError(
+                "copying with multiple processes requires destBackend to be "
+                "the file system backend for destPath"
+            )
+
     if glyphNames is not None:
         from ..workflow.actions.subset import SubsetGlyphs
 
@@ -38,6 +69,10 @@ async def copyFont(
             sourceBackend,
             destBackend,
             numTasks=numTasks,
+            numProcesses=numProcesses,
+            sourcePath=sourcePath,
+            destPath=destPath,
+            subsetGlyphNames=glyphNames,
             progressInterval=progressInterval,
             continueOnError=continueOnError,
         )
@@ -48,6 +83,10 @@ async def _copyFont(
     destBackend: WritableFontBackend,
     *,
     numTasks=1,
+    numProcesses=1,
+    sourcePath=None,
+    destPath=None,
+    subsetGlyphNames=None,
     progressInterval=0,
     continueOnError=False,
 ) -> None:
@@ -59,6 +98,55 @@ async def _copyFont(
     glyphNamesToCopy = sorted(glyphMap)
     glyphNamesCopied: set[str] = set()
 
+    if numProcesses > 1:
+        # The background images are copied along with the glyphs, as only the
+        # source backend that read a glyph can resolve its image identifiers
+        await copyGlyphsInSubProcesses(
+            sourcePath,
+            subsetGlyphNames,
+            destBackend,
+            destPath if isinstance(destBackend, WriteGlyphFiles) else None,
+            glyphMap,
+            glyphNamesToCopy,
+            numProcesses,
+            progressInterval,
+            continueOnError,
+        )
+        backgroundImageIdentifiers = []
+    else:
+        backgroundImageIdentifiers = await copyGlyphsInTasks(
+            sourceBackend,
+            destBackend,
+            glyphMap,
+            glyphNamesToCopy,
+            glyphNamesCopied,
+            numTasks,
+            progressInterval,
+            continueOnError,
+        )
+
+    if isinstance(destBackend, WriteBackgroundImage):
+        if backgroundImageIdentifiers:
+            assert isinstance(sourceBackend, ReadBackgroundImage), type(sourceBackend)
+            for imageIdentifier in backgroundImageIdentifiers:
+                imageData = await sourceBackend.getBackgroundImage(imageIdentifier)
+                if imageData is not None:
+                    await destBackend.putBackgroundImage(imageIdentifier, imageData)
+
+    await destBackend.putKerning(await sourceBackend.getKerning())
+    await destBackend.putFeatures(await sourceBackend.getFeatures())
+
+
+async def copyGlyphsInTasks(
+    sourceBackend: ReadableFontBackend,
+    destBackend: WritableFontBackend,
+    glyphMap: dict[str, list[int]],
+    glyphNamesToCopy: list[str],
+    glyphNamesCopied: set[str],
+    numTasks: int,
+    progressInterval: int,
+    continueOnError: bool,
+) -> list:
     tasks = [
         asyncio.create_task(
             copyGlyphs(
@@ -86,17 +174,7 @@ async def _copyFont(
         assert e is not None
         raise e
 
-    if isinstance(destBackend, WriteBackgroundImage):
-        backgroundImageIdentifiers = [info for t in done for info in t.result()]
-        if backgroundImageIdentifiers:
-            assert isinstance(sourceBackend, ReadBackgroundImage), type(sourceBackend)
-            for imageIdentifier in backgroundImageIdentifiers:
-                imageData = await sourceBackend.getBackgroundImage(imageIdentifier)
-                if imageData is not None:
-                    await destBackend.putBackgroundImage(imageIdentifier, imageData)
-
-    await destBackend.putKerning(await sourceBackend.getKerning())
-    await destBackend.putFeatures(await sourceBackend.getFeatures())
+    return [info for t in done for info in t.result()]
 
 
 async def copyGlyphs(
@@ -149,6 +227,222 @@ async def copyGlyphs(
     return backgroundImageIdentifiers
 
 
+SUB_PROCESS_CHUNK_SIZE = 50
+
+
+class CopiedGlyph(NamedTuple):
+    # What a worker process reports about a glyph it read. The glyph and its
+    # background images are None and empty if the worker wrote them itself.
+    glyph: VariableGlyph | None
+    componentNames: list[str]
+    backgroundImages: dict[str, ImageData]
+
+
+async def copyGlyphsInSubProcesses(
+    sourcePath: pathlib.Path,
+    subsetGlyphNames: list[str] | None,
+    destBackend: WritableFontBackend,
+    destPath: pathlib.Path | None,
+    glyphMap: dict[str, list[int]],
+    glyphNamesToCopy: list[str],
+    numProcesses: int,
+    progressInterval: int,
+    continueOnError: bool,
+) -> None:
+    # Reading and writing glyphs is CPU-bound, so it is spread over worker
+    # processes, that each open their own source backend, subsetted the same
+    # way as ours. If destPath is given, the destination backend supports
+    # WriteGlyphFiles, and each worker writes the glyphs it reads to its own
+    # destination backend. Otherwise the workers send the glyphs back, and the
+    # writing is done here, as the destination has shared files that don't
+    # support multiple writers, such as contents.plist.
+    glyphNamesScheduled = set(glyphNamesToCopy)
+    numGlyphsLeft = len(glyphNamesToCopy)
+    glyphMapWritten: dict[str, list[int]] = {}
+
+    if destPath is not None and isinstance(destBackend, FlushWrites):
+        # The workers open the destination: it must be complete on disk
+        await destBackend.flushWrites()
+
+    # A sorted tuple, as the worker processes use it as a cache key
+    subsetGlyphNamesKey = (
+        tuple(sorted(subsetGlyphNames)) if subsetGlyphNames is not None else None
+    )
+
+    pool = configureProcessPool("copy", maxWorkers=numProcesses)
+    pendingChunks: deque[asyncio.Task] = deque()
+
+    def scheduleChunks(glyphNames):
+        for i in range(0, len(glyphNames), SUB_PROCESS_CHUNK_SIZE):
+            chunk = glyphNames[i : i + SUB_PROCESS_CHUNK_SIZE]
+            yield asyncio.create_task(
+                pool.run(
+                    _copyGlyphsInSubProcess,
+                    sourcePath,
+                    subsetGlyphNamesKey,
+                    destPath,
+                    chunk,
+                    continueOnError,
+                )
+            )
+
+    try:
+        # The chunks are copied in parallel, but processed here in the order
+        # they were scheduled, so the output does not depend on timing
+        pendingChunks.extend(scheduleChunks(glyphNamesToCopy))
+        while pendingChunks:
+            copiedGlyphs = await pendingChunks.popleft()
+            componentNames: set[str] = set()
+
+            for glyphName, copiedGlyph in copiedGlyphs:
+                if progressInterval and not (numGlyphsLeft % progressInterval):
+                    logger.info(f"{numGlyphsLeft} glyphs left to copy")
+                numGlyphsLeft -= 1
+
+                if copiedGlyph is None:
+                    logger.warning(f"glyph {glyphName} not found")
+                    continue
+
+                componentNames.update(copiedGlyph.componentNames)
+
+                if copiedGlyph.glyph is None:
+                    glyphMapWritten[glyphName] = glyphMap[glyphName]
+                    continue
+
+                logger.debug(f"writing {glyphName}")
+                await destBackend.putGlyph(
+                    glyphName, copiedGlyph.glyph, glyphMap[glyphName]
+                )
+                if isinstance(destBackend, WriteBackgroundImage):
+                    for (
+                        imageIdentifier,
+                        imageData,
+                    ) in copiedGlyph.backgroundImages.items():
+                        await destBackend.putBackgroundImage(imageIdentifier, imageData)
+
+            newGlyphNames = sorted(componentNames - glyphNamesScheduled)
+            glyphNamesScheduled.update(newGlyphNames)
+            numGlyphsLeft += len(newGlyphNames)
+            pendingChunks.extend(scheduleChunks(newGlyphNames))
+    finally:
+        for task in pendingChunks:
+            task.cancel()
+        pool.shutdown()
+
+    if glyphMapWritten:
+        assert isinstance(destBackend, WriteGlyphFiles)
+        await destBackend.updateGlyphMap(glyphMapWritten)
+
+
+# Worker process state: the source and destination backends are opened once per
+# worker process, and stay open, along with the event loop they are used from, as
+# (wrapped) backends may hold on to futures bound to that loop
+_subProcessEventLoop: asyncio.AbstractEventLoop | None = None
+_subProcessExitStack = AsyncExitStack()
+_subProcessSourceBackends: dict[tuple, ReadableFontBackend] = {}
+_subProcessDestBackends: dict[pathlib.Path, WriteGlyphFiles] = {}
+
+
+def _copyGlyphsInSubProcess(
+    sourcePath: pathlib.Path,
+    subsetGlyphNames: tuple[str, ...] | None,
+    destPath: pathlib.Path | None,
+    glyphNames: list[str],
+    continueOnError: bool,
+) -> list[tuple[str, CopiedGlyph | None]]:
+    global _subProcessEventLoop
+    if _subProcessEventLoop is None:
+        _subProcessEventLoop = asyncio.new_event_loop()
+    return _subProcessEventLoop.run_until_complete(
+        _copyGlyphs(sourcePath, subsetGlyphNames, destPath, glyphNames, continueOnError)
+    )
+
+
+async def _copyGlyphs(
+    sourcePath: pathlib.Path,
+    subsetGlyphNames: tuple[str, ...] | None,
+    destPath: pathlib.Path | None,
+    glyphNames: list[str],
+    continueOnError: bool,
+) -> list[tuple[str, CopiedGlyph | None]]:
+    sourceBackend = await _getSubProcessSourceBackend(sourcePath, subsetGlyphNames)
+    destBackend = _getSubProcessDestBackend(destPath) if destPath is not None else None
+    copiedGlyphs: list[tuple[str, CopiedGlyph | None]] = []
+    for glyphName in glyphNames:
+        logger.debug(f"reading {glyphName}")
+        try:
+            glyph = await sourceBackend.getGlyph(glyphName)
+        except Exception as e:
+            if not continueOnError:
+                raise
+            logger.error(f"glyph {glyphName} caused an error: {e!r}")
+            continue
+
+        if glyph is None:
+            copiedGlyphs.append((glyphName, None))
+            continue
+
+        componentNames = sorted(
+            {
+                compo.name
+                for layer in glyph.layers.values()
+                for compo in layer.glyph.components
+            }
+        )
+        backgroundImages = {}
+        for layer in glyph.layers.values():
+            backgroundImage = layer.glyph.backgroundImage
+            if backgroundImage is None:
+                continue
+            assert isinstance(sourceBackend, ReadBackgroundImage), type(sourceBackend)
+            imageData = await sourceBackend.getBackgroundImage(
+                backgroundImage.identifier
+            )
+            if imageData is not None:
+                backgroundImages[backgroundImage.identifier] = imageData
+
+        if destBackend is not None:
+            logger.debug(f"writing {glyphName}")
+            await destBackend.putGlyphFile(glyphName, glyph)
+            if isinstance(destBackend, WriteBackgroundImage):
+                for imageIdentifier, imageData in backgroundImages.items():
+                    await destBackend.putBackgroundImage(imageIdentifier, imageData)
+            glyph = None
+            backgroundImages = {}
+
+        copiedGlyphs.append(
+            (glyphName, CopiedGlyph(glyph, componentNames, backgroundImages))
+        )
+    return copiedGlyphs
+
+
+async def _getSubProcessSourceBackend(
+    sourcePath: pathlib.Path, subsetGlyphNames: tuple[str, ...] | None
+) -> ReadableFontBackend:
+    key = (sourcePath, subsetGlyphNames)
+    sourceBackend = _subProcessSourceBackends.get(key)
+    if sourceBackend is None:
+        sourceBackend = getFileSystemBackend(sourcePath)
+        if subsetGlyphNames is not None:
+            from ..workflow.actions.subset import SubsetGlyphs
+
+            subsetter = SubsetGlyphs(glyphNames=set(subsetGlyphNames))
+            sourceBackend = await _subProcessExitStack.enter_async_context(
+                subsetter.connect(sourceBackend)
+            )
+        _subProcessSourceBackends[key] = sourceBackend
+    return sourceBackend
+
+
+def _getSubProcessDestBackend(destPath: pathlib.Path) -> WriteGlyphFiles:
+    destBackend = _subProcessDestBackends.get(destPath)
+    if destBackend is None:
+        backend = getFileSystemBackend(destPath)
+        assert isinstance(backend, WriteGlyphFiles)
+        destBackend = _subProcessDestBackends[destPath] = backend
+    return destBackend
+
+
 class PathChecker:
     def __init__(self):
         self.sourcePath = None
@@ -193,6 +487,14 @@ async def mainAsync() -> None:
     )
     parser.add_argument("--progress-interval", type=int, default=0)
     parser.add_argument("--num-tasks", type=int, default=1)
+    parser.add_argument(
+        "--num-processes",
+        type=int,
+        default=1,
+        help="The number of worker processes used to copy glyphs. They also write "
+        "the glyphs if the destination format allows it, such as .fontra. "
+        "When this is more than 1, --num-tasks is ignored.",
+    )
     parser.add_argument(
         "--continue-on-error",
         action="store_true",
@@ -229,6 +531,9 @@ async def mainAsync() -> None:
             destBackend,
             glyphNames=glyphNames if glyphNames else None,
             numTasks=args.num_tasks,
+            numProcesses=args.num_processes,
+            sourcePath=sourcePath,
+            destPath=destPath,
             progressInterval=args.progress_interval,
             continueOnError=args.continue_on_error,
         )
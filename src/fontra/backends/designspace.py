@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import asyncio
+import concurrent.futures
 import logging
 import os
 import pathlib
@@ -11,7 +12,7 @@ from collections import defaultdict
 from copy import deepcopy
 from dataclasses import asdict, dataclass, field, replace
 from datetime import datetime
-from functools import cache, cached_property, partial, singledispatch
+from functools import cache, cached_property, singledispatch
 from os import PathLike
 from types import SimpleNamespace
 from typing import Any, Awaitable, Callable
@@ -26,8 +27,13 @@ from fontTools.designspaceLib import (
 from fontTools.misc.transform import DecomposedTransform, Transform
 from fontTools.pens.pointPen import AbstractPointPen
 from fontTools.pens.recordingPen import RecordingPointPen
-from fontTools.ufoLib import UFOLibError, UFOReaderWriter
-from fontTools.ufoLib.glifLib import GlyphSet
+from fontTools.ufoLib import (
+    GROUPS_FILENAME,
+    KERNING_FILENAME,
+    UFOLibError,
+    UFOReaderWriter,
+)
+from fontTools.ufoLib.glifLib import GlifLibError, GlyphSet, readGlyphFromString
 
 from ..core.async_property import async_property
 from ..core.classes import (
@@ -55,12 +61,13 @@ from ..core.classes import (
     VariableGlyph,
 )
 from ..core.glyphdependencies import GlyphDependencies
-from ..core.path import PackedPathPointPen
+from ..core.lrucache import LRUCache
+from ..core.path import PackedPath, PackedPathPointPen
 from ..core.protocols import WritableFontBackend
 from ..core.subprocess import runInSubProcess
 from ..core.varutils import locationToTuple, makeDenseLocation, makeSparseLocation
 from .filewatcher import Change, FileWatcher
-from .ufo_utils import extractGlyphNameAndCodePoints
+from .ufo_utils import extractGlyphNameAndCodePoints, splitGLIFOutline
 
 logger = logging.getLogger(__name__)
 
@@ -74,6 +81,8 @@ GLYPH_SOURCE_CUSTOM_DATA_LIB_KEY = "xyz.fontra.glyph.source.customData"
 LINE_METRICS_HOR_ZONES_KEY = "xyz.fontra.lineMetricsHorizontalLayout.zones"
 GLYPH_NOTE_LIB_KEY = "fontra.glyph.note"
 
+GLIF_CACHE_SIZE = 5000  # the number of parsed .glif files to keep
+
 
 defaultUFOInfoAttrs = {
     "unitsPerEm": 1000,
@@ -231,15 +240,25 @@ class DesignspaceBackend:
         )
         self.ufoManager = UFOManager()
         self.updateAxisInfo()
-        self.loadUFOLayers()
-        self.buildGlyphFileNameMapping()
-        self.glyphMap = (
-            {}
-            if self.defaultDSSource is None
-            else getGlyphMapFromGlyphSet(self.defaultDSSource.layer.glyphSet)
-        )
+        # Reading the UFOs is mostly waiting for the file system, so read them
+        # from a few threads at once
+        with concurrent.futures.ThreadPoolExecutor() as executor:
+            self.loadUFOLayers(executor)
+            self.loadGlyphSets(executor)
         self.savedGlyphModificationTimes: dict[str, set] = {}
         self.zombieDSSources: dict[str, DSSource] = {}
+        # Glyph sets that need their contents.plist written, with the names of
+        # the glyphs whose entries changed, keyed by id(glyphSet), and UFOs
+        # that need their layercontents.plist written, keyed by path. They are
+        # written by flushWrites().
+        self._pendingGlyphSetContents: dict[int, tuple[GlyphSet, set[str]]] = {}
+        self._pendingLayerContents: dict[str, UFOReaderWriter] = {}
+        # Parsed .glif files, keyed by (UFO path, UFO layer name, glyph name),
+        # with the modification time of the .glif file they were parsed from
+        self._glifCache: LRUCache = LRUCache(GLIF_CACHE_SIZE)
+        # The groups and kerning last read from or written to each UFO, keyed
+        # by (UFO path, file name), with the modification time of the file
+        self._ufoKerningData: dict[tuple[str, str], tuple[int | None, dict]] = {}
 
     def startOptionalBackgroundTasks(self) -> None:
         self._backgroundTasksTask = asyncio.create_task(self.glyphDependencies)
@@ -276,6 +295,7 @@ class DesignspaceBackend:
         return sorted((await self.glyphDependencies).usedBy.get(glyphName, []))
 
     def _reloadDesignSpaceFromFile(self):
+        self._flushContents()
         self._initialize(DesignSpaceDocument.fromfile(self.dsDoc.path))
 
     def updateAxisInfo(self):
@@ -305,6 +325,7 @@ class DesignspaceBackend:
         self.defaultLocation = defaultLocation
 
     async def aclose(self) -> None:
+        await self.flushWrites()
         if self.fileWatcher is not None:
             await self.fileWatcher.aclose()
         if self._glyphDependenciesTask is not None:
@@ -342,16 +363,20 @@ class DesignspaceBackend:
             self._defaultFontInfo = fontInfo
         return self._defaultFontInfo
 
-    def loadUFOLayers(self) -> None:
+    def loadUFOLayers(
+        self, executor: concurrent.futures.Executor | None = None
+    ) -> None:
         manager = self.ufoManager
         self.dsSources = ItemList()
         self.ufoLayers = ItemList()
 
         # Using a dict as an order-preserving set:
         ufoPaths = {source.path: None for source in self.dsDoc.sources}
-        for ufoPath in ufoPaths:
-            reader = manager.getReader(ufoPath)
-            for ufoLayerName in reader.getLayerNames():
+        layerNames = (map if executor is None else executor.map)(
+            lambda ufoPath: manager.getReader(ufoPath).getLayerNames(), ufoPaths
+        )
+        for ufoPath, ufoLayerNames in zip(ufoPaths, layerNames):
+            for ufoLayerName in ufoLayerNames:
                 self.ufoLayers.append(
                     UFOLayer(manager=manager, path=ufoPath, name=ufoLayerName)
                 )
@@ -385,18 +410,59 @@ class DesignspaceBackend:
 
         self._updatePathsToWatch()
 
-    def buildGlyphFileNameMapping(self):
+    def loadGlyphSets(self, executor: concurrent.futures.Executor) -> None:
+        # Read the contents.plist of all UFO layers, and the code points from
+        # the .glif files of the default layer, building the glyph map and the
+        # .glif file name mapping along the way
+        defaultUFOLayer = None if self.defaultDSSource is None else self.defaultUFOLayer
+        # The default layer takes the longest, so start it first
+        ufoLayers = sorted(self.ufoLayers, key=lambda layer: layer != defaultUFOLayer)
+        results = {
+            ufoLayer: executor.submit(
+                readGlyphSetContents,
+                self.ufoManager,
+                ufoLayer.path,
+                ufoLayer.name,
+                ufoLayer == defaultUFOLayer,
+            )
+            for ufoLayer in ufoLayers
+        }
         glifFileNames = {}
-        for glyphSet in self.ufoLayers.iterAttrs("glyphSet"):
-            for glyphName, fileName in glyphSet.contents.items():
-                glifFileNames[fileName] = glyphName
+        for ufoLayer in self.ufoLayers:
+            layerGlifFileNames, _ = results[ufoLayer].result()
+            glifFileNames.update(layerGlifFileNames)
         self.glifFileNames = glifFileNames
+        self.glyphMap = (
+            {} if defaultUFOLayer is None else results[defaultUFOLayer].result()[1]
+        )
 
-    def updateGlyphSetContents(self, glyphSet):
-        glyphSet.writeContents()
-        glifFileNames = self.glifFileNames
-        for glyphName, fileName in glyphSet.contents.items():
-            glifFileNames[fileName] = glyphName
+    def updateGlyphSetContents(self, glyphSet, glyphName):
+        self._addPendingGlyphSetContents(glyphSet).add(glyphName)
+        fileName = glyphSet.contents.get(glyphName)
+        if fileName is not None:
+            self.glifFileNames[fileName] = glyphName
+
+    def _addPendingGlyphSetContents(self, glyphSet) -> set[str]:
+        # Return the set of glyph names whose contents entries are pending
+        _, glyphNames = self._pendingGlyphSetContents.setdefault(
+            id(glyphSet), (glyphSet, set())
+        )
+        return glyphNames
+
+    async def flushWrites(self) -> None:
+        self._flushContents()
+
+    def _flushContents(self) -> None:
+        # Write the glyph sets before the layer contents, as the latter
+        # refers to the former
+        glyphSets = [glyphSet for glyphSet, _ in self._pendingGlyphSetContents.values()]
+        self._pendingGlyphSetContents.clear()
+        for glyphSet in glyphSets:
+            glyphSet.writeContents()
+        readers = list(self._pendingLayerContents.values())
+        self._pendingLayerContents.clear()
+        for reader in readers:
+            reader.writeLayerContents()
 
     async def getGlyphMap(self) -> dict[str, list[int]]:
         return dict(self.glyphMap)
@@ -404,6 +470,23 @@ class DesignspaceBackend:
     async def putGlyphMap(self, value: dict[str, list[int]]) -> None:
         pass
 
+    def _readGlyphFromLayer(
+        self, ufoLayer: UFOLayer, glyphName: str
+    ) -> tuple[StaticGlyph, UFOGlyph]:
+        modTime = ufoLayer.glyphSet.getGLIFModificationTime(glyphName)
+        cacheKey = (ufoLayer.path, ufoLayer.name, glyphName)
+        cachedItem = self._glifCache.get(cacheKey)
+        if cachedItem is None or cachedItem[0] != modTime:
+            glyphs = ufoLayerToStaticGlyph(ufoLayer.glyphSet, glyphName)
+            cachedItem = (modTime, glyphs)
+            self._glifCache[cacheKey] = cachedItem
+        # The caller owns the result, and may modify it
+        return deepcopy(cachedItem[1])
+
+    def _invalidateGlyphCache(self, glyphName: str) -> None:
+        for ufoLayer in self.ufoLayers:
+            self._glifCache.pop((ufoLayer.path, ufoLayer.name, glyphName), None)
+
     async def getGlyph(self, glyphName: str) -> VariableGlyph | None:
         if glyphName not in self.glyphMap:
             return None
@@ -413,8 +496,8 @@ class DesignspaceBackend:
         localSources = []
         layers = {}
 
-        defaultStaticGlyph, defaultUFOGlyph = ufoLayerToStaticGlyph(
-            self.defaultUFOLayer.glyphSet, glyphName
+        defaultStaticGlyph, defaultUFOGlyph = self._readGlyphFromLayer(
+            self.defaultUFOLayer, glyphName
         )
 
         localDS = defaultUFOGlyph.lib.get(GLYPH_DESIGNSPACE_LIB_KEY)
@@ -441,7 +524,7 @@ class DesignspaceBackend:
             staticGlyph, ufoGlyph = (
                 (defaultStaticGlyph, defaultUFOGlyph)
                 if ufoLayer == self.defaultUFOLayer
-                else ufoLayerToStaticGlyph(ufoLayer.glyphSet, glyphName)
+                else self._readGlyphFromLayer(ufoLayer, glyphName)
             )
 
             layerName = layerNameMapping.get(
@@ -547,6 +630,13 @@ class DesignspaceBackend:
             )
         return axes, sources
 
+    async def putGlyphs(
+        self, glyphs: dict[str, tuple[VariableGlyph, list[int]]]
+    ) -> None:
+        # The contents.plist files are written once, by flushWrites()
+        for glyphName, (glyph, codePoints) in glyphs.items():
+            await self.putGlyph(glyphName, glyph, codePoints)
+
     async def putGlyph(
         self, glyphName: str, glyph: VariableGlyph, codePoints: list[int]
     ) -> None:
@@ -668,8 +758,7 @@ class DesignspaceBackend:
             )
             glyphSet.writeGlyph(glyphName, layerGlyph, drawPointsFunc=drawPointsFunc)
             if writeGlyphSetContents:
-                # FIXME: this is inefficient if we write many glyphs
-                self.updateGlyphSetContents(glyphSet)
+                self.updateGlyphSetContents(glyphSet, glyphName)
 
             modTimes.add(glyphSet.getGLIFModificationTime(glyphName))
 
@@ -683,11 +772,11 @@ class DesignspaceBackend:
         for layerName in layersToDelete:
             glyphSet = self.ufoLayers.findItem(fontraLayerName=layerName).glyphSet
             glyphSet.deleteGlyph(glyphName)
-            # FIXME: this is inefficient if we write many glyphs
-            self.updateGlyphSetContents(glyphSet)
+            self.updateGlyphSetContents(glyphSet, glyphName)
             modTimes.add(None)
 
         self.savedGlyphModificationTimes[glyphName] = modTimes
+        self._invalidateGlyphCache(glyphName)
 
     def _createDefaultSourceAndUFO(self, sourceName):
         assert not self.dsSources
@@ -854,7 +943,9 @@ class DesignspaceBackend:
         self, glyphName: str | None, ufoPath: str, suggestedLayerName: str
     ) -> UFOLayer:
         reader = self.ufoManager.getReader(ufoPath)
-        existingLayerNames = set(reader.getLayerNames())
+        # Not getLayerNames(), which reads the possibly outdated
+        # layercontents.plist
+        existingLayerNames = set(reader.layerContents)
         ufoLayerName = suggestedLayerName
         count = 0
         # getGlyphSet() will create the layer if it doesn't already exist
@@ -866,9 +957,9 @@ class DesignspaceBackend:
             ufoLayerName = f"{suggestedLayerName}#{count}"
 
         if ufoLayerName not in existingLayerNames:
-            reader.writeLayerContents()
             glyphSet = self.ufoManager.getGlyphSet(ufoPath, ufoLayerName)
-            glyphSet.writeContents()
+            self._addPendingGlyphSetContents(glyphSet)
+            self._pendingLayerContents[ufoPath] = reader
 
         ufoLayer = UFOLayer(
             manager=self.ufoManager,
@@ -894,7 +985,8 @@ class DesignspaceBackend:
         for glyphSet in self.ufoLayers.iterAttrs("glyphSet"):
             if glyphName in glyphSet:
                 glyphSet.deleteGlyph(glyphName)
-                glyphSet.writeContents()
+                self.updateGlyphSetContents(glyphSet, glyphName)
+        self._invalidateGlyphCache(glyphName)
         del self.glyphMap[glyphName]
         self.savedGlyphModificationTimes[glyphName] = None
         if self._glyphDependencies is not None:
@@ -958,6 +1050,7 @@ class DesignspaceBackend:
 
         self.updateAxisInfo()
         self._writeDesignSpaceDocument()
+        self._flushContents()  # loadUFOLayers() reads layercontents.plist
         self.loadUFOLayers()
 
     async def getSources(self) -> dict[str, FontSource]:
@@ -1076,8 +1169,9 @@ class DesignspaceBackend:
         # Context: UFO3's kern direction is "writing direction", but I want kerning
         # in Fontra to be "visial left to right", as that is much easier to manage.
         for dsSource in dsSources:
-            groups = mergeKernGroups(groups, dsSource.layer.reader.readGroups())
-            sourceKerning = dsSource.layer.reader.readKerning()
+            sourceGroups = self._readUFOKerningData(dsSource.layer, GROUPS_FILENAME)
+            groups = mergeKernGroups(groups, sourceGroups)
+            sourceKerning = self._readUFOKerningData(dsSource.layer, KERNING_FILENAME)
 
             for (leftKey, rightKey), value in sourceKerning.items():
                 valueDicts[leftKey][rightKey][dsSource.identifier] = value
@@ -1136,15 +1230,49 @@ class DesignspaceBackend:
                 if dsSource.isSparse:
                     continue
                 if kernType == "kern":
-                    dsSource.layer.reader.writeGroups(kerningTable.groups)
-                    ufoKerning = kerningPerSource.get(dsSource.identifier, {})
-                    dsSource.layer.reader.writeKerning(ufoKerning)
+                    self._writeUFOKerningData(
+                        dsSource.layer, GROUPS_FILENAME, kerningTable.groups
+                    )
+                    self._writeUFOKerningData(
+                        dsSource.layer,
+                        KERNING_FILENAME,
+                        kerningPerSource.get(dsSource.identifier, {}),
+                    )
                 else:
                     # TODO: store in lib
                     logger.error(
                         "kerning types other than 'kern' are not yet implemented for UFO"
                     )
 
+    def _readUFOKerningData(self, ufoLayer: UFOLayer, fileName: str) -> dict:
+        # Get the modification time first: if the file changes while we read
+        # it, the next write won't be skipped
+        modTime = getFileModTime(os.path.join(ufoLayer.path, fileName))
+        if fileName == GROUPS_FILENAME:
+            data = ufoLayer.reader.readGroups()
+        else:
+            data = ufoLayer.reader.readKerning()
+        self._ufoKerningData[ufoLayer.path, fileName] = (modTime, deepcopy(data))
+        return data
+
+    def _writeUFOKerningData(self, ufoLayer: UFOLayer, fileName: str, data: dict):
+        # Skip the write if the file still contains the data we last read or
+        # wrote, so a kerning edit only rewrites the UFOs it affects
+        filePath = os.path.join(ufoLayer.path, fileName)
+        if self._ufoKerningData.get((ufoLayer.path, fileName)) == (
+            getFileModTime(filePath),
+            data,
+        ):
+            return
+        if fileName == GROUPS_FILENAME:
+            ufoLayer.reader.writeGroups(data)
+        else:
+            ufoLayer.reader.writeKerning(data)
+        self._ufoKerningData[ufoLayer.path, fileName] = (
+            getFileModTime(filePath),
+            deepcopy(data),
+        )
+
     async def getFeatures(self) -> OpenTypeFeatures:
         featureText = self.defaultReader.readFeatures()
         featureText = resolveFeatureIncludes(
@@ -1339,10 +1467,29 @@ class DesignspaceBackend:
             #
             await asyncio.sleep(0.15)
             for glyphSet in self.ufoLayers.iterAttrs("glyphSet"):
-                glyphSet.rebuildContents()
+                self._rebuildGlyphSetContents(glyphSet)
+                checkGlyphSetContents(glyphSet)
 
         return changedItems
 
+    def _rebuildGlyphSetContents(self, glyphSet) -> None:
+        # Re-read contents.plist, which may have been changed externally, but
+        # keep the entries of our own pending glyph writes and deletions, as
+        # they haven't been written yet. Writing them first would overwrite
+        # the external changes.
+        pending = self._pendingGlyphSetContents.get(id(glyphSet))
+        pendingEntries = (
+            {glyphName: glyphSet.contents.get(glyphName) for glyphName in pending[1]}
+            if pending is not None
+            else {}
+        )
+        glyphSet.rebuildContents()
+        for glyphName, fileName in pendingEntries.items():
+            if fileName is None:
+                glyphSet.contents.pop(glyphName, None)
+            else:
+                glyphSet.contents[glyphName] = fileName
+
     def _analyzeExternalGlyphChanges(self, change, path, changedItems):
         fileName = os.path.basename(path)
         glyphName = self.glifFileNames.get(fileName)
@@ -1366,6 +1513,7 @@ class DesignspaceBackend:
                     glyphName, _ = extractGlyphNameAndCodePoints(f.read())
                 self.glifFileNames[fileName] = glyphName
                 changedItems.newGlyphs.add(glyphName)
+                self._invalidateGlyphCache(glyphName)
                 return
         else:
             # Changed glyph
@@ -1387,6 +1535,7 @@ class DesignspaceBackend:
         if savedMTimes is not None and mtime not in savedMTimes:
             logger.info(f"external change '{glyphName}'")
             changedItems.changedGlyphs.add(glyphName)
+            self._invalidateGlyphCache(glyphName)
 
 
 @singledispatch
@@ -1572,7 +1721,14 @@ class UFOManager:
 
     @cache
     def getGlyphSet(self, path: str, layerName: str) -> GlyphSet:
-        return self.getReader(path).getGlyphSet(layerName, defaultLayer=False)
+        # glifLib's read validation checks that each file in contents.plist
+        # exists, one file system call per glyph. Do the same check with a
+        # single directory listing instead.
+        glyphSet = self.getReader(path).getGlyphSet(
+            layerName, defaultLayer=False, validateRead=False
+        )
+        checkGlyphSetContents(glyphSet)
+        return glyphSet
 
 
 @dataclass(kw_only=True, frozen=True)
@@ -1752,12 +1908,16 @@ class DoubleDict(dict):
 
 def ufoLayerToStaticGlyph(glyphSet, glyphName, penClass=PackedPathPointPen):
     glyph = UFOGlyph()
-    pen = penClass()
-    glyphSet.readGlyph(glyphName, glyph, pen, validate=False)
-    components = [*pen.components] + unpackVariableComponents(glyph.lib)
+    if penClass is PackedPathPointPen:
+        path, components = readGlyphAndPath(glyphSet, glyphName, glyph)
+    else:
+        pen = penClass()
+        glyphSet.readGlyph(glyphName, glyph, pen, validate=False)
+        path, components = pen.getPath(), pen.components
+    components = [*components] + unpackVariableComponents(glyph.lib)
     verticalOrigin = glyph.lib.get("public.verticalOrigin")
     staticGlyph = StaticGlyph(
-        path=pen.getPath(),
+        path=path,
         components=components,
         xAdvance=glyph.width,
         yAdvance=(
@@ -1785,6 +1945,27 @@ def unpackVariableComponents(lib):
     return components
 
 
+def readGlyphAndPath(
+    glyphSet: GlyphSet, glyphName: str, glyph: UFOGlyph
+) -> tuple[PackedPath, list[Component]]:
+    # Read the outline with the fast reader, and everything else with glifLib.
+    # This is equivalent to, but faster than:
+    #     glyphSet.readGlyph(glyphName, glyph, PackedPathPointPen())
+    glifData = glyphSet.getGLIF(glyphName)
+    splitData = splitGLIFOutline(glifData)
+    if splitData is not None:
+        glifDataWithoutOutline, path, components = splitData
+        try:
+            readGlyphFromString(glifDataWithoutOutline, glyph, validate=False)
+        except GlifLibError:
+            pass  # Let glifLib report the error below
+        else:
+            return path, components
+    pen = PackedPathPointPen()
+    glyphSet.readGlyph(glyphName, glyph, pen, validate=False)
+    return pen.getPath(), pen.components
+
+
 def unpackAnchors(anchors):
     return [Anchor(name=a.get("name"), x=a["x"], y=a["y"]) for a in anchors]
 
@@ -1949,14 +2130,46 @@ def populateUFOLayerGlyph(
     return pen.replay
 
 
-def getGlyphMapFromGlyphSet(glyphSet):
+def getFileModTime(path: str) -> int | None:
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def checkGlyphSetContents(glyphSet: GlyphSet) -> None:
+    contents = glyphSet.contents
+    if not isinstance(contents, dict) or not all(
+        isinstance(glyphName, str) and isinstance(fileName, str)
+        for glyphName, fileName in contents.items()
+    ):
+        raise GlifLibError("contents.plist is not properly formatted")
+    existingFileNames = set(glyphSet.fs.listdir("/"))
+    for fileName in contents.values():
+        # Fall back to exists() for file names that differ from the listing
+        # only in case, on case-insensitive file systems
+        if fileName not in existingFileNames and not glyphSet.fs.exists(fileName):
+            raise GlifLibError(
+                f"contents.plist references a file that does not exist: {fileName}"
+            )
+
+
+def readGlyphSetContents(
+    manager: UFOManager, ufoPath: str, ufoLayerName: str, readCodePoints: bool
+) -> tuple[dict[str, str], dict[str, list[int]]]:
+    # This runs in a worker thread: get the glyph set from the manager, and not
+    # through the UFOLayer.glyphSet cached_property, which takes a lock shared
+    # by all UFOLayer instances on Python < 3.12
+    glyphSet = manager.getGlyphSet(ufoPath, ufoLayerName)
+    glifFileNames = {}
     glyphMap = {}
-    for glyphName in glyphSet.keys():
-        glifData = glyphSet.getGLIF(glyphName)
-        gn, codePoints = extractGlyphNameAndCodePoints(glifData)
-        assert gn == glyphName, (gn, glyphName)
-        glyphMap[glyphName] = codePoints
-    return glyphMap
+    for glyphName, fileName in glyphSet.contents.items():
+        glifFileNames[fileName] = glyphName
+        if readCodePoints:
+            gn, codePoints = extractGlyphNameAndCodePoints(glyphSet.getGLIF(glyphName))
+            assert gn == glyphName, (gn, glyphName)
+            glyphMap[glyphName] = codePoints
+    return glifFileNames, glyphMap
 
 
 def uniqueNameMaker(existingNames=()):
@@ -2046,7 +2259,7 @@ async def extractGlyphDependenciesFromUFO(
     ufoPath: str, layerName: str
 ) -> GlyphDependencies:
     componentInfo = await runInSubProcess(
-        partial(_extractComponentInfoFromUFO, ufoPath, layerName)
+        _extractComponentInfoFromUFO, ufoPath, layerName
     )
     dependencies = GlyphDependencies()
     for glyphName, componentNames in componentInfo.items():
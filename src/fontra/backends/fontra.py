@@ -2,15 +2,16 @@ import asyncio
 import csv
 import json
 import logging
+import os
 import pathlib
 import shutil
 from collections import defaultdict
 from copy import deepcopy
 from dataclasses import dataclass, field
-from functools import partial
 from typing import Any, Callable
 
 from ..core.async_property import async_property
+from ..core.cachedir import getProjectCacheDir
 from ..core.classes import (
     Axes,
     Font,
@@ -39,6 +40,7 @@ class FontraBackend:
     featureTextFileName = "features.txt"
     glyphsDirName = "glyphs"
     backgroundImagesDirName = "background-images"
+    glyphDependencyIndexFileName = "glyph-dependencies.json"
 
     @classmethod
     def fromPath(cls, path) -> WritableFontBackend:
@@ -73,6 +75,7 @@ class FontraBackend:
 
         self._glyphDependenciesTask: asyncio.Task[GlyphDependencies] | None = None
         self._glyphDependencies: GlyphDependencies | None = None
+        self._glyphDependencyIndex: dict[str, list] | None = None
         self._backgroundTasksTask: asyncio.Task | None = None
 
     @property
@@ -99,12 +102,20 @@ class FontraBackend:
     def backgroundImagesDir(self):
         return self.path / self.backgroundImagesDirName
 
+    @property
+    def glyphDependencyIndexPath(self):
+        # The index is a cache, so we don't store it inside the project
+        return getProjectCacheDir(self.path) / self.glyphDependencyIndexFileName
+
     async def aclose(self):
         self.flush()
 
     def flush(self):
         self._scheduler.flush()
 
+    async def flushWrites(self) -> None:
+        self.flush()
+
     async def getUnitsPerEm(self) -> int:
         return self.fontData.unitsPerEm
 
@@ -130,16 +141,34 @@ class FontraBackend:
     async def putGlyph(
         self, glyphName: str, glyph: VariableGlyph, codePoints: list[int]
     ) -> None:
-        jsonSource = serializeGlyph(glyph, glyphName)
-        filePath = self.getGlyphFilePath(glyphName)
-        filePath.write_text(jsonSource, encoding="utf=8")
+        filePath = self._writeGlyphFile(glyphName, glyph)
 
         if codePoints != self.glyphMap.get(glyphName):
             self.glyphMap[glyphName] = codePoints
             self._scheduler.schedule(self._writeGlyphInfo)
 
         if self._glyphDependencies is not None:
-            self._glyphDependencies.update(glyphName, componentNamesFromGlyph(glyph))
+            componentNames = componentNamesFromGlyph(glyph)
+            self._glyphDependencies.update(glyphName, componentNames)
+            self._updateGlyphDependencyIndex(filePath, componentNames)
+
+    async def putGlyphFile(self, glyphName: str, glyph: VariableGlyph) -> None:
+        self._writeGlyphFile(glyphName, glyph)
+
+    async def updateGlyphMap(self, glyphMap: dict[str, list[int]]) -> None:
+        self.glyphMap.update(glyphMap)
+        self._scheduler.schedule(self._writeGlyphInfo)
+        # The glyph files were written by another backend object: load the
+        # glyph dependencies from the files again when needed
+        self._glyphDependenciesTask = None
+        self._glyphDependencies = None
+        self._glyphDependencyIndex = None
+
+    def _writeGlyphFile(self, glyphName: str, glyph: VariableGlyph) -> pathlib.Path:
+        jsonSource = serializeGlyph(glyph, glyphName)
+        filePath = self.getGlyphFilePath(glyphName)
+        filePath.write_text(jsonSource, encoding="utf=8")
+        return filePath
 
     async def deleteGlyph(self, glyphName: str) -> None:
         if glyphName not in self.glyphMap:
@@ -150,6 +179,7 @@ class FontraBackend:
         self._scheduler.schedule(self._writeGlyphInfo)
         if self._glyphDependencies is not None:
             self._glyphDependencies.update(glyphName, ())
+            self._updateGlyphDependencyIndex(filePath, None)
 
     async def getFontInfo(self) -> FontInfo:
         return deepcopy(self.fontData.fontInfo)
@@ -285,7 +315,7 @@ class FontraBackend:
 
         if self._glyphDependenciesTask is None:
             self._glyphDependenciesTask = asyncio.create_task(
-                extractGlyphDependenciesFromFontra(self.glyphsDir)
+                self._loadGlyphDependencies()
             )
 
             def setResult(task):
@@ -296,6 +326,33 @@ class FontraBackend:
 
         return await self._glyphDependenciesTask
 
+    async def _loadGlyphDependencies(self) -> GlyphDependencies:
+        dependencies, self._glyphDependencyIndex = (
+            await extractGlyphDependenciesFromFontra(
+                self.glyphsDir, self.glyphDependencyIndexPath
+            )
+        )
+        return dependencies
+
+    def _updateGlyphDependencyIndex(
+        self, glyphFilePath: pathlib.Path, componentNames: set[str] | None
+    ) -> None:
+        if self._glyphDependencyIndex is None:
+            return
+        if componentNames is None:
+            self._glyphDependencyIndex.pop(glyphFilePath.name, None)
+        else:
+            self._glyphDependencyIndex[glyphFilePath.name] = makeGlyphDependencyEntry(
+                glyphFilePath.stat(), componentNames
+            )
+        self._scheduler.schedule(self._writeGlyphDependencyIndex)
+
+    def _writeGlyphDependencyIndex(self) -> None:
+        if self._glyphDependencyIndex is not None:
+            writeGlyphDependencyIndex(
+                self.glyphDependencyIndexPath, self._glyphDependencyIndex
+            )
+
     def startOptionalBackgroundTasks(self) -> None:
         self._backgroundTasksTask = asyncio.create_task(self.glyphDependencies)
 
@@ -482,26 +539,73 @@ class Scheduler:
         self.scheduledCallables = {}
 
 
+GLYPH_DEPENDENCY_INDEX_FORMAT_VERSION = 1
+
+
 async def extractGlyphDependenciesFromFontra(
-    glyphsDir: pathlib.Path,
-) -> GlyphDependencies:
-    componentInfo = await runInSubProcess(
-        partial(_extractComponentInfoFromUFO, glyphsDir)
+    glyphsDir: pathlib.Path, indexPath: pathlib.Path
+) -> tuple[GlyphDependencies, dict[str, list]]:
+    index = await runInSubProcess(
+        _updateGlyphDependencyIndexFromFiles, glyphsDir, indexPath
     )
 
     dependencies = GlyphDependencies()
-    for glyphName, componentNames in componentInfo.items():
+    for fileName, (_, _, componentNames) in index.items():
+        glyphName = fileNameToString(os.path.splitext(fileName)[0])
         dependencies.update(glyphName, componentNames)
-    return dependencies
-
-
-def _extractComponentInfoFromUFO(glyphsDir: pathlib.Path) -> dict[str, set[str]]:
-    componentInfo = {}
-    for glyphPath in glyphsDir.glob("*.json"):
-        glyphName = fileNameToString(glyphPath.stem)
-        glyphData = json.loads(glyphPath.read_text(encoding="utf-8"))
-        componentInfo[glyphName] = componentNamesFromGlyphData(glyphData)
-    return componentInfo
+    return dependencies, index
+
+
+def _updateGlyphDependencyIndexFromFiles(
+    glyphsDir: pathlib.Path, indexPath: pathlib.Path
+) -> dict[str, list]:
+    # Only parse the glyph files that changed since the index was written
+    previousIndex = readGlyphDependencyIndex(indexPath)
+    index = {}
+    with os.scandir(glyphsDir) as entries:
+        for entry in entries:
+            if not entry.name.endswith(".json"):
+                continue
+            stat = entry.stat()
+            indexEntry = previousIndex.get(entry.name)
+            if indexEntry is None or indexEntry[:2] != [stat.st_mtime_ns, stat.st_size]:
+                with open(entry.path, encoding="utf-8") as f:
+                    glyphData = json.load(f)
+                indexEntry = makeGlyphDependencyEntry(
+                    stat, componentNamesFromGlyphData(glyphData)
+                )
+            index[entry.name] = indexEntry
+
+    if index != previousIndex:
+        writeGlyphDependencyIndex(indexPath, index)
+
+    return index
+
+
+def makeGlyphDependencyEntry(stat: os.stat_result, componentNames) -> list:
+    return [stat.st_mtime_ns, stat.st_size, sorted(componentNames)]
+
+
+def readGlyphDependencyIndex(indexPath: pathlib.Path) -> dict[str, list]:
+    try:
+        indexData = json.loads(indexPath.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if indexData.get("formatVersion") != GLYPH_DEPENDENCY_INDEX_FORMAT_VERSION:
+        return {}
+    return indexData["glyphs"]
+
+
+def writeGlyphDependencyIndex(indexPath: pathlib.Path, index: dict[str, list]) -> None:
+    indexData = {
+        "formatVersion": GLYPH_DEPENDENCY_INDEX_FORMAT_VERSION,
+        "glyphs": index,
+    }
+    try:
+        indexPath.parent.mkdir(parents=True, exist_ok=True)
+        indexPath.write_text(json.dumps(indexData), encoding="utf-8")
+    except OSError as e:
+        logger.warning(f"can't write glyph dependency index: {e!r}")
 
 
 def componentNamesFromGlyph(glyph):
@@ -0,0 +1,299 @@
+"""A persistent on-disk glyph cache for read-only backends.
+
+Some backends are expensive to read glyphs from: the OpenType backend has to
+decode the glyph outlines and variations for every glyph, and the workflow
+backend runs the full filter chain for every glyph. PersistentGlyphCacheBackend
+wraps such a backend and stores the glyphs it reads in a single SQLite file, so
+that a restarted server can serve glyphs without recomputing them.
+
+The cache is keyed by the identity of the source: the sizes and modification
+times of the source file and of the files it depends on. When the identity
+changes, all cached glyphs are discarded.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import pathlib
+import sqlite3
+import zlib
+from typing import Any, Iterable
+
+import yaml
+from fontTools.designspaceLib import DesignSpaceDocument
+
+from .. import __version__ as fontraVersion
+from ..core.cachedir import getProjectCacheDir
+from ..core.classes import (
+    Axes,
+    FontInfo,
+    FontSource,
+    Kerning,
+    OpenTypeFeatures,
+    VariableGlyph,
+    structure,
+    unstructure,
+)
+from ..core.protocols import ReadableFontBackend, ReadGlyphs, WritableFontBackend
+
+logger = logging.getLogger(__name__)
+
+
+CACHE_FORMAT_VERSION = 1
+GLYPH_CACHE_FILE_NAME = "glyph-cache.sqlite"
+COMMIT_DELAY = 1.0  # in seconds
+
+
+def wrapWithPersistentGlyphCache(
+    backend: ReadableFontBackend, projectPath: os.PathLike
+) -> ReadableFontBackend:
+    """Return a PersistentGlyphCacheBackend for `backend`, which was read from
+    `projectPath`. Writable backends are returned unchanged: their glyphs are
+    cheap to read, and they can be changed behind the cache's back.
+    """
+    if isinstance(backend, WritableFontBackend):
+        logger.info(f"not using a persistent glyph cache for {backend}: it's writable")
+        return backend
+    projectPath = pathlib.Path(projectPath).resolve()
+    return PersistentGlyphCacheBackend(
+        backend=backend,
+        cachePath=getProjectCacheDir(projectPath) / GLYPH_CACHE_FILE_NAME,
+        sourceIdentity=computeSourceIdentity(projectPath),
+    )
+
+
+class PersistentGlyphCacheBackend:
+    # Optional backend methods that are passed on to the wrapped backend, if
+    # it has them
+    forwardedMethodNames = frozenset(
+        [
+            "getBackgroundImage",
+            "findGlyphsThatUseGlyph",
+            "startOptionalBackgroundTasks",
+        ]
+    )
+
+    def __init__(
+        self,
+        *,
+        backend: ReadableFontBackend,
+        cachePath: os.PathLike,
+        sourceIdentity: str,
+    ):
+        self.backend = backend
+        self.cachePath = pathlib.Path(cachePath)
+        self.sourceIdentity = sourceIdentity
+        self.numHits = 0
+        self.numMisses = 0
+        self._commitHandle: asyncio.TimerHandle | None = None
+        self._db = self._openDatabase()
+
+    def __getattr__(self, name: str) -> Any:
+        if name in self.forwardedMethodNames:
+            return getattr(self.backend, name)
+        raise AttributeError(name)
+
+    def _openDatabase(self) -> sqlite3.Connection:
+        self.cachePath.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            return self._openDatabaseFile()
+        except sqlite3.DatabaseError as e:
+            logger.warning(f"discarding unreadable glyph cache {self.cachePath}: {e}")
+            self.cachePath.unlink()
+            return self._openDatabaseFile()
+
+    def _openDatabaseFile(self) -> sqlite3.Connection:
+        db = sqlite3.connect(self.cachePath)
+        db.execute("CREATE TABLE IF NOT EXISTS info (key TEXT PRIMARY KEY, value TEXT)")
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS glyphs (glyphName TEXT PRIMARY KEY, data BLOB)"
+        )
+        row = db.execute(
+            "SELECT value FROM info WHERE key = 'sourceIdentity'"
+        ).fetchone()
+        if row is None or row[0] != self.sourceIdentity:
+            if row is not None:
+                logger.info(f"source changed, discarding glyph cache {self.cachePath}")
+            db.execute("DELETE FROM glyphs")
+            db.execute(
+                "INSERT OR REPLACE INTO info VALUES ('sourceIdentity', ?)",
+                (self.sourceIdentity,),
+            )
+            db.commit()
+        return db
+
+    async def aclose(self) -> None:
+        if self._commitHandle is not None:
+            self._commitHandle.cancel()
+        self._commit()
+        self._db.close()
+        logger.info(
+            f"persistent glyph cache: {self.numHits} hits, {self.numMisses} misses"
+        )
+        await self.backend.aclose()
+
+    async def getGlyph(self, glyphName: str) -> VariableGlyph | None:
+        found, glyph = self._getCachedGlyph(glyphName)
+        if not found:
+            glyph = await self.backend.getGlyph(glyphName)
+            self._storeGlyph(glyphName, glyph)
+        return glyph
+
+    async def getGlyphs(self, glyphNames: list[str]) -> dict[str, VariableGlyph | None]:
+        glyphs = {}
+        glyphNamesToLoad = []
+        for glyphName in glyphNames:
+            found, glyph = self._getCachedGlyph(glyphName)
+            if found:
+                glyphs[glyphName] = glyph
+            else:
+                glyphNamesToLoad.append(glyphName)
+
+        if glyphNamesToLoad:
+            if isinstance(self.backend, ReadGlyphs):
+                loadedGlyphs = await self.backend.getGlyphs(glyphNamesToLoad)
+            else:
+                loadedGlyphs = dict(
+                    zip(
+                        glyphNamesToLoad,
+                        await asyncio.gather(
+                            *(self.backend.getGlyph(n) for n in glyphNamesToLoad)
+                        ),
+                    )
+                )
+            for glyphName in glyphNamesToLoad:
+                glyph = loadedGlyphs.get(glyphName)
+                self._storeGlyph(glyphName, glyph)
+                glyphs[glyphName] = glyph
+
+        return {glyphName: glyphs[glyphName] for glyphName in glyphNames}
+
+    def _getCachedGlyph(self, glyphName: str) -> tuple[bool, VariableGlyph | None]:
+        row = self._db.execute(
+            "SELECT data FROM glyphs WHERE glyphName = ?", (glyphName,)
+        ).fetchone()
+        if row is None:
+            self.numMisses += 1
+            return False, None
+        self.numHits += 1
+        return True, decodeGlyph(row[0])
+
+    def _storeGlyph(self, glyphName: str, glyph: VariableGlyph | None) -> None:
+        self._db.execute(
+            "INSERT OR REPLACE INTO glyphs VALUES (?, ?)",
+            (glyphName, encodeGlyph(glyph)),
+        )
+        if self._commitHandle is None:
+            # Commit in batches, as a commit waits for the data to be on disk
+            loop = asyncio.get_running_loop()
+            self._commitHandle = loop.call_later(COMMIT_DELAY, self._commit)
+
+    def _commit(self) -> None:
+        self._commitHandle = None
+        self._db.commit()
+
+    async def getFontInfo(self) -> FontInfo:
+        return await self.backend.getFontInfo()
+
+    async def getAxes(self) -> Axes:
+        return await self.backend.getAxes()
+
+    async def getSources(self) -> dict[str, FontSource]:
+        return await self.backend.getSources()
+
+    async def getGlyphMap(self) -> dict[str, list[int]]:
+        return await self.backend.getGlyphMap()
+
+    async def getKerning(self) -> dict[str, Kerning]:
+        return await self.backend.getKerning()
+
+    async def getFeatures(self) -> OpenTypeFeatures:
+        return await self.backend.getFeatures()
+
+    async def getCustomData(self) -> dict[str, Any]:
+        return await self.backend.getCustomData()
+
+    async def getUnitsPerEm(self) -> int:
+        return await self.backend.getUnitsPerEm()
+
+
+def encodeGlyph(glyph: VariableGlyph | None) -> bytes:
+    data = json.dumps(unstructure(glyph), separators=(",", ":"))
+    return zlib.compress(data.encode("utf-8"))
+
+
+def decodeGlyph(data: bytes) -> VariableGlyph | None:
+    glyphData = json.loads(zlib.decompress(data))
+    return None if glyphData is None else structure(glyphData, VariableGlyph)
+
+
+def computeSourceIdentity(path: os.PathLike) -> str:
+    """Return a string that changes when the source at `path`, or any of the
+    files it depends on, changes. This includes the cache format version and
+    the Fontra version, as the result of reading a glyph may depend on it.
+    """
+    path = pathlib.Path(path).resolve()
+    items: list[Any] = [CACHE_FORMAT_VERSION, fontraVersion]
+    seen: set[pathlib.Path] = set()
+    pathsToVisit = [path]
+    while pathsToVisit:
+        path = pathsToVisit.pop(0)
+        if path in seen:
+            continue
+        seen.add(path)
+        items.append(_getPathIdentity(path))
+        pathsToVisit.extend(_iterDependencyPaths(path))
+    data = json.dumps(items).encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+def _getPathIdentity(path: pathlib.Path) -> list:
+    if not path.is_dir():
+        st = path.stat()
+        return [os.fspath(path), st.st_size, st.st_mtime_ns]
+    identity: list = [os.fspath(path)]
+    for dirPath, dirNames, fileNames in os.walk(path):
+        dirNames.sort()
+        for fileName in sorted(fileNames):
+            filePath = os.path.join(dirPath, fileName)
+            st = os.stat(filePath)
+            identity.append(
+                [os.path.relpath(filePath, path), st.st_size, st.st_mtime_ns]
+            )
+    return identity
+
+
+def _iterDependencyPaths(path: pathlib.Path) -> Iterable[pathlib.Path]:
+    # The files that a source reads from, besides itself
+    suffix = path.suffix.lower()
+    if suffix == ".designspace":
+        dsDoc = DesignSpaceDocument.fromfile(path)
+        for source in dsDoc.sources:
+            if source.path:
+                yield pathlib.Path(source.path).resolve()
+    elif suffix == ".yaml":
+        # A workflow: any string in the config may name an input file
+        parentDir = path.parent
+        config = yaml.safe_load(path.read_text())
+        for value in _iterStrings(config):
+            if not value:
+                continue
+            candidate = (parentDir / value).resolve()
+            # Skip the workflow's own folder and its parents, eg. for "."
+            if candidate.exists() and not (
+                candidate == parentDir or candidate in parentDir.parents
+            ):
+                yield candidate
+
+
+def _iterStrings(obj: Any) -> Iterable[str]:
+    if isinstance(obj, str):
+        yield obj
+    elif isinstance(obj, dict):
+        for value in obj.values():
+            yield from _iterStrings(value)
+    elif isinstance(obj, list):
+        for item in obj:
+            yield from _iterStrings(item)
@@ -1,13 +1,20 @@
+from __future__ import annotations
+
 import logging
 import re
 
+from fontTools.misc.transform import DecomposedTransform
 from fontTools.ufoLib.filenames import userNameToFileName
 
+from ..core.classes import Component
+from ..core.path import ContourInfo, PackedPath, PointType
+
 logger = logging.getLogger(__name__)
 
 
 _glyphNamePat = re.compile(rb'<glyph\s+name\s*=\s*"([^"]+)"')
 _unicodePat = re.compile(rb'<unicode\s+hex\s*=\s*"([^"]+)"')
+_glyphFormat2Pat = re.compile(rb'<glyph\s[^>]*\bformat\s*=\s*"2"')
 
 
 def extractGlyphNameAndCodePoints(
@@ -26,3 +33,229 @@ def extractGlyphNameAndCodePoints(
             )
     codePoints = [int(u, 16) for u in _unicodePat.findall(data)]
     return glyphName, codePoints
+
+
+# The outline reader below only handles .glif data as glifLib writes it: with
+# attributes in a fixed order, double-quoted, non-empty, and without entities,
+# comments or processing instructions. Anything else is left to glifLib.
+_unusualOutlineContent = [b"&", b"'", b'=""', b"<?"]
+_whitespacePat = re.compile(rb"\s*")
+_contourStartPat = re.compile(rb'<contour(?:\s+identifier="[^"]*")?\s*(/?)>')
+_componentPat = re.compile(rb"<component\s([^>]*?)/>")
+_pointPat = re.compile(
+    rb"""<point
+        \s+x="([^"]*)"
+        \s+y="([^"]*)"
+        (?:\s+type="([^"]*)")?
+        (?:\s+smooth="([^"]*)")?
+        (?:\s+name="([^"]*)")?
+        (?:\s+identifier="([^"]*)")?
+        \s*/>""",
+    re.VERBOSE,
+)
+_attributePat = re.compile(rb'([A-Za-z]+)\s*=\s*"([^"]*)"')
+
+_pointTypes = {
+    (segmentType, smooth): pointType
+    for segmentTypes, smooth, pointType in [
+        ([b"", b"offcurve"], False, PointType.OFF_CURVE_CUBIC),
+        ([b"", b"offcurve"], True, PointType.OFF_CURVE_CUBIC),
+        ([b"move", b"line", b"curve", b"qcurve"], False, PointType.ON_CURVE),
+        ([b"move", b"line", b"curve", b"qcurve"], True, PointType.ON_CURVE_SMOOTH),
+    ]
+    for segmentType in segmentTypes
+}
+
+_transformationAttributes = [
+    (b"xScale", 1),
+    (b"xyScale", 0),
+    (b"yxScale", 0),
+    (b"yScale", 1),
+    (b"xOffset", 0),
+    (b"yOffset", 0),
+]
+
+
+def splitGLIFOutline(data: bytes) -> tuple[bytes, PackedPath, list[Component]] | None:
+    """Read the outline of .glif data directly into a PackedPath and a list of
+    Components, instead of calling a point pen for each point.
+
+    Return the .glif data without the outline, to be read by glifLib, the path
+    and the components. The result is the same as reading the data with glifLib
+    and a PackedPathPointPen. Return None if the data contains anything this
+    reader does not handle, such as GLIF format 1 or unusual formatting, in
+    which case the caller should use glifLib.
+    """
+    if _glyphFormat2Pat.search(data) is None or b"<!" in data:
+        return None
+
+    outlineStart = data.find(b"<outline")
+    if outlineStart < 0:
+        outline = b""
+    else:
+        if data.startswith(b"<outline/>", outlineStart):
+            outline = b""
+            outlineEnd = outlineStart + len(b"<outline/>")
+        elif data.startswith(b"<outline>", outlineStart):
+            closingTagStart = data.find(b"</outline>", outlineStart)
+            if closingTagStart < 0:
+                return None
+            outline = data[outlineStart + len(b"<outline>") : closingTagStart]
+            outlineEnd = closingTagStart + len(b"</outline>")
+        else:
+            return None
+        if data.find(b"<outline", outlineEnd) >= 0:
+            return None
+        if any(content in outline for content in _unusualOutlineContent):
+            return None
+        data = data[:outlineStart] + data[outlineEnd:]
+
+    try:
+        pathAndComponents = _readOutline(outline)
+    except ValueError:
+        return None
+    if pathAndComponents is None:
+        return None
+    return data, *pathAndComponents
+
+
+def _readOutline(outline: bytes) -> tuple[PackedPath, list[Component]] | None:
+    coordinates: list[float] = []
+    pointTypes: list[PointType] = []
+    pointAttributes: list[dict | None] = []
+    contourInfo: list[ContourInfo] = []
+    components: list[Component] = []
+
+    position = _skipWhitespace(outline, 0)
+    while position < len(outline):
+        if outline.startswith(b"<contour", position):
+            m = _contourStartPat.match(outline, position)
+            if m is None:
+                return None
+            position = m.end()
+            if not m.group(1):
+                contourEnd = outline.find(b"</contour>", position)
+                if contourEnd < 0:
+                    return None
+                pointsData = outline[position:contourEnd]
+                position = contourEnd + len(b"</contour>")
+                points = _pointPat.findall(pointsData)
+                if len(points) != pointsData.count(b"<"):
+                    return None
+                # The pen ignores empty contours, too
+                if points:
+                    if not _readContour(
+                        points, coordinates, pointTypes, pointAttributes
+                    ):
+                        return None
+                    contourInfo.append(
+                        ContourInfo(
+                            endPoint=len(pointTypes) - 1,
+                            isClosed=points[0][2] != b"move",
+                        )
+                    )
+        elif outline.startswith(b"<component", position):
+            m = _componentPat.match(outline, position)
+            if m is None:
+                return None
+            position = m.end()
+            attributes = dict(_attributePat.findall(m.group(1)))
+            baseGlyphName = attributes.get(b"base")
+            if baseGlyphName is None:
+                return None
+            transformation = tuple(
+                _number(attributes[attr]) if attr in attributes else default
+                for attr, default in _transformationAttributes
+            )
+            components.append(
+                Component(
+                    name=baseGlyphName.decode("utf-8"),
+                    transformation=DecomposedTransform.fromTransform(transformation),
+                )
+            )
+        else:
+            return None
+        position = _skipWhitespace(outline, position)
+
+    path = PackedPath(coordinates, pointTypes, contourInfo, pointAttributes)
+    return path, components
+
+
+def _skipWhitespace(data: bytes, position: int) -> int:
+    m = _whitespacePat.match(data, position)
+    assert m is not None  # the pattern matches the empty string
+    return m.end()
+
+
+def _readContour(points, coordinates, pointTypes, pointAttributes) -> bool:
+    xs, ys, segmentTypes, smooths, names, identifiers = zip(*points)
+    try:
+        contourPointTypes = [
+            _pointTypes[segmentType, smooth == b"yes"]
+            for segmentType, smooth in zip(segmentTypes, smooths)
+        ]
+    except KeyError:
+        return False
+
+    numPoints = len(points)
+    contourCoordinates: list = [None] * (2 * numPoints)
+    contourCoordinates[::2] = xs
+    contourCoordinates[1::2] = ys
+    coordinates.extend(_numbers(contourCoordinates))
+
+    if any(names) or any(identifiers):
+        for name, identifier in zip(names, identifiers):
+            attrs = {}
+            if name:
+                attrs["name"] = name.decode("utf-8")
+            if identifier:
+                attrs["identifier"] = identifier.decode("utf-8")
+            pointAttributes.append(attrs if attrs else None)
+    else:
+        pointAttributes.extend([None] * numPoints)
+
+    if PointType.OFF_CURVE_CUBIC in contourPointTypes:
+        if all(
+            pointType == PointType.OFF_CURVE_CUBIC for pointType in contourPointTypes
+        ):
+            # A contour without on-curve points: a TrueType quadratic "blob"
+            contourPointTypes = [PointType.OFF_CURVE_QUAD] * numPoints
+        elif b"qcurve" in segmentTypes:
+            _fixQuadPointTypes(contourPointTypes, segmentTypes)
+    pointTypes.extend(contourPointTypes)
+    return True
+
+
+def _fixQuadPointTypes(pointTypes, segmentTypes) -> None:
+    # The off-curve points before a qcurve point are quadratic
+    numPoints = len(pointTypes)
+    isClosed = segmentTypes[0] != b"move"
+    for i, segmentType in enumerate(segmentTypes):
+        if segmentType != b"qcurve":
+            continue
+        stopIndex = i - numPoints if isClosed else -1
+        for j in range(i - 1, stopIndex, -1):
+            if pointTypes[j] != PointType.OFF_CURVE_CUBIC:
+                break
+            pointTypes[j] = PointType.OFF_CURVE_QUAD
+
+
+def _numbers(strings: list[bytes]) -> list[int | float]:
+    # Like _number() for each string, but faster for the common cases
+    try:
+        return list(map(int, strings))
+    except ValueError:
+        pass
+    try:
+        # int() fails for any string containing a period
+        return [float(s) if b"." in s else int(s) for s in strings]
+    except ValueError:
+        return [_number(s) for s in strings]
+
+
+def _number(s: bytes) -> int | float:
+    # Like glifLib: an int if the string is an integer, a float otherwise
+    try:
+        return int(s)
+    except ValueError:
+        return float(s)
@@ -109,6 +109,29 @@ class PythonBackend extends AbstractBackend {
     return VarPackedPath.fromObject(newPath);
   }
 
+  /**
+   * Get the decomposed outline of a glyph instance, as rendered by the server.
+   * @param {string} projectIdentifier
+   * @param {string} glyphName
+   * @param {Object} sourceLocation
+   * @returns {Promise<Object>} An object with "path" (an SVG path string),
+   * "xAdvance", "sourceIndex" and "status" properties. Throws if the server can't
+   * provide the outline, for example because the glyph does not exist.
+   */
+  static async getGlyphOutline(projectIdentifier, glyphName, sourceLocation) {
+    const query = new URLSearchParams({
+      project: projectIdentifier,
+      glyph: glyphName,
+      location: JSON.stringify(sourceLocation),
+    });
+    // The server sends an ETag, so the browser revalidates its cached copy
+    const response = await fetch(`/glyphoutline?${query}`);
+    if (!response.ok) {
+      throw new Error(`failed to fetch glyph outline: ${response.status}`);
+    }
+    return await response.json();
+  }
+
   /**
    *
    * @param {string} projectIdentifier
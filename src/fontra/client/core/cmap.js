@@ -70,6 +70,37 @@ export function makeCharacterMapFromGlyphMap(glyphMap, strict = true) {
   return characterMap;
 }
 
+export function addGlyphMapPage(glyphMap, characterMap, page) {
+  // Add the entries of a glyph map page, as returned by the server's
+  // getGlyphMapPage(), to `glyphMap`, and update `characterMap` accordingly,
+  // in the same way as makeCharacterMapFromGlyphMap(glyphMap, false) would.
+  // Return the added entries as [glyphName, codePoints] pairs.
+  const entries = [];
+  for (let i = 0; i < page.glyphNames.length; i++) {
+    const glyphName = page.glyphNames[i];
+    const codePoints = unpackCodePoints(page.codePoints[i]);
+    glyphMap[glyphName] = codePoints;
+    for (const codePoint of codePoints) {
+      const existingGlyphName = characterMap[codePoint];
+      if (existingGlyphName === undefined || glyphName < existingGlyphName) {
+        characterMap[codePoint] = glyphName;
+      }
+    }
+    entries.push([glyphName, codePoints]);
+  }
+  return entries;
+}
+
+function unpackCodePoints(packedCodePoints) {
+  // See packGlyphMapCodePoints() in fontra/core/fonthandler.py
+  if (packedCodePoints === -1) {
+    return [];
+  } else if (typeof packedCodePoints === "number") {
+    return [packedCodePoints];
+  }
+  return packedCodePoints;
+}
+
 export function getGlyphMapProxy(glyphMap, characterMap) {
   //
   // Return a wrapper (Proxy) for `glyphMap`, that behaves exactly like `glyphMap`,
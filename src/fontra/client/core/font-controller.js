@@ -7,12 +7,15 @@ import {
   matchChangePattern,
 } from "./changes.js";
 import { getClassSchema } from "./classes.js";
-import { getGlyphMapProxy, makeCharacterMapFromGlyphMap } from "./cmap.js";
+import {
+  addGlyphMapPage,
+  getGlyphMapProxy,
+  makeCharacterMapFromGlyphMap,
+} from "./cmap.js";
 import { CrossAxisMapping } from "./cross-axis-mapping.js";
 import { FontSourcesInstancer } from "./font-sources-instancer.js";
 import { StaticGlyphController, VariableGlyphController } from "./glyph-controller.js";
 import { LRUCache } from "./lru-cache.js";
-import { setPopFirst } from "./set-ops.js";
 import { TaskPool } from "./task-pool.js";
 import {
   assert,
@@ -38,6 +41,8 @@ import {
 const GLYPH_CACHE_SIZE = 2000;
 const BACKGROUND_IMAGE_CACHE_SIZE = 100;
 const NUM_TASKS = 12;
+const GLYPH_REQUEST_BATCH_SIZE = 100;
+const GLYPH_MAP_PAGE_SIZE = 5000;
 
 export class FontController {
   /**
@@ -48,6 +53,8 @@ export class FontController {
     this._glyphsPromiseCache = new LRUCache(GLYPH_CACHE_SIZE); // glyph name -> var-glyph promise
     this._glyphInstancePromiseCache = new LRUCache(GLYPH_CACHE_SIZE); // instance cache key -> instance promise
     this._glyphInstancePromiseCacheKeys = {}; // glyphName -> Set(instance cache keys)
+    this._glyphRevisions = {}; // glyph name -> server revision of the cached glyph
+    this.projectIdentifier = undefined; // set by ViewController.fromBackend()
     this._editListeners = new Set();
     this._changeListeners = [];
     this._changeListenersLive = [];
@@ -63,9 +70,26 @@ export class FontController {
     this._backgroundImageCache = new LRUCache(BACKGROUND_IMAGE_CACHE_SIZE);
   }
 
-  async initialize(initListener = true) {
-    const glyphMap = await this.font.getGlyphMap();
-    this.characterMap = makeCharacterMapFromGlyphMap(glyphMap, false);
+  async initialize(initListener = true, { incrementalGlyphMap = false } = {}) {
+    // With `incrementalGlyphMap`, initialize() returns once the first page of
+    // the glyph map has been loaded. The other pages are added as they arrive,
+    // as glyphMap changes, and the `glyphMapLoaded` promise resolves when done.
+    let glyphMap;
+    if (incrementalGlyphMap) {
+      glyphMap = {};
+      this.characterMap = {};
+      const firstPage = await this.font.getGlyphMapPage(0, GLYPH_MAP_PAGE_SIZE);
+      addGlyphMapPage(glyphMap, this.characterMap, firstPage);
+      this.glyphMapLoaded = this._loadGlyphMapPages(
+        glyphMap,
+        this.characterMap,
+        firstPage.totalCount
+      );
+    } else {
+      glyphMap = await this.font.getGlyphMap();
+      this.characterMap = makeCharacterMapFromGlyphMap(glyphMap, false);
+      this.glyphMapLoaded = Promise.resolve();
+    }
     this._rootObject = {};
     this._rootObject.glyphMap = getGlyphMapProxy(glyphMap, this.characterMap);
     this._rootObject.axes = ensureDenseAxes(await this.font.getAxes());
@@ -86,6 +110,28 @@ export class FontController {
     this._resolveInitialized();
   }
 
+  async _loadGlyphMapPages(glyphMap, characterMap, totalCount) {
+    const pagePromises = [];
+    for (
+      let start = GLYPH_MAP_PAGE_SIZE;
+      start < totalCount;
+      start += GLYPH_MAP_PAGE_SIZE
+    ) {
+      // Request all pages at once, so they're loaded in parallel
+      pagePromises.push(this.font.getGlyphMapPage(start, GLYPH_MAP_PAGE_SIZE));
+    }
+    for (const pagePromise of pagePromises) {
+      const entries = addGlyphMapPage(glyphMap, characterMap, await pagePromise);
+      if (entries.length) {
+        const change = {
+          p: ["glyphMap"],
+          c: entries.map((entry) => ({ f: "=", a: entry })),
+        };
+        this.notifyChangeListeners(change, false, true);
+      }
+    }
+  }
+
   subscribeChanges(pathOrPattern, wantLiveChanges) {
     this.font.subscribeChanges(pathOrPattern, wantLiveChanges);
   }
@@ -333,8 +379,8 @@ export class FontController {
     // Load all glyphs named in the glyphNames array, as well as
     // all of their dependencies (made-of). Return a promise that
     // will resolve once all requested glyphs have been loaded.
-    // The loading will be done in parallel: this is much faster if
-    // the server supports parallelism (for example fontra-rcjk).
+    // The glyphs are requested a level of dependencies at a time, so
+    // getGlyph() can send them to the server in batches.
     if (this._loadGlyphsTodo) {
       for (const glyphName of glyphNames) {
         if (!this._loadGlyphsDone.has(glyphName)) {
@@ -350,32 +396,25 @@ export class FontController {
       this._loadGlyphsTodo = todo;
 
       const loadGlyph = async (glyphName) => {
-        if (done.has(glyphName)) {
+        try {
+          await this.getGlyph(glyphName);
+        } catch (error) {
+          console.error(error);
           return;
         }
-        done.add(glyphName);
-
-        await this.getGlyph(glyphName);
-
         for (const subGlyphName of this.iterGlyphsMadeOfRecursively(glyphName)) {
-          todo.add(subGlyphName);
+          if (!done.has(subGlyphName)) {
+            todo.add(subGlyphName);
+          }
         }
       };
 
-      const pool = new TaskPool(NUM_TASKS);
-
-      const t = performance.now();
-      let count = 0;
       while (todo.size) {
-        while (todo.size) {
-          const glyphName = setPopFirst(todo);
-          count++;
-          await pool.schedule(async () => await loadGlyph(glyphName));
-        }
-        await pool.wait();
+        const glyphNamesToLoad = [...todo];
+        todo.clear();
+        glyphNamesToLoad.forEach((glyphName) => done.add(glyphName));
+        await Promise.all(glyphNamesToLoad.map(loadGlyph));
       }
-      const elapsed = performance.now() - t;
-      // console.log("loadGlyphs", count, elapsed);
     } finally {
       delete this._loadGlyphsDone;
       delete this._loadGlyphsTodo;
@@ -399,9 +438,63 @@ export class FontController {
     return glyphPromise;
   }
 
-  async _getGlyph(glyphName) {
-    let glyph = await this.font.getGlyph(glyphName);
-    if (glyph !== null) {
+  _getGlyph(glyphName) {
+    // Glyphs requested during the same event loop cycle are fetched from the
+    // server with getGlyphs() calls of up to GLYPH_REQUEST_BATCH_SIZE glyphs
+    return new Promise((resolve, reject) => {
+      if (!this._pendingGlyphRequests) {
+        this._pendingGlyphRequests = new Map();
+        setTimeout(() => this._sendGlyphRequests(), 0);
+      }
+      if (!this._pendingGlyphRequests.has(glyphName)) {
+        this._pendingGlyphRequests.set(glyphName, []);
+      }
+      this._pendingGlyphRequests.get(glyphName).push({ resolve, reject });
+    });
+  }
+
+  _sendGlyphRequests() {
+    const requests = this._pendingGlyphRequests;
+    delete this._pendingGlyphRequests;
+    const glyphNames = [...requests.keys()];
+    for (let i = 0; i < glyphNames.length; i += GLYPH_REQUEST_BATCH_SIZE) {
+      this._sendGlyphRequestBatch(
+        glyphNames.slice(i, i + GLYPH_REQUEST_BATCH_SIZE),
+        requests
+      );
+    }
+  }
+
+  async _sendGlyphRequestBatch(glyphNames, requests) {
+    let responses;
+    try {
+      // Pass true, so we receive the revisions along with the glyphs
+      responses = await this.font.getGlyphs(glyphNames, true);
+    } catch (error) {
+      glyphNames.forEach((glyphName) =>
+        requests.get(glyphName).forEach(({ reject }) => reject(error))
+      );
+      return;
+    }
+    for (const glyphName of glyphNames) {
+      const response = responses[glyphName];
+      let glyph;
+      try {
+        glyph = this._makeGlyphControllerFromResponse(response);
+      } catch (error) {
+        requests.get(glyphName).forEach(({ reject }) => reject(error));
+        continue;
+      }
+      if (response.revision) {
+        this._glyphRevisions[glyphName] = response.revision;
+      }
+      requests.get(glyphName).forEach(({ resolve }) => resolve(glyph));
+    }
+  }
+
+  _makeGlyphControllerFromResponse(response) {
+    let glyph = response.glyph;
+    if (glyph) {
       glyph = this.makeVariableGlyphController(VariableGlyph.fromObject(glyph));
       this.updateGlyphDependencies(glyph);
     }
@@ -508,6 +601,8 @@ export class FontController {
   }
 
   async glyphChanged(glyphName, senderInfo) {
+    // Our copy of the glyph no longer matches the revision we received
+    delete this._glyphRevisions[glyphName];
     const glyphNames = [glyphName, ...this.iterGlyphsUsedByRecursively(glyphName)];
     for (const glyphName of glyphNames) {
       this._purgeInstanceCache(glyphName);
@@ -855,6 +950,7 @@ export class FontController {
     this._glyphsPromiseCache.clear();
     this._glyphInstancePromiseCache.clear();
     this._glyphInstancePromiseCacheKeys = {};
+    this._glyphRevisions = {};
     await this.initialize(false);
     this.notifyChangeListeners(null, false, true);
   }
@@ -867,10 +963,29 @@ export class FontController {
         // weird timing problem, and this sleepAsync() resolves that.
         await sleepAsync(0);
       }
+      const revision = this._glyphRevisions[glyphName];
+      let response;
+      if (revision && this._glyphsPromiseCache.has(glyphName)) {
+        // Only fetch the glyph if it differs from our copy
+        response = await this.font.getGlyph(glyphName, revision);
+        if (response.unchanged) {
+          continue;
+        }
+      }
       this._purgeGlyphCache(glyphName);
+      if (response?.glyph) {
+        this._glyphsPromiseCache.put(
+          glyphName,
+          Promise.resolve(this._makeGlyphControllerFromResponse(response))
+        );
+      }
       // The undo stack is local, so any external change invalidates it
       delete this.undoStacks[glyphName];
       this.glyphChanged(glyphName, { senderID: this });
+      if (response?.glyph) {
+        // glyphChanged() dropped the revision, but our copy is up to date
+        this._glyphRevisions[glyphName] = response.revision;
+      }
     }
   }
 
@@ -1086,7 +1201,7 @@ function _popUndoRedoRecord(popStack, pushStack) {
   return undoRecord;
 }
 
-function collectGlyphNames(change) {
+export function collectGlyphNames(change) {
   return collectChangePaths(change, 2)
     .filter((item) => item[0] === "glyphs" && item[1] !== undefined)
     .map((item) => item[1]);
@@ -0,0 +1,348 @@
+// A minimal MessagePack encoder/decoder for the remote object protocol.
+//
+// The extension types below must match fontra/core/messagecodec.py. They are
+// used by the server for the large numeric arrays of packed paths, and are
+// decoded into plain arrays.
+
+export const EXT_FLOAT32_ARRAY = 1;
+export const EXT_FLOAT64_ARRAY = 2;
+export const EXT_UINT8_ARRAY = 3;
+
+const textEncoder = new TextEncoder();
+const textDecoder = new TextDecoder();
+
+export function encode(value) {
+  const encoder = new Encoder();
+  encoder.encode(value);
+  return encoder.getBytes();
+}
+
+export function decode(bytes) {
+  if (bytes instanceof ArrayBuffer) {
+    bytes = new Uint8Array(bytes);
+  }
+  const decoder = new Decoder(bytes);
+  const value = decoder.decode();
+  if (decoder.pos !== bytes.length) {
+    throw new Error("msgpack: extra bytes after value");
+  }
+  return value;
+}
+
+class Encoder {
+  constructor() {
+    this.bytes = new Uint8Array(1024);
+    this.view = new DataView(this.bytes.buffer);
+    this.pos = 0;
+  }
+
+  getBytes() {
+    return this.bytes.subarray(0, this.pos);
+  }
+
+  ensure(numBytes) {
+    const needed = this.pos + numBytes;
+    if (needed <= this.bytes.length) {
+      return;
+    }
+    let newLength = this.bytes.length * 2;
+    while (newLength < needed) {
+      newLength *= 2;
+    }
+    const newBytes = new Uint8Array(newLength);
+    newBytes.set(this.bytes.subarray(0, this.pos));
+    this.bytes = newBytes;
+    this.view = new DataView(this.bytes.buffer);
+  }
+
+  writeUint8(v) {
+    this.ensure(1);
+    this.view.setUint8(this.pos, v);
+    this.pos += 1;
+  }
+
+  writeHeader(typeByte, numBytes, setter, v) {
+    this.ensure(1 + numBytes);
+    this.view.setUint8(this.pos, typeByte);
+    this.view[setter](this.pos + 1, v);
+    this.pos += 1 + numBytes;
+  }
+
+  writeBytes(bytes) {
+    this.ensure(bytes.length);
+    this.bytes.set(bytes, this.pos);
+    this.pos += bytes.length;
+  }
+
+  encode(value) {
+    // Mirror JSON.stringify(): undefined and functions become null, and
+    // objects may provide a toJSON() method
+    if (value === null || value === undefined || typeof value === "function") {
+      this.writeUint8(0xc0);
+    } else if (value === false) {
+      this.writeUint8(0xc2);
+    } else if (value === true) {
+      this.writeUint8(0xc3);
+    } else if (typeof value === "number") {
+      this.encodeNumber(value);
+    } else if (typeof value === "string") {
+      this.encodeString(value);
+    } else if (typeof value.toJSON === "function") {
+      this.encode(value.toJSON());
+    } else if (Array.isArray(value)) {
+      this.encodeArrayHeader(value.length);
+      for (const item of value) {
+        this.encode(item);
+      }
+    } else if (value instanceof Uint8Array) {
+      this.encodeBinary(value);
+    } else {
+      this.encodeObject(value);
+    }
+  }
+
+  encodeNumber(value) {
+    if (Number.isInteger(value) && Number.isSafeInteger(value)) {
+      if (value >= 0) {
+        if (value < 0x80) {
+          this.writeUint8(value);
+        } else if (value < 0x100) {
+          this.writeHeader(0xcc, 1, "setUint8", value);
+        } else if (value < 0x10000) {
+          this.writeHeader(0xcd, 2, "setUint16", value);
+        } else if (value < 0x100000000) {
+          this.writeHeader(0xce, 4, "setUint32", value);
+        } else {
+          this.writeHeader(0xcf, 8, "setBigUint64", BigInt(value));
+        }
+      } else {
+        if (value >= -0x20) {
+          this.writeUint8(value & 0xff);
+        } else if (value >= -0x80) {
+          this.writeHeader(0xd0, 1, "setInt8", value);
+        } else if (value >= -0x8000) {
+          this.writeHeader(0xd1, 2, "setInt16", value);
+        } else if (value >= -0x80000000) {
+          this.writeHeader(0xd2, 4, "setInt32", value);
+        } else {
+          this.writeHeader(0xd3, 8, "setBigInt64", BigInt(value));
+        }
+      }
+    } else if (Number.isFinite(value)) {
+      this.writeHeader(0xcb, 8, "setFloat64", value);
+    } else {
+      // JSON.stringify() turns NaN and Infinity into null
+      this.writeUint8(0xc0);
+    }
+  }
+
+  encodeString(value) {
+    const bytes = textEncoder.encode(value);
+    const length = bytes.length;
+    if (length < 0x20) {
+      this.writeUint8(0xa0 | length);
+    } else if (length < 0x100) {
+      this.writeHeader(0xd9, 1, "setUint8", length);
+    } else if (length < 0x10000) {
+      this.writeHeader(0xda, 2, "setUint16", length);
+    } else {
+      this.writeHeader(0xdb, 4, "setUint32", length);
+    }
+    this.writeBytes(bytes);
+  }
+
+  encodeBinary(value) {
+    const length = value.length;
+    if (length < 0x100) {
+      this.writeHeader(0xc4, 1, "setUint8", length);
+    } else if (length < 0x10000) {
+      this.writeHeader(0xc5, 2, "setUint16", length);
+    } else {
+      this.writeHeader(0xc6, 4, "setUint32", length);
+    }
+    this.writeBytes(value);
+  }
+
+  encodeArrayHeader(length) {
+    if (length < 0x10) {
+      this.writeUint8(0x90 | length);
+    } else if (length < 0x10000) {
+      this.writeHeader(0xdc, 2, "setUint16", length);
+    } else {
+      this.writeHeader(0xdd, 4, "setUint32", length);
+    }
+  }
+
+  encodeObject(value) {
+    const entries = Object.entries(value).filter(
+      ([key, item]) => item !== undefined && typeof item !== "function"
+    );
+    const length = entries.length;
+    if (length < 0x10) {
+      this.writeUint8(0x80 | length);
+    } else if (length < 0x10000) {
+      this.writeHeader(0xde, 2, "setUint16", length);
+    } else {
+      this.writeHeader(0xdf, 4, "setUint32", length);
+    }
+    for (const [key, item] of entries) {
+      this.encodeString(key);
+      this.encode(item);
+    }
+  }
+}
+
+class Decoder {
+  constructor(bytes) {
+    this.bytes = bytes;
+    this.view = new DataView(bytes.buffer, bytes.byteOffset, bytes.byteLength);
+    this.pos = 0;
+  }
+
+  read(getter, numBytes) {
+    const value = this.view[getter](this.pos);
+    this.pos += numBytes;
+    return value;
+  }
+
+  readBytes(length) {
+    const bytes = this.bytes.subarray(this.pos, this.pos + length);
+    if (bytes.length !== length) {
+      throw new Error("msgpack: unexpected end of data");
+    }
+    this.pos += length;
+    return bytes;
+  }
+
+  decode() {
+    const typeByte = this.read("getUint8", 1);
+    if (typeByte < 0x80) {
+      return typeByte;
+    } else if (typeByte < 0x90) {
+      return this.decodeMap(typeByte & 0x0f);
+    } else if (typeByte < 0xa0) {
+      return this.decodeArray(typeByte & 0x0f);
+    } else if (typeByte < 0xc0) {
+      return this.decodeString(typeByte & 0x1f);
+    } else if (typeByte >= 0xe0) {
+      return typeByte - 0x100;
+    }
+    switch (typeByte) {
+      case 0xc0:
+        return null;
+      case 0xc2:
+        return false;
+      case 0xc3:
+        return true;
+      case 0xc4:
+        return this.readBytes(this.read("getUint8", 1)).slice();
+      case 0xc5:
+        return this.readBytes(this.read("getUint16", 2)).slice();
+      case 0xc6:
+        return this.readBytes(this.read("getUint32", 4)).slice();
+      case 0xc7:
+        return this.decodeExt(this.read("getUint8", 1));
+      case 0xc8:
+        return this.decodeExt(this.read("getUint16", 2));
+      case 0xc9:
+        return this.decodeExt(this.read("getUint32", 4));
+      case 0xca:
+        return this.read("getFloat32", 4);
+      case 0xcb:
+        return this.read("getFloat64", 8);
+      case 0xcc:
+        return this.read("getUint8", 1);
+      case 0xcd:
+        return this.read("getUint16", 2);
+      case 0xce:
+        return this.read("getUint32", 4);
+      case 0xcf:
+        return Number(this.read("getBigUint64", 8));
+      case 0xd0:
+        return this.read("getInt8", 1);
+      case 0xd1:
+        return this.read("getInt16", 2);
+      case 0xd2:
+        return this.read("getInt32", 4);
+      case 0xd3:
+        return Number(this.read("getBigInt64", 8));
+      case 0xd4:
+        return this.decodeExt(1);
+      case 0xd5:
+        return this.decodeExt(2);
+      case 0xd6:
+        return this.decodeExt(4);
+      case 0xd7:
+        return this.decodeExt(8);
+      case 0xd8:
+        return this.decodeExt(16);
+      case 0xd9:
+        return this.decodeString(this.read("getUint8", 1));
+      case 0xda:
+        return this.decodeString(this.read("getUint16", 2));
+      case 0xdb:
+        return this.decodeString(this.read("getUint32", 4));
+      case 0xdc:
+        return this.decodeArray(this.read("getUint16", 2));
+      case 0xdd:
+        return this.decodeArray(this.read("getUint32", 4));
+      case 0xde:
+        return this.decodeMap(this.read("getUint16", 2));
+      case 0xdf:
+        return this.decodeMap(this.read("getUint32", 4));
+    }
+    throw new Error(`msgpack: invalid type byte 0x${typeByte.toString(16)}`);
+  }
+
+  decodeString(length) {
+    return textDecoder.decode(this.readBytes(length));
+  }
+
+  decodeArray(length) {
+    const array = new Array(length);
+    for (let i = 0; i < length; i++) {
+      array[i] = this.decode();
+    }
+    return array;
+  }
+
+  decodeMap(length) {
+    const obj = {};
+    for (let i = 0; i < length; i++) {
+      const key = this.decode();
+      // Define the property rather than assigning it, so a "__proto__" key
+      // becomes an own property, and doesn't replace the prototype
+      Object.defineProperty(obj, key, {
+        value: this.decode(),
+        writable: true,
+        enumerable: true,
+        configurable: true,
+      });
+    }
+    return obj;
+  }
+
+  decodeExt(length) {
+    const extType = this.read("getInt8", 1);
+    const start = this.pos;
+    this.readBytes(length);
+    switch (extType) {
+      case EXT_FLOAT32_ARRAY:
+        return this.decodeNumberArray(start, length / 4, 4, "getFloat32");
+      case EXT_FLOAT64_ARRAY:
+        return this.decodeNumberArray(start, length / 8, 8, "getFloat64");
+      case EXT_UINT8_ARRAY:
+        return Array.from(this.bytes.subarray(start, start + length));
+    }
+    throw new Error(`msgpack: unknown extension type ${extType}`);
+  }
+
+  decodeNumberArray(start, numItems, itemSize, getter) {
+    // Use a DataView rather than a typed array, as the data may not be aligned
+    const array = new Array(numItems);
+    for (let i = 0; i < numItems; i++) {
+      array[i] = this.view[getter](start + i * itemSize, true);
+    }
+    return array;
+  }
+}
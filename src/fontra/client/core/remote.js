@@ -1,4 +1,9 @@
 import { RemoteError } from "./errors.js";
+import { decode as decodeMessagePack, encode as encodeMessagePack } from "./msgpack.js";
+
+// In order of preference. The server picks the encoding, and tells us in its
+// reply to the handshake message.
+const MESSAGE_ENCODINGS = ["msgpack", "json"];
 
 export async function getRemoteProxy(wsURL) {
   const remote = new RemoteObject(wsURL);
@@ -85,15 +90,22 @@ export class RemoteObject {
       throw new Error("assert -- trying to open new websocket while we still have one");
     }
     this.websocket = new WebSocket(this.wsURL);
+    this.websocket.binaryType = "arraybuffer";
     this.websocket.onmessage = (event) => this._handleIncomingMessage(event);
+    this.messageEncoding = "json";
     this._connectPromise = new Promise((resolve, reject) => {
       this.websocket.onopen = (event) => {
-        resolve(event);
-        delete this._connectPromise;
+        // We are connected once the server replied to the handshake message
+        this._handshakeDone = () => {
+          delete this._handshakeDone;
+          delete this._connectPromise;
+          resolve(event);
+        };
         this.websocket.onclose = (event) => this._trigger("close", event);
         this.websocket.onerror = (event) => this._trigger("error", event);
         const message = {
           "client-uuid": this.clientUUID,
+          "message-encodings": MESSAGE_ENCODINGS,
         };
         this.websocket.send(JSON.stringify(message));
       };
@@ -111,7 +123,18 @@ export class RemoteObject {
   }
 
   async _handleIncomingMessage(event) {
-    const message = JSON.parse(event.data);
+    const message =
+      typeof event.data === "string"
+        ? JSON.parse(event.data)
+        : decodeMessagePack(event.data);
+
+    if (message["message-encoding"] !== undefined) {
+      // this is the server's reply to the handshake message
+      this.messageEncoding = message["message-encoding"];
+      this._handshakeDone?.();
+      return;
+    }
+
     const clientCallID = message["client-call-id"];
     const serverCallID = message["server-call-id"];
 
@@ -144,7 +167,15 @@ export class RemoteObject {
         console.error(error, error.stack);
         returnMessage = { "server-call-id": serverCallID, "error": error.toString() };
       }
-      this.websocket.send(JSON.stringify(returnMessage));
+      this._sendMessage(returnMessage);
+    }
+  }
+
+  _sendMessage(message) {
+    if (this.messageEncoding === "msgpack") {
+      this.websocket.send(encodeMessagePack(message));
+    } else {
+      this.websocket.send(JSON.stringify(message));
     }
   }
 
@@ -160,7 +191,7 @@ export class RemoteObject {
       // console.log("waiting for reconnect");
       await this._connect();
     }
-    this.websocket.send(JSON.stringify(message));
+    this._sendMessage(message);
 
     this._callReturnCallbacks[clientCallID] = {};
     return new Promise((resolve, reject) => {
@@ -34,6 +34,7 @@ export class ViewController {
 
     const remoteFontEngine = await Backend.remoteFont(projectIdentifier);
     const controller = new this(remoteFontEngine);
+    controller.fontController.projectIdentifier = projectIdentifier;
     remoteFontEngine.on("close", (event) => controller.handleRemoteClose(event));
     remoteFontEngine.on("error", (event) => controller.handleRemoteError(event));
     remoteFontEngine.on("messageFromServer", (headline, msg) =>
@@ -1,3 +1,4 @@
+import { collectGlyphNames } from "/core/font-controller.js";
 import * as html from "/core/html-utils.js";
 import { translate } from "/core/localization.js";
 import { difference, intersection, symmetricDifference, union } from "/core/set-ops.js";
@@ -55,6 +56,25 @@ export class GlyphCellView extends HTMLElement {
       );
     });
 
+    this.fontController.addChangeListener(
+      { glyphs: null },
+      (change, isExternalChange) => {
+        if (!isExternalChange) {
+          return;
+        }
+        // Cells that show an outline drawn by the server don't load their glyph,
+        // so the font controller doesn't tell them about external changes. The
+        // cells re-request their outline, which is cheap if it didn't change, as
+        // it is revalidated with its ETag.
+        const glyphNames = new Set(collectGlyphNames(change));
+        this.forEachGlyphCell((glyphCell) => {
+          if (glyphCell.isVisible && glyphNames.has(glyphCell.glyphName)) {
+            glyphCell.throttledUpdate();
+          }
+        });
+      }
+    );
+
     this._intersectionObserver = new IntersectionObserver((entries, observer) => {
       entries.forEach((entry) => {
         if (entry.intersectionRatio > 0) {
@@ -1,5 +1,6 @@
 import { InlineSVG } from "./inline-svg.js";
 import { themeColorCSS } from "./theme-support.js";
+import { Backend } from "/core/backend-api.js";
 import { SVGPath2D } from "/core/glyph-svg.js";
 import * as html from "/core/html-utils.js";
 import { UnlitElement } from "/core/html-utils.js";
@@ -21,7 +22,8 @@ const cellObserver = new IntersectionObserver(
   (entries, observer) => {
     entries.forEach((entry) => {
       const cell = entry.target;
-      if (entry.intersectionRatio > 0) {
+      cell.isVisible = entry.intersectionRatio > 0;
+      if (cell.isVisible) {
         cell.locationController.addKeyListener(cell.locationKey, cell.throttledUpdate);
         cell.fontController.addGlyphChangeListener(
           cell.glyphName,
@@ -131,6 +133,7 @@ export class GlyphCell extends UnlitElement {
       ? getCharFromCodePoint(this.codePoints[0]) || ""
       : "";
     this._selected = false;
+    this.isVisible = false;
   }
 
   connectedCallback() {
@@ -141,6 +144,7 @@ export class GlyphCell extends UnlitElement {
   disconnectedCallback() {
     super.disconnectedCallback?.();
     cellObserver.unobserve(this);
+    this.isVisible = false;
     this.locationController.removeKeyListener(this.locationKey, this.throttledUpdate);
     this.fontController.removeGlyphChangeListener(this.glyphName, this.throttledUpdate);
   }
@@ -149,11 +153,8 @@ export class GlyphCell extends UnlitElement {
     this.width = this.height;
 
     const location = this.locationController.model[this.locationKey];
-    const request = this.fontController.requestGlyphInstance(this.glyphName, location);
-    this._glyphInstanceRequestID = request.requestID;
-    const glyphController = await request.instancePromise;
-    delete this._glyphInstanceRequestID;
-    if (!glyphController) {
+    const outline = await this._getGlyphOutline(location);
+    if (!outline) {
       // glyph instance request got cancelled, or glyph does not exist
       this._glyphSVG = null;
       return;
@@ -166,14 +167,11 @@ export class GlyphCell extends UnlitElement {
     const descender =
       fontSource?.lineMetricsHorizontalLayout["descender"]?.value || -0.2 * unitsPerEm;
 
-    const svgPath = new SVGPath2D();
-    glyphController.flattenedPath.drawToPath2d(svgPath);
-
     const size = this.size;
     const height = this.height;
     this.width = Math.max(
       height,
-      ((1 + 2 * this.marginSide) * size * glyphController.xAdvance) / unitsPerEm
+      ((1 + 2 * this.marginSide) * size * outline.xAdvance) / unitsPerEm
     );
 
     const svgElement = svg.svg(
@@ -181,7 +179,7 @@ export class GlyphCell extends UnlitElement {
         viewBox: svg.viewBox(
           -this.marginSide * unitsPerEm,
           -(ascender + this.marginTop * unitsPerEm),
-          Math.max(glyphController.xAdvance + 2 * this.marginSide * unitsPerEm, 1), // a width of 0 is problematic
+          Math.max(outline.xAdvance + 2 * this.marginSide * unitsPerEm, 1), // a width of 0 is problematic
           ascender - descender + (this.marginTop + this.marginBottom) * unitsPerEm
         ),
         width: "100%",
@@ -189,7 +187,7 @@ export class GlyphCell extends UnlitElement {
       },
       [
         svg.path({
-          d: svgPath.getPath(),
+          d: outline.path,
           transform: new Transform(1, 0, 0, -1, 0, 0),
         }),
       ]
@@ -197,13 +195,61 @@ export class GlyphCell extends UnlitElement {
 
     this._glyphStatusColor = getStatusColor(
       this.fontController.customData["fontra.sourceStatusFieldDefinitions"],
-      glyphController.varGlyph,
-      glyphController.sourceIndex
+      outline.status,
+      outline.sourceIndex
     );
     this._glyphSVG = svgElement;
     this.requestUpdate();
   }
 
+  async _getGlyphOutline(location) {
+    // Returns { path, xAdvance, status, sourceIndex }, or null
+    const projectIdentifier = this.fontController.projectIdentifier;
+    if (
+      projectIdentifier !== undefined &&
+      !this.fontController.areGlyphsCached([this.glyphName])
+    ) {
+      // Let the server instantiate and decompose the glyph, so we don't have
+      // to load the variable glyph and its components for every cell
+      let outline;
+      try {
+        outline = await Backend.getGlyphOutline(
+          projectIdentifier,
+          this.glyphName,
+          location
+        );
+      } catch (error) {
+        // The glyph does not exist, or the server can't instantiate it: let
+        // the font controller sort it out below
+      }
+      if (outline) {
+        return { ...outline, sourceIndex: outline.sourceIndex ?? undefined };
+      }
+    }
+
+    const request = this.fontController.requestGlyphInstance(this.glyphName, location);
+    this._glyphInstanceRequestID = request.requestID;
+    const glyphController = await request.instancePromise;
+    delete this._glyphInstanceRequestID;
+    if (!glyphController) {
+      return null;
+    }
+    const svgPath = new SVGPath2D();
+    glyphController.flattenedPath.drawToPath2d(svgPath);
+    const sourceIndex = glyphController.sourceIndex;
+    return {
+      path: svgPath.getPath(),
+      xAdvance: glyphController.xAdvance,
+      status:
+        sourceIndex !== undefined
+          ? glyphController.varGlyph.sources[sourceIndex].customData[
+              "fontra.development.status"
+            ]
+          : undefined,
+      sourceIndex,
+    };
+  }
+
   render() {
     const fallbackFontSize = this.height / 2;
     this._glyphCellContent = html.div({ id: "glyph-cell-container" }, [
@@ -261,14 +307,13 @@ export class GlyphCell extends UnlitElement {
   }
 }
 
-function getStatusColor(statusFieldDefinitions, varGlyph, sourceIndex) {
+function getStatusColor(statusFieldDefinitions, status, sourceIndex) {
   let statusColor = "var(--cell-background-color)";
   if (!statusFieldDefinitions || sourceIndex === undefined) {
     return statusColor;
   }
 
-  let status = varGlyph?.sources[sourceIndex].customData["fontra.development.status"];
-  if (status === undefined) {
+  if (status === undefined || status === null) {
     status = statusFieldDefinitions.find((statusDef) => statusDef.isDefault)?.value;
   }
 
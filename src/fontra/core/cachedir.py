@@ -0,0 +1,36 @@
+import hashlib
+import os
+import pathlib
+import sys
+
+CACHE_DIR_ENVIRON_KEY = "FONTRA_CACHE_DIR"
+
+
+def getCacheDir() -> pathlib.Path:
+    """Return the root folder for Fontra's on-disk caches. The folder may not
+    exist yet. It can be overridden with the FONTRA_CACHE_DIR environment
+    variable.
+    """
+    cacheDir = os.environ.get(CACHE_DIR_ENVIRON_KEY)
+    if cacheDir:
+        return pathlib.Path(cacheDir)
+
+    home = pathlib.Path.home()
+    if sys.platform == "darwin":
+        baseDir = home / "Library" / "Caches"
+    elif sys.platform == "win32":
+        baseDir = pathlib.Path(
+            os.environ.get("LOCALAPPDATA") or home / "AppData" / "Local"
+        )
+    else:
+        baseDir = pathlib.Path(os.environ.get("XDG_CACHE_HOME") or home / ".cache")
+    return baseDir / "fontra"
+
+
+def getProjectCacheDir(projectPath: os.PathLike | str) -> pathlib.Path:
+    """Return a cache folder specific to the project at `projectPath`. The folder
+    may not exist yet.
+    """
+    projectPath = pathlib.Path(projectPath).resolve()
+    digest = hashlib.sha256(os.fsencode(projectPath)).hexdigest()[:16]
+    return getCacheDir() / "projects" / f"{projectPath.name}-{digest}"
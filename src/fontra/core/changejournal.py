@@ -0,0 +1,108 @@
+"""An append-only on-disk journal of data that hasn't been written to the
+backend yet.
+
+FontHandler applies edits to its in-memory data right away, but writes them to
+the backend asynchronously, so a crash can lose the edits that are still in
+the write queue. With a ChangeJournal, FontHandler records every glyph and root
+data item (such as "sources") that a final change modifies, before scheduling
+its write. When the journal is synced, which happens in batches, a snapshot of
+the current value of each recorded item is appended to the file. The file is
+removed once the write queue has been fully written.
+
+A FontHandler that starts with a non-empty journal restores the last snapshot
+of each item, and writes it to the backend. The snapshots hold the data itself
+rather than the edits, so restoring an item that was already written before a
+crash writes the same data again, even if the crash happened halfway through a
+batch of glyph writes.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import pathlib
+from typing import Any
+
+from .classes import unstructure
+
+logger = logging.getLogger(__name__)
+
+
+CHANGE_JOURNAL_FILE_NAME = "change-journal.jsonl"
+SYNC_DELAY = 0.2  # in seconds
+
+# An item key is a root key, such as "sources", or ("glyphs", glyphName)
+ItemKey = str | tuple[str, str]
+
+
+class ChangeJournal:
+    def __init__(self, path: os.PathLike) -> None:
+        self.path = pathlib.Path(path)
+        self._file: Any = None
+        self._syncHandle: asyncio.TimerHandle | None = None
+        # Items that were recorded since the last sync, with their live values
+        self._pendingItems: dict[ItemKey, Any] = {}
+
+    def readItems(self) -> dict[ItemKey, Any]:
+        """Return the last snapshot of each item in the journal, as unstructured
+        data. The value of a deleted glyph is None.
+        """
+        if not self.path.exists():
+            return {}
+        items = {}
+        lines = self.path.read_text(encoding="utf-8").splitlines()
+        for lineNumber, line in enumerate(lines, 1):
+            try:
+                entry = json.loads(line)
+                key = entry["key"]
+            except (json.JSONDecodeError, KeyError, TypeError):
+                # Most likely the last line, which was being written during
+                # a crash
+                logger.warning(f"skipping damaged line {lineNumber} of {self.path}")
+                continue
+            items[tuple(key) if isinstance(key, list) else key] = entry.get("value")
+        return items
+
+    def recordItem(self, key: ItemKey, value: Any) -> None:
+        """Record that the item for `key` was modified. `value` is the live data,
+        which is copied when the journal is synced, or None for a deleted glyph.
+        """
+        self._pendingItems[key] = value
+        if self._syncHandle is None:
+            # Sync in batches, as a sync waits for the data to be on disk
+            loop = asyncio.get_running_loop()
+            self._syncHandle = loop.call_later(SYNC_DELAY, self.sync)
+
+    def sync(self) -> None:
+        self._cancelSync()
+        if not self._pendingItems:
+            return
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, "a", encoding="utf-8")
+        for key, value in self._pendingItems.items():
+            entry = {"key": key, "value": unstructure(value)}
+            self._file.write(json.dumps(entry) + "\n")
+        self._pendingItems.clear()
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def truncate(self) -> None:
+        """Remove all items, as they have been written to the backend."""
+        self._cancelSync()
+        self._pendingItems.clear()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self.path.unlink(missing_ok=True)
+
+    def close(self) -> None:
+        self.sync()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _cancelSync(self) -> None:
+        if self._syncHandle is not None:
+            self._syncHandle.cancel()
+            self._syncHandle = None
@@ -1,7 +1,9 @@
+from functools import cache
 from typing import (
     Any,
     Callable,
     Generator,
+    Hashable,
     Mapping,
     MutableMapping,
     MutableSequence,
@@ -15,7 +17,7 @@ from .path import PackedPath
 def setItem(subject, key, item, *, itemCast=None):
     if itemCast is not None:
         item = itemCast(item) if item is not None else item
-    if isinstance(subject, (MutableMapping, MutableSequence)):
+    if _isMutableItemContainerType(type(subject)):
         subject[key] = item
     else:
         setattr(subject, key, item)
@@ -98,21 +100,24 @@ def applyChange(subject, change):
 
 
 def _applyChange(subject: Any, change: dict[str, Any], *, itemCast=None) -> None:
-    path = change.get("p", [])
+    path = change.get("p", ())
     functionName = change.get("f")
-    children = change.get("c", [])
+    children = change.get("c", ())
 
     for pathElement in path:
         itemCast = None
-        if isinstance(subject, (Mapping, Sequence)):
+        subjectType: type = type(subject)
+        if _isItemContainerType(subjectType):
             subject = subject[pathElement]
         else:
-            itemCast = getItemCast(subject, pathElement, "subtype")
+            fieldCasts = _getFieldCasts(subjectType, "subtype")
+            if fieldCasts is not None:
+                itemCast = fieldCasts[pathElement]
             subject = getattr(subject, pathElement)
 
     if functionName is not None:
         changeFunc: Callable[..., None] = changeFunctions[functionName]
-        args = change.get("a", [])
+        args = change.get("a", ())
         if functionName in baseChangeFunctions:
             if itemCast is None and args:
                 itemCast = getItemCast(subject, args[0], "type")
@@ -120,18 +125,66 @@ def _applyChange(subject: Any, change: dict[str, Any], *, itemCast=None) -> None
         else:
             changeFunc(subject, *args)
 
+    if not children:
+        return
+
+    leafFunctions = _leafChangeFunctions.get(type(subject))
     for subChange in children:
+        if leafFunctions is not None and itemCast is None:
+            # Fast path for the bulk of most changes: many simple operations
+            # on the same list, dict or path, eg. when dragging points
+            leafFunc = leafFunctions.get(subChange.get("f"))
+            if leafFunc is not None and "p" not in subChange and "c" not in subChange:
+                leafFunc(subject, *subChange.get("a", ()))
+                continue
         _applyChange(subject, subChange, itemCast=itemCast)
 
 
 def getItemCast(subject, attrName, fieldKey):
-    classFields = classSchema.get(type(subject))
-    if classFields is not None:
-        fieldDef = classFields[attrName]
-        subtype = fieldDef.get(fieldKey)
-        if subtype is not None:
-            return classCastFuncs.get(subtype)
-    return None
+    fieldCasts = _getFieldCasts(type(subject), fieldKey)
+    return fieldCasts[attrName] if fieldCasts is not None else None
+
+
+@cache
+def _getFieldCasts(cls, fieldKey) -> dict[str, Callable | None] | None:
+    # Map the field names of a schema class to the cast function for the
+    # field's "type" or "subtype", if any. The schema is static, so the result
+    # can be cached.
+    classFields = classSchema.get(cls)
+    if classFields is None:
+        return None
+    fieldCasts = {}
+    for fieldName, fieldDef in classFields.items():
+        fieldType = fieldDef.get(fieldKey)
+        fieldCasts[fieldName] = (
+            classCastFuncs.get(fieldType) if fieldType is not None else None
+        )
+    return fieldCasts
+
+
+@cache
+def _isItemContainerType(cls) -> bool:
+    # isinstance() checks against the typing ABCs are slow, and this is called
+    # for every path element
+    return issubclass(cls, (Mapping, Sequence))
+
+
+@cache
+def _isMutableItemContainerType(cls) -> bool:
+    return issubclass(cls, (MutableMapping, MutableSequence))
+
+
+def _spliceList(subject, index, deleteCount, *items):
+    subject[index : index + deleteCount] = items
+
+
+# Operations on plain lists and dicts, for changes without an item cast, and
+# on packed paths, that can be applied without going through _applyChange()
+_leafChangeFunctions: dict[type, dict[str, Callable[..., None]]] = {
+    dict: {"=": dict.__setitem__},
+    list: {"=": list.__setitem__, ":": _spliceList},
+    PackedPath: {"=xy": PackedPath.setPointPosition},
+}
 
 
 _MISSING = object()
@@ -169,6 +222,92 @@ def matchChangePattern(
     return False
 
 
+class MatchPatternIndex:
+    """Combine the match patterns of many subscribers into a single tree, so
+    the subscribers whose pattern matches a change can be found by walking the
+    change only once.
+
+    `index.match(change)` returns the set of subscribers for which
+    `matchChangePattern(change, pattern)` would return `True`.
+    """
+
+    def __init__(self) -> None:
+        self._root = _MatchPatternIndexNode()
+        self._patterns: dict[Hashable, dict[str | int, Any]] = {}
+
+    def getPattern(self, subscriber: Hashable) -> dict[str | int, Any]:
+        return self._patterns.get(subscriber, {})
+
+    def setPattern(self, subscriber: Hashable, pattern: dict[str | int, Any]) -> None:
+        oldPattern = self._patterns.pop(subscriber, None)
+        if oldPattern:
+            self._root.remove(subscriber, oldPattern)
+        if pattern:
+            self._patterns[subscriber] = pattern
+            self._root.add(subscriber, pattern)
+
+    def match(self, change: dict[str, Any]) -> set[Hashable]:
+        result: set[Hashable] = set()
+        if self._patterns:
+            self._root.match(change, result)
+        return result
+
+
+class _MatchPatternIndexNode:
+    __slots__ = ["children", "subscribers", "leafSubscribers"]
+
+    def __init__(self) -> None:
+        self.children: dict[str | int, _MatchPatternIndexNode] = {}
+        # The subscribers whose pattern contains the path to this node
+        self.subscribers: set[Hashable] = set()
+        # The subscribers whose pattern has a leaf node here
+        self.leafSubscribers: set[Hashable] = set()
+
+    def add(self, subscriber: Hashable, pattern: dict[str | int, Any]) -> None:
+        for key, subPattern in pattern.items():
+            child = self.children.get(key)
+            if child is None:
+                child = self.children[key] = _MatchPatternIndexNode()
+            child.subscribers.add(subscriber)
+            if subPattern is None:
+                child.leafSubscribers.add(subscriber)
+            else:
+                child.add(subscriber, subPattern)
+
+    def remove(self, subscriber: Hashable, pattern: dict[str | int, Any]) -> None:
+        for key, subPattern in pattern.items():
+            child = self.children[key]
+            child.subscribers.discard(subscriber)
+            if subPattern is None:
+                child.leafSubscribers.discard(subscriber)
+            else:
+                child.remove(subscriber, subPattern)
+            if not child.subscribers:
+                del self.children[key]
+
+    def match(self, change: dict[str, Any], result: set[Hashable]) -> None:
+        # This mirrors matchChangePattern()
+        node = self
+        for pathElement in change.get("p", []):
+            childNode = node.children.get(pathElement)
+            if childNode is None:
+                return
+            result.update(childNode.leafSubscribers)
+            if len(childNode.leafSubscribers) == len(childNode.subscribers):
+                return
+            node = childNode
+
+        if change.get("f") in baseChangeFunctions:
+            args = change.get("a")
+            if args:
+                childNode = node.children.get(args[0])
+                if childNode is not None:
+                    result.update(childNode.subscribers)
+
+        for childChange in change.get("c", []):
+            node.match(childChange, result)
+
+
 def filterChangePattern(
     change: dict[str, Any], matchPattern: dict[str | int, Any], inverse: bool = False
 ) -> dict[str, Any] | None:
@@ -340,3 +479,36 @@ def _iterateChangePaths(
         return
     for childChange in change.get("c", []):
         yield from _iterateChangePaths(childChange, depth, path)
+
+
+_assigningChangeFunctions = {"=", "=xy"}
+
+
+def collectAssignmentTargets(change: dict[str, Any]) -> frozenset[tuple] | None:
+    """If the `change` only assigns values, return the set of targets it assigns
+    to, as (path, key) tuples. Otherwise, return `None`.
+
+    A change whose targets are a superset of those of an earlier change fully
+    overrides that earlier change: once both are applied, the effect of the
+    earlier change is gone.
+    """
+    targets: set[tuple] = set()
+    if not _collectAssignmentTargets(change, (), targets):
+        return None
+    return frozenset(targets)
+
+
+def _collectAssignmentTargets(
+    change: dict[str, Any], prefix: tuple, targets: set[tuple]
+) -> bool:
+    path = prefix + tuple(change.get("p", ()))
+    functionName = change.get("f")
+    if functionName is not None:
+        args = change.get("a", [])
+        if functionName not in _assigningChangeFunctions or not args:
+            return False
+        targets.add((path, args[0]))
+    return all(
+        _collectAssignmentTargets(childChange, path, targets)
+        for childChange in change.get("c", [])
+    )
@@ -1,32 +1,50 @@
 import asyncio
 import base64
 import functools
+import hashlib
+import json
 import logging
+import pathlib
 import traceback
 from collections import UserDict, defaultdict
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, contextmanager
 from copy import deepcopy
 from dataclasses import dataclass
 from functools import cached_property
-from typing import Any, AsyncGenerator, Awaitable, Callable, Optional
+from typing import Any, AsyncGenerator, Awaitable, Callable, Iterator, Optional
 
+from .changejournal import ChangeJournal
 from .changes import (
+    MatchPatternIndex,
     applyChange,
+    baseChangeFunctions,
+    collectAssignmentTargets,
     collectChangePaths,
     filterChangePattern,
-    matchChangePattern,
     patternDifference,
     patternFromPath,
     patternIntersect,
     patternUnion,
 )
-from .classes import Font, FontInfo, FontSource, ImageData, VariableGlyph
-from .lrucache import LRUCache
+from .classes import (
+    Font,
+    FontInfo,
+    FontSource,
+    ImageData,
+    VariableGlyph,
+    unstructure,
+)
+from .glyphoutlinecache import GlyphOutlineCache
+from .lrucache import SizedLRUCache
+from .path import PackedPath
 from .protocols import (
+    FlushWrites,
     ProjectManager,
     ReadableFontBackend,
+    ReadGlyphs,
     WatchableFontBackend,
     WritableFontBackend,
+    WriteGlyphs,
 )
 
 logger = logging.getLogger(__name__)
@@ -35,12 +53,60 @@ logger = logging.getLogger(__name__)
 CHANGES_PATTERN_KEY = "changes-match-pattern"
 LIVE_CHANGES_PATTERN_KEY = "live-changes-match-pattern"
 
+DEFAULT_GLYPH_CACHE_SIZE = 256 * 1024 * 1024  # approximate, in bytes
+
+# The maximum number of glyphs that will be passed to backend.putGlyphs() at once
+MAX_GLYPH_WRITE_BATCH_SIZE = 100
+
+# Changes to these root keys affect how glyphs are instantiated
+FONT_INSTANCING_ROOT_KEYS = frozenset(["axes", "sources"])
+
+# The number of glyphs per getGlyphMapPage() call the client asks for
+GLYPH_MAP_PAGE_SIZE = 5000
+
+# Live changes are sent to each client at most once per this many seconds.
+# Live changes that arrive in between may be coalesced.
+DEFAULT_LIVE_CHANGE_FRAME_WINDOW = 0.05
+
+# A client that falls further behind than this many changes gets a single
+# reloadData() call instead
+MAX_PENDING_BROADCAST_CHANGES = 1000
+
 
 def remoteMethod(method):
     method.fontraRemoteMethod = True
     return method
 
 
+@dataclass(kw_only=True)
+class GlyphWrite:
+    # A scheduled glyph write, which may be batched with other glyph writes.
+    # `glyph` is the live glyph object, which may still be edited while the
+    # write is queued: call snapshot() right before writing.
+    backend: WritableFontBackend
+    glyphName: str
+    glyph: VariableGlyph
+    codePoints: list[int]
+
+    def snapshot(self) -> VariableGlyph:
+        return deepcopy(self.glyph)
+
+    async def __call__(self) -> None:
+        await self.backend.putGlyph(self.glyphName, self.snapshot(), self.codePoints)
+
+
+@dataclass(kw_only=True)
+class DataWrite:
+    # A scheduled write of root data, such as "sources". Like GlyphWrite, it
+    # holds the live data, which is copied when the write starts
+    putData: Callable[[str, Any], Awaitable[None]]
+    key: str
+    value: Any
+
+    async def __call__(self) -> None:
+        await self.putData(self.key, deepcopy(self.value))
+
+
 @dataclass
 class FontHandler:
     backend: ReadableFontBackend
@@ -49,14 +115,46 @@ class FontHandler:
     allConnectionsClosedCallback: Optional[Callable[[], Awaitable[Any]]] = None
     projectManager: ProjectManager | None = None
     projectIdentifier: str | None = None
+    glyphCacheSize: int = DEFAULT_GLYPH_CACHE_SIZE
+    liveChangeFrameWindow: float = DEFAULT_LIVE_CHANGE_FRAME_WINDOW
+    persistentCacheDir: pathlib.Path | None = None  # None: no on-disk caches
+    changeJournalPath: pathlib.Path | None = None  # None: don't journal edits
 
     def __post_init__(self):
         if self.writableBackend is None:
             self.readOnly = True
         self.connections = set()
+        self.changeQueues = {}
         self.clientData = defaultdict(dict)
-        self.localData = LRUCache()
+        # The change match patterns of all clients, combined for fast lookup
+        self.matchPatternIndices = {
+            LIVE_CHANGES_PATTERN_KEY: MatchPatternIndex(),
+            CHANGES_PATTERN_KEY: MatchPatternIndex(),
+        }
+        # Root data ("glyphMap", "sources", etc.) is pinned, glyphs are evicted
+        # based on their estimated size
+        self.localData = SizedLRUCache(
+            self.glyphCacheSize,
+            estimateGlyphSize,
+            isPinnedKey=lambda key: not isinstance(key, tuple),
+        )
         self._dataScheduledForWriting = {}
+        self.changeJournal = (
+            ChangeJournal(self.changeJournalPath)
+            if self.changeJournalPath is not None and not self.readOnly
+            else None
+        )
+        # The number of changes whose items may be journaled, but whose writes
+        # are not yet scheduled: the journal can't be truncated while there are any
+        self._numUnscheduledJournalChanges = 0
+        # Backend reads that are in flight, keyed like localData
+        self._loadTasks = {}
+        # Content hashes of glyphs, computed on demand, and dropped when the
+        # glyph changes
+        self.glyphRevisions = {}
+        self.glyphOutlineCache = GlyphOutlineCache(
+            fontHandler=self, cacheDir=self.persistentCacheDir
+        )
         self.glyphMap = {}
 
     @cached_property
@@ -77,6 +175,9 @@ class FontHandler:
         self._writingInProgressEvent = asyncio.Event()
         self._writingInProgressEvent.set()
 
+        if self.changeJournal is not None:
+            await self._replayChangeJournal()
+
     async def aclose(self) -> None:
         await self.backend.aclose()
         if hasattr(self, "_watcherTask"):
@@ -84,6 +185,10 @@ class FontHandler:
         if hasattr(self, "_processWritesTask"):
             await self.finishWriting()  # shield for cancel?
             self._processWritesTask.cancel()
+        if self.changeJournal is not None:
+            self.changeJournal.close()
+        self.glyphOutlineCache.close()
+        logger.info(f"glyph cache statistics: {self.localData.getStatistics()}")
 
     async def processExternalChanges(self, reloadPattern) -> None:
         if reloadPattern is not None and "glyphMap" in reloadPattern:
@@ -122,29 +227,167 @@ class FontHandler:
                 self._writingInProgressEvent.set()
 
     async def _processWritesOneCycle(self) -> None:
-        writeFunc: Callable[
-            [], Awaitable[None]
-        ]  # inferencing with partial() goes wrong
         while self._dataScheduledForWriting:
-            writeKey, (writeFunc, connection, reloadPattern) = popFirstItem(
-                self._dataScheduledForWriting
-            )
-            logger.info(f"write {writeKey} to backend")
+            glyphWrites = self._popGlyphWriteBatch()
+            if glyphWrites:
+                await self._writeGlyphBatch(glyphWrites)
+            else:
+                writeKey, (writeFunc, connection, reloadPattern) = popFirstItem(
+                    self._dataScheduledForWriting
+                )
+                await self._writeData(
+                    f"{writeKey}", writeFunc, connection, reloadPattern
+                )
+            await asyncio.sleep(0)
+        if isinstance(self.backend, FlushWrites):
             try:
-                await writeFunc()
+                await self.backend.flushWrites()
             except Exception as e:
-                logger.error("exception while writing data: %r", e)
+                logger.error("exception while flushing writes: %r", e)
                 traceback.print_exc()
-                await self.reloadData(reloadPattern)
-                if connection is not None:
-                    await connection.proxy.messageFromServer(
-                        "The data could not be saved due to an error.",
-                        f"The edit has been reverted.\n\n{e!r}",
+                return  # Keep the change journal, if any
+        self._truncateChangeJournalIfWritten()
+
+    async def _writeData(
+        self,
+        writeDescription: str,
+        writeFunc: Callable[[], Awaitable[None]],
+        connection,
+        reloadPattern: dict,
+    ) -> None:
+        logger.info(f"write {writeDescription} to backend")
+        try:
+            await writeFunc()
+        except Exception as e:
+            logger.error("exception while writing data: %r", e)
+            traceback.print_exc()
+            await self.reloadData(reloadPattern)
+            if connection is None:
+                # No connection to inform, let's error
+                raise
+            await connection.proxy.messageFromServer(
+                "The data could not be saved due to an error.",
+                f"The edit has been reverted.\n\n{e!r}",
+            )
+
+    async def _writeGlyphBatch(self, glyphWrites) -> None:
+        logger.info(f"write {len(glyphWrites)} glyphs to backend")
+        try:
+            await self._putGlyphs(glyphWrites)
+            return
+        except Exception as e:
+            logger.error("exception while writing a batch of glyphs: %r", e)
+        # Write the glyphs one by one, so only the glyphs that fail are reverted,
+        # and only their editors are told
+        writeError = None
+        for glyphWrite, connection, reloadPattern in glyphWrites:
+            try:
+                await self._writeData(
+                    f"glyph {glyphWrite.glyphName!r}",
+                    glyphWrite,
+                    connection,
+                    reloadPattern,
+                )
+            except Exception as e:
+                # Finish the batch before erroring, its glyphs are no longer
+                # scheduled
+                writeError = e
+        if writeError is not None:
+            raise writeError
+
+    async def _replayChangeJournal(self) -> None:
+        assert self.changeJournal is not None
+        items = self.changeJournal.readItems()
+        if not items:
+            return
+        logger.info(
+            f"restoring {len(items)} unwritten items from {self.changeJournal.path}"
+        )
+        # Restore the root data first, as glyph writes take their code points
+        # from the glyph map
+        writeKeys = sorted(items, key=lambda writeKey: isinstance(writeKey, tuple))
+        with self._holdChangeJournal():
+            for writeKey in writeKeys:
+                try:
+                    change = await self._makeJournalItemChange(
+                        writeKey, items[writeKey]
                     )
-                else:
-                    # No connection to inform, let's error
-                    raise
-            await asyncio.sleep(0)
+                    if change is None:
+                        continue
+                    rootKeys, rootObject = await self._prepareRootObject(change)
+                    applyChange(rootObject, change)
+                except Exception as e:
+                    logger.error(f"can't restore {writeKey} from journal: {e!r}")
+                    continue
+                await self._updateLocalData(rootKeys, rootObject, None, True)
+
+    async def _makeJournalItemChange(self, writeKey, value) -> dict | None:
+        # Return a change that sets the item to its journaled value
+        if not isinstance(writeKey, tuple):
+            return {"p": [], "f": "=", "a": [writeKey, value]}
+        _, glyphName = writeKey
+        if value is not None:
+            return {"p": ["glyphs"], "f": "=", "a": [glyphName, value]}
+        if await self.getGlyph(glyphName) is None:
+            return None  # The deletion was written already
+        return {"p": ["glyphs"], "f": "d", "a": [glyphName]}
+
+    def _journalItem(self, writeKey, value) -> None:
+        # `value` is the live data, or None for a deleted glyph
+        if self.changeJournal is not None:
+            self.changeJournal.recordItem(writeKey, value)
+
+    @contextmanager
+    def _holdChangeJournal(self, enabled: bool = True) -> Iterator[None]:
+        # Keep the journal until the writes for the journaled items are scheduled
+        if not enabled or self.changeJournal is None:
+            yield
+            return
+        self._numUnscheduledJournalChanges += 1
+        try:
+            yield
+        finally:
+            self._numUnscheduledJournalChanges -= 1
+            if self._writingInProgressEvent.is_set():
+                # The writes finished before we got here, or there were none
+                self._truncateChangeJournalIfWritten()
+
+    def _truncateChangeJournalIfWritten(self) -> None:
+        # Must only be called when no write is in progress
+        if (
+            self.changeJournal is not None
+            and not self._numUnscheduledJournalChanges
+            and not self._dataScheduledForWriting
+            and self._processWritesError is None
+        ):
+            self.changeJournal.truncate()
+
+    def _popGlyphWriteBatch(self) -> list[tuple[GlyphWrite, Any, dict]]:
+        # If the backend supports writing multiple glyphs at once, take the glyph
+        # writes from the start of the queue, so the backend can write them as a
+        # batch. Return an empty list if there are fewer than two such writes.
+        if not isinstance(self.backend, WriteGlyphs):
+            return []
+        batchKeys: list[Any] = []
+        for writeKey, (writeFunc, _, _) in self._dataScheduledForWriting.items():
+            if (
+                not isinstance(writeFunc, GlyphWrite)
+                or len(batchKeys) >= MAX_GLYPH_WRITE_BATCH_SIZE
+            ):
+                break
+            batchKeys.append(writeKey)
+        if len(batchKeys) < 2:
+            return []
+        return [self._dataScheduledForWriting.pop(writeKey) for writeKey in batchKeys]
+
+    async def _putGlyphs(self, glyphWrites) -> None:
+        assert isinstance(self.backend, WriteGlyphs)
+        await self.backend.putGlyphs(
+            {
+                glyphWrite.glyphName: (glyphWrite.snapshot(), glyphWrite.codePoints)
+                for glyphWrite, _, _ in glyphWrites
+            }
+        )
 
     @asynccontextmanager
     async def useConnection(self, connection) -> AsyncGenerator[None, None]:
@@ -153,6 +396,16 @@ class FontHandler:
             yield
         finally:
             self.connections.remove(connection)
+            changeQueue = self.changeQueues.pop(connection, None)
+            if changeQueue is not None:
+                changeQueue.cancel()
+                logger.info(
+                    f"changes for client {connection.clientUUID}: "
+                    f"{changeQueue.numCoalesced} coalesced, "
+                    f"{changeQueue.numDropped} dropped, "
+                    f"{changeQueue.numResyncs} resyncs, "
+                    f"max queue depth: {changeQueue.maxDepth}"
+                )
             if not self.connections and self.allConnectionsClosedCallback is not None:
                 await self.allConnectionsClosedCallback()
 
@@ -188,27 +441,139 @@ class FontHandler:
 
     @remoteMethod
     async def getGlyph(
-        self, glyphName: str, *, connection=None
-    ) -> VariableGlyph | None:
+        self, glyphName: str, ifNotRevision: str | None = None, *, connection=None
+    ) -> VariableGlyph | dict | None:
+        # If ifNotRevision is given, the result is a dict with the "revision" of
+        # the glyph, and either the "glyph", or "unchanged": True if the revision
+        # equals ifNotRevision. Clients pass an empty string to get the revision
+        # along with the glyph.
         glyph = self.localData.get(("glyphs", glyphName))
         if glyph is None:
-            glyph = await self._getGlyph(glyphName)
-            self.localData[("glyphs", glyphName)] = glyph
-        return glyph
+            glyph = await asyncio.shield(self._getGlyph(glyphName))
+        if ifNotRevision is None:
+            return glyph
+        revision = self.getGlyphRevision(glyphName, glyph)
+        if revision is not None and revision == ifNotRevision:
+            return {"revision": revision, "unchanged": True}
+        return {"revision": revision, "glyph": glyph}
+
+    def getGlyphRevision(self, glyphName, glyph) -> str | None:
+        if glyph is None:
+            return None
+        revision = self.glyphRevisions.get(glyphName)
+        if revision is None:
+            revision = computeGlyphRevision(glyph)
+            if self.localData.get(("glyphs", glyphName)) is glyph:
+                self.glyphRevisions[glyphName] = revision
+        return revision
+
+    @remoteMethod
+    async def getGlyphOutline(
+        self, glyphName: str, sourceLocation: dict[str, float], *, connection=None
+    ) -> dict | None:
+        result = await self.getKeyedGlyphOutline(glyphName, sourceLocation)
+        return result[1] if result is not None else None
+
+    async def getKeyedGlyphOutline(
+        self, glyphName: str, sourceLocation: dict[str, float]
+    ) -> tuple[str, dict] | None:
+        return await self.glyphOutlineCache.getOutline(glyphName, sourceLocation)
 
     def _getGlyph(self, glyphName) -> Awaitable[VariableGlyph | None]:
-        return asyncio.create_task(self._getGlyphFromBackend(glyphName))
+        return self._getLoadTask(
+            ("glyphs", glyphName), lambda: self._getGlyphFromBackend(glyphName)
+        )
 
     async def _getGlyphFromBackend(self, glyphName) -> VariableGlyph | None:
         return await self.backend.getGlyph(glyphName)
 
+    @remoteMethod
+    async def getGlyphs(
+        self, glyphNames: list[str], withRevisions: bool = False, *, connection=None
+    ) -> dict[str, VariableGlyph | dict | None]:
+        # If withRevisions is true, each value is a dict with the "revision" and
+        # the "glyph", like getGlyph() returns when passed an empty revision
+        glyphs = {}
+        glyphNamesToLoad = []
+        for glyphName in glyphNames:
+            glyph = self.localData.get(("glyphs", glyphName))
+            if glyph is None:
+                glyphNamesToLoad.append(glyphName)
+            else:
+                glyphs[glyphName] = glyph
+
+        if glyphNamesToLoad:
+            loadedGlyphs = await asyncio.shield(
+                asyncio.gather(*self._getGlyphs(glyphNamesToLoad))
+            )
+            glyphs.update(zip(glyphNamesToLoad, loadedGlyphs))
+
+        if withRevisions:
+            return {
+                glyphName: {
+                    "revision": self.getGlyphRevision(glyphName, glyphs[glyphName]),
+                    "glyph": glyphs[glyphName],
+                }
+                for glyphName in glyphNames
+            }
+        return {glyphName: glyphs[glyphName] for glyphName in glyphNames}
+
+    def _getGlyphs(self, glyphNames) -> list[Awaitable[VariableGlyph | None]]:
+        # Glyphs that are not already being loaded are loaded with a single
+        # backend call
+        newGlyphNames = [
+            glyphName
+            for glyphName in glyphNames
+            if ("glyphs", glyphName) not in self._loadTasks
+        ]
+        if newGlyphNames:
+            batchTask = asyncio.create_task(self._getGlyphsFromBackend(newGlyphNames))
+            for glyphName in newGlyphNames:
+                self._getLoadTask(
+                    ("glyphs", glyphName),
+                    functools.partial(_getItemFromTask, batchTask, glyphName),
+                )
+        return [self._loadTasks[("glyphs", glyphName)] for glyphName in glyphNames]
+
+    async def _getGlyphsFromBackend(
+        self, glyphNames
+    ) -> dict[str, VariableGlyph | None]:
+        if isinstance(self.backend, ReadGlyphs):
+            return await self.backend.getGlyphs(glyphNames)
+        glyphs = await asyncio.gather(
+            *(self._getGlyphFromBackend(glyphName) for glyphName in glyphNames)
+        )
+        return dict(zip(glyphNames, glyphs))
+
     async def getData(self, key: str) -> Any:
         data = self.localData.get(key)
         if data is None:
-            data = await self._getData(key)
-            self.localData[key] = data
+            data = await asyncio.shield(
+                self._getLoadTask(key, lambda: self._getData(key))
+            )
         return data
 
+    def _getLoadTask(self, key, loadFunc) -> asyncio.Task:
+        # Return the task that loads the data for `key` from the backend. If
+        # there is no such task in flight, create one. This way, concurrent
+        # requests for the same data share a single backend read. The result
+        # is stored in self.localData when the task is done.
+        task = self._loadTasks.get(key)
+        if task is None:
+            task = asyncio.create_task(loadFunc())
+            self._loadTasks[key] = task
+            task.add_done_callback(functools.partial(self._loadTaskDone, key))
+        return task
+
+    def _loadTaskDone(self, key, task) -> None:
+        if self._loadTasks.get(key) is not task:
+            # reloadData() was called while we were loading: the result may
+            # be outdated, so don't cache it
+            return
+        del self._loadTasks[key]
+        if not task.cancelled() and task.exception() is None:
+            self.localData[key] = task.result()
+
     async def _getData(self, key: str) -> Any:
         value: Any
 
@@ -253,6 +618,37 @@ class FontHandler:
         self.glyphMap = await self.getData("glyphMap")
         return self.glyphMap
 
+    @remoteMethod
+    async def getGlyphMapPage(self, start: int, count: int, *, connection) -> dict:
+        # Return `count` glyph map entries starting at index `start`, so clients
+        # with large glyph maps can load and show them in parts. See
+        # packGlyphMapCodePoints() for the code point encoding.
+        #
+        # The glyph map may change between calls, so the glyph name order is
+        # taken once per client, when it asks for the first page. Glyphs that
+        # were deleted since are left out; glyphs that were added since reach
+        # the client as external changes.
+        glyphMap = await self.getGlyphMap(connection=connection)
+        glyphNames = None
+        if connection is not None:
+            if start == 0:
+                self._setClientData(connection, "glyphMapPageOrder", list(glyphMap))
+            glyphNames = self._getClientData(connection, "glyphMapPageOrder")
+        if glyphNames is None:
+            glyphNames = list(glyphMap)
+        pageGlyphNames = [
+            glyphName
+            for glyphName in glyphNames[start : start + count]
+            if glyphName in glyphMap
+        ]
+        return {
+            "totalCount": len(glyphNames),
+            "glyphNames": pageGlyphNames,
+            "codePoints": packGlyphMapCodePoints(
+                glyphMap[glyphName] for glyphName in pageGlyphNames
+            ),
+        }
+
     @remoteMethod
     async def getFontInfo(self, *, connection=None) -> FontInfo:
         return await self.getData("fontInfo")
@@ -324,8 +720,9 @@ class FontHandler:
 
     def _adjustMatchPattern(self, func, pathOrPattern, wantLiveChanges, connection):
         key = LIVE_CHANGES_PATTERN_KEY if wantLiveChanges else CHANGES_PATTERN_KEY
-        matchPattern = self._getClientData(connection, key, {})
-        self._setClientData(connection, key, func(matchPattern, pathOrPattern))
+        matchPattern = func(self._getClientData(connection, key, {}), pathOrPattern)
+        self._setClientData(connection, key, matchPattern)
+        self.matchPatternIndices[key].setPattern(connection.clientUUID, matchPattern)
 
     @remoteMethod
     async def editIncremental(self, liveChange, *, connection):
@@ -343,25 +740,29 @@ class FontHandler:
             await self.broadcastChange(finalChange, connection, False)
 
     async def broadcastChange(self, change, sourceConnection, isLiveChange):
-        if isLiveChange:
-            matchPatternKeys = [LIVE_CHANGES_PATTERN_KEY]
-        else:
-            matchPatternKeys = [LIVE_CHANGES_PATTERN_KEY, CHANGES_PATTERN_KEY]
+        matchingClients = self.matchPatternIndices[LIVE_CHANGES_PATTERN_KEY].match(
+            change
+        )
+        if not isLiveChange:
+            matchingClients |= self.matchPatternIndices[CHANGES_PATTERN_KEY].match(
+                change
+            )
 
         connections = [
             connection
             for connection in self.connections
             if connection != sourceConnection
-            and any(
-                matchChangePattern(change, self._getClientData(connection, k, {}))
-                for k in matchPatternKeys
-            )
+            and connection.clientUUID in matchingClients
         ]
 
         for connection in connections:
-            scheduleTaskAndLogException(
-                connection.proxy.externalChange(change, isLiveChange)
-            )
+            changeQueue = self.changeQueues.get(connection)
+            if changeQueue is None:
+                changeQueue = ChangeBroadcastQueue(
+                    connection=connection, frameWindow=self.liveChangeFrameWindow
+                )
+                self.changeQueues[connection] = changeQueue
+            changeQueue.push(change, isLiveChange)
 
     async def updateLocalDataWithExternalChange(self, change):
         await self._updateLocalDataAndWriteToBackend(change, None, True)
@@ -385,12 +786,11 @@ class FontHandler:
 
         rootKeys, rootObject = await self._prepareRootObject(change)
         applyChange(rootObject, change)
-        await self._updateLocalData(
-            rootKeys,
-            rootObject,
-            sourceConnection,
-            not isExternalChange and not self.readOnly,
-        )
+        writeToBackEnd = not isExternalChange and not self.readOnly
+        with self._holdChangeJournal(writeToBackEnd):
+            await self._updateLocalData(
+                rootKeys, rootObject, sourceConnection, writeToBackEnd
+            )
 
     def _getLocalDataPattern(self):
         localPattern = {}
@@ -437,21 +837,27 @@ class FontHandler:
                 glyphMap = await self.getData("glyphMap")
                 for glyphName in sorted(glyphSet.keys()):
                     writeKey = ("glyphs", glyphName)
+                    self.glyphRevisions.pop(glyphName, None)
                     if glyphName in glyphSet.newKeys:
                         self.localData[writeKey] = glyphSet[glyphName]
+                    else:
+                        # The glyph was edited in place
+                        self.localData.updateItemSize(writeKey)
                     if not writeToBackEnd:
                         continue
                     assert self.writableBackend is not None
-                    writeFunc = functools.partial(
-                        self.writableBackend.putGlyph,
-                        glyphName,
-                        deepcopy(glyphSet[glyphName]),
-                        glyphMap.get(glyphName, []),
+                    writeFunc = GlyphWrite(
+                        backend=self.writableBackend,
+                        glyphName=glyphName,
+                        glyph=glyphSet[glyphName],
+                        codePoints=glyphMap.get(glyphName, []),
                     )
+                    self._journalItem(writeKey, glyphSet[glyphName])
                     await self.scheduleDataWrite(writeKey, writeFunc, sourceConnection)
                 for glyphName in sorted(glyphSet.deletedKeys):
                     writeKey = ("glyphs", glyphName)
                     _ = self.localData.pop(writeKey, None)
+                    self.glyphRevisions.pop(glyphName, None)
                     if not writeToBackEnd:
                         continue
                     assert self.writableBackend is not None
@@ -460,6 +866,7 @@ class FontHandler:
                     )
                     # When deleting a glyph goes wrong, the glyphMap should *also* be reloaded
                     reloadPattern = {"glyphMap": None} | _writeKeyToPattern(writeKey)
+                    self._journalItem(writeKey, None)
                     await self.scheduleDataWrite(
                         writeKey,
                         writeFunc,
@@ -469,12 +876,15 @@ class FontHandler:
             else:
                 if rootKey in rootObject._assignedAttributeNames:
                     self.localData[rootKey] = getattr(rootObject, rootKey)
+                if rootKey in FONT_INSTANCING_ROOT_KEYS:
+                    self.glyphOutlineCache.fontDataChanged()
                 if not writeToBackEnd:
                     continue
                 assert self.writableBackend is not None
-                writeFunc = functools.partial(
-                    self._putData, rootKey, deepcopy(self.localData[rootKey])
+                writeFunc = DataWrite(
+                    putData=self._putData, key=rootKey, value=self.localData[rootKey]
                 )
+                self._journalItem(rootKey, self.localData[rootKey])
                 await self.scheduleDataWrite(rootKey, writeFunc, sourceConnection)
 
     async def scheduleDataWrite(
@@ -501,6 +911,9 @@ class FontHandler:
         if reloadPattern is None:
             # A reloadPattern being None means: reload everything
             self.localData.clear()
+            self._loadTasks.clear()
+            self.glyphRevisions.clear()
+            self.glyphOutlineCache.fontDataChanged()
         else:
             # Drop local data to ensure it gets reloaded from the backend
             for rootKey, value in reloadPattern.items():
@@ -509,8 +922,13 @@ class FontHandler:
                         value = sorted(self.glyphMap)
                     for glyphName in value:
                         self.localData.pop(("glyphs", glyphName), None)
+                        self._loadTasks.pop(("glyphs", glyphName), None)
+                        self.glyphRevisions.pop(glyphName, None)
                 else:
                     self.localData.pop(rootKey, None)
+                    self._loadTasks.pop(rootKey, None)
+                    if rootKey in FONT_INSTANCING_ROOT_KEYS:
+                        self.glyphOutlineCache.fontDataChanged()
 
         connections = []
         for connection in self.connections:
@@ -551,6 +969,38 @@ class FontHandler:
             return await self.projectManager.exportAs(self, options)
 
 
+def estimateGlyphSize(glyph: VariableGlyph | None) -> int:
+    # A rough estimate of the memory used by a glyph object, in bytes. It needs
+    # to be cheap to compute, rather than accurate.
+    if glyph is None:
+        return 100
+    size = 1000 + 300 * len(glyph.sources)
+    for layer in glyph.layers.values():
+        staticGlyph = layer.glyph
+        path = staticGlyph.path
+        size += 500
+        if isinstance(path, PackedPath):
+            # A float in a list takes about 32 bytes
+            size += 32 * len(path.coordinates) + 8 * len(path.pointTypes)
+            size += 100 * len(path.contourInfo)
+        else:
+            size += sum(300 * len(contour.points) for contour in path.contours)
+        size += 400 * len(staticGlyph.components)
+        size += 200 * (len(staticGlyph.anchors) + len(staticGlyph.guidelines))
+    return size
+
+
+def computeGlyphRevision(glyph: VariableGlyph) -> str:
+    # A hash of the glyph's content, so a glyph that is reloaded from the
+    # backend without having changed keeps its revision
+    data = json.dumps(unstructure(glyph), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()[:24]
+
+
+async def _getItemFromTask(task, key):
+    return (await task).get(key)
+
+
 def popFirstItem(d):
     key = next(iter(d))
     return (key, d.pop(key))
@@ -565,6 +1015,184 @@ def taskDoneCallback(task):
     _tasks.discard(task)
 
 
+@dataclass(kw_only=True)
+class ChangeBroadcastQueue:
+    """Outgoing `externalChange` calls for a single connection.
+
+    Changes are sent in order by a single task, which doesn't wait for the
+    client's return values. Changes that arrive while that task is busy stay
+    pending: it may be waiting for room in the connection's send queue, or
+    for the next frame, as live changes are sent at most once per
+    `frameWindow` seconds.
+
+    A live change replaces the last pending change if that is a live change
+    it overrides (see `collectAssignmentTargets()`), so a slow client doesn't
+    build up a backlog of stale drag frames. Likewise, a final change drops
+    the pending live changes at the end of the queue that it overrides.
+
+    If more than `maxPending` changes are pending, regardless of the state of
+    the connection, the client is considered too far behind: the pending
+    changes are replaced by a single `reloadData` call for the data they
+    touch, which also absorbs further changes until it is sent.
+    """
+
+    connection: Any
+    frameWindow: float = DEFAULT_LIVE_CHANGE_FRAME_WINDOW
+    maxPending: int = MAX_PENDING_BROADCAST_CHANGES
+
+    def __post_init__(self) -> None:
+        # items are [change, isLiveChange, assignmentTargets]
+        self.pending: list[list] = []
+        # Not None when a reloadData() call is waiting to be sent
+        self.reloadPattern: dict | None = None
+        self.reloadEverything = False
+        self.numCoalesced = 0
+        self.numDropped = 0
+        self.numResyncs = 0
+        self.maxDepth = 0
+        self._lastLiveChangeTime = -self.frameWindow
+        self._task: asyncio.Task | None = None
+
+    def push(self, change, isLiveChange: bool) -> None:
+        if self.reloadPattern is not None:
+            self._addToReloadPattern(change)
+            self.numDropped += 1
+            return
+        targets = collectAssignmentTargets(change)
+        if targets is not None and isLiveChange and self.pending:
+            lastItem = self.pending[-1]
+            lastTargets = lastItem[2]
+            if lastItem[1] and lastTargets is not None and targets >= lastTargets:
+                lastItem[0] = change
+                lastItem[2] = targets
+                self.numCoalesced += 1
+                return
+        elif targets is not None and not isLiveChange:
+            while self.pending:
+                _, lastIsLiveChange, lastTargets = self.pending[-1]
+                if not lastIsLiveChange or lastTargets is None:
+                    break
+                if not targets >= lastTargets:
+                    break
+                del self.pending[-1]
+                self.numDropped += 1
+        self.pending.append([change, isLiveChange, targets])
+        self.maxDepth = max(self.maxDepth, len(self.pending))
+        if len(self.pending) > self.maxPending:
+            self._resync()
+        if self._task is None:
+            self._task = scheduleTaskAndLogException(self._sendPendingChanges())
+
+    def _resync(self) -> None:
+        logger.info(
+            f"client {self.connection.clientUUID} is {len(self.pending)} changes "
+            "behind, asking it to reload instead"
+        )
+        self.reloadPattern = {}
+        for change, _, _ in self.pending:
+            self._addToReloadPattern(change)
+        self.numDropped += len(self.pending)
+        self.numResyncs += 1
+        self.pending.clear()
+
+    def _addToReloadPattern(self, change) -> None:
+        assert self.reloadPattern is not None
+        changePattern = makeReloadPattern(change)
+        if changePattern is None:
+            self.reloadEverything = True
+        else:
+            self.reloadPattern = patternUnion(self.reloadPattern, changePattern)
+
+    def cancel(self) -> None:
+        self.pending.clear()
+        self.reloadPattern = None
+        self.reloadEverything = False
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _sendPendingChanges(self) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            while self.pending or self.reloadPattern is not None:
+                if self.reloadPattern is not None:
+                    reloadPattern = (
+                        None if self.reloadEverything else self.reloadPattern
+                    )
+                    self.reloadPattern = None
+                    self.reloadEverything = False
+                    await self._sendMethodCall("reloadData", reloadPattern)
+                    continue
+                if self.pending[0][1]:
+                    # Live change: wait for the next frame. Meanwhile, the pending
+                    # change may be replaced by a newer one, or dropped.
+                    delay = self._lastLiveChangeTime + self.frameWindow - loop.time()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                        continue
+                    self._lastLiveChangeTime = loop.time()
+                change, isLiveChange, _ = self.pending.pop(0)
+                await self._sendMethodCall("externalChange", change, isLiveChange)
+        except ConnectionResetError:
+            # The client is gone, there's no point in sending it anything else
+            self.pending.clear()
+            self.reloadPattern = None
+            self.reloadEverything = False
+        finally:
+            self._task = None
+
+    async def _sendMethodCall(self, methodName, *args) -> None:
+        try:
+            returnFuture = await self.connection.sendMethodCall(methodName, *args)
+        except ConnectionResetError:
+            raise
+        except Exception as e:
+            logger.error(f"error while sending {methodName}: {e!r}")
+        else:
+            returnFuture.add_done_callback(
+                functools.partial(_logMethodCallError, methodName)
+            )
+
+
+def _logMethodCallError(methodName, future) -> None:
+    if future.cancelled():
+        return
+    exc = future.exception()
+    if exc is not None and not isinstance(exc, ConnectionResetError):
+        logger.error(f"{methodName} failed on the client: {exc!r}")
+
+
+def makeReloadPattern(change) -> dict | None:
+    """Return a reload pattern for the glyphs and other root data that `change`
+    modifies, or None if that can't be determined.
+    """
+    pattern: dict = {}
+    for path in _iterChangedPaths(change, ()):
+        if not path or (path[0] == "glyphs" and len(path) < 2):
+            return None
+        pattern = patternUnion(
+            pattern,
+            patternFromPath(list(path[:2] if path[0] == "glyphs" else path[:1])),
+        )
+    return pattern
+
+
+def _iterChangedPaths(change, prefix):
+    # The paths of the objects the change functions in `change` modify. For
+    # shallow changes, the key argument of base change functions is included,
+    # as that's the glyph name or root key.
+    path = prefix + tuple(change.get("p", ()))
+    functionName = change.get("f")
+    if functionName is not None:
+        args = change.get("a", ())
+        if len(path) < 2 and functionName in baseChangeFunctions and args:
+            yield path + (args[0],)
+        else:
+            yield path
+    for childChange in change.get("c", ()):
+        yield from _iterChangedPaths(childChange, path)
+
+
 def scheduleTaskAndLogException(awaitable):
     # AKA fire-and-forget
     task = asyncio.create_task(awaitable)
@@ -647,6 +1275,20 @@ def computeGlyphMapChange(glyphMapA, glyphMapB):
     return makeGlyphMapChange(glyphMapUpdates)
 
 
+def packGlyphMapCodePoints(codePointsList):
+    # Most glyphs have zero or one code point: encode these as -1 and as the
+    # code point itself, respectively, and only use a list for the others
+    return [_packCodePoints(codePoints) for codePoints in codePointsList]
+
+
+def _packCodePoints(codePoints):
+    if not codePoints:
+        return -1
+    elif len(codePoints) == 1:
+        return codePoints[0]
+    return list(codePoints)
+
+
 def makeGlyphMapChange(glyphMapUpdates):
     if not glyphMapUpdates:
         return None
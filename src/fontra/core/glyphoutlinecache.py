@@ -0,0 +1,234 @@
+"""Flattened glyph outlines, for views that show many glyphs at once.
+
+The font overview shows each glyph at a single location. Instead of loading
+the full variable glyph into the client and instantiating it there, it can
+ask for the decomposed outline of the instance as an SVG path.
+
+Outlines are cached in memory, and optionally on disk. The cache key is a hash
+of the location, the font's axes and sources, and the revisions of the glyph
+and of all glyphs it uses as components, so an edit to any of these results
+in a new key. The key doubles as an HTTP ETag.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import pathlib
+import sqlite3
+from dataclasses import dataclass
+from typing import Any, cast
+
+from fontTools.pens.pointPen import PointToSegmentPen
+from fontTools.pens.svgPathPen import SVGPathPen
+
+from .classes import unstructure
+from .instancer import FontInstancer
+from .lrucache import LRUCache
+from .protocols import ReadableFontBackend
+
+logger = logging.getLogger(__name__)
+
+
+OUTLINE_CACHE_SIZE = 5000
+OUTLINE_CACHE_FILE_NAME = "glyph-outlines.sqlite"
+# The on-disk cache is emptied when it grows beyond this number of outlines, as
+# outlines for previous revisions are never removed otherwise
+MAX_PERSISTENT_OUTLINES = 200_000
+COMMIT_DELAY = 1.0  # in seconds
+
+
+@dataclass(kw_only=True)
+class GlyphOutlineCache:
+    fontHandler: Any
+    cacheDir: pathlib.Path | None = None  # None: don't store outlines on disk
+    cacheSize: int = OUTLINE_CACHE_SIZE
+
+    def __post_init__(self) -> None:
+        self._outlines: LRUCache = LRUCache(self.cacheSize)
+        self._fontInstancer: FontInstancer | None = None
+        self._fontDataKey: str | None = None
+        # The glyph revisions the cached glyph instancers were built from
+        self._instancerRevisions: dict[str, str | None] = {}
+        self._db: sqlite3.Connection | None = None
+        self._commitHandle: asyncio.TimerHandle | None = None
+        if self.cacheDir is not None:
+            self._db = self._openDatabase(self.cacheDir / OUTLINE_CACHE_FILE_NAME)
+
+    def close(self) -> None:
+        if self._db is not None:
+            if self._commitHandle is not None:
+                self._commitHandle.cancel()
+            self._commit()
+            self._db.close()
+            self._db = None
+
+    def fontDataChanged(self) -> None:
+        # The axes or sources changed: all glyph instancers are stale
+        self._fontInstancer = None
+        self._fontDataKey = None
+
+    async def getOutline(
+        self, glyphName: str, sourceLocation: dict[str, float]
+    ) -> tuple[str, dict] | None:
+        """Return a (key, outline) tuple for the glyph at `sourceLocation`, or
+        None if the glyph does not exist. The outline is a dict with "path" (an
+        SVG path string), "xAdvance", "sourceIndex" (the index of the glyph
+        source at the location, or None) and "status" (the development status
+        of that source, or None).
+        """
+        dependencies = await self._getDependencies(glyphName)
+        if dependencies[glyphName] is None:
+            return None
+        key = await self._getOutlineKey(dependencies, sourceLocation)
+        outline = self._outlines.get(key)
+        if outline is None:
+            outline = self._readOutline(key)
+            if outline is None:
+                outline = await self._computeOutline(
+                    glyphName, sourceLocation, dependencies
+                )
+                self._writeOutline(key, outline)
+            self._outlines[key] = outline
+        return key, outline
+
+    async def _getDependencies(self, glyphName: str) -> dict[str, str | None]:
+        # Return the revisions of the glyph and of all glyphs it uses as
+        # components, recursively
+        dependencies: dict[str, str | None] = {}
+        glyphNames = [glyphName]
+        while glyphNames:
+            glyphName = glyphNames.pop()
+            if glyphName in dependencies:
+                continue
+            glyph = await self.fontHandler.getGlyph(glyphName)
+            dependencies[glyphName] = self.fontHandler.getGlyphRevision(
+                glyphName, glyph
+            )
+            if glyph is not None:
+                for layer in glyph.layers.values():
+                    glyphNames.extend(c.name for c in layer.glyph.components)
+        return dependencies
+
+    async def _getOutlineKey(
+        self, dependencies: dict[str, str | None], sourceLocation: dict[str, float]
+    ) -> str:
+        if self._fontDataKey is None:
+            axes = await self.fontHandler.getData("axes")
+            sources = await self.fontHandler.getData("sources")
+            self._fontDataKey = _hashData([unstructure(axes), unstructure(sources)])
+        return _hashData(
+            [
+                self._fontDataKey,
+                sorted(dependencies.items()),
+                sorted(sourceLocation.items()),
+            ]
+        )
+
+    async def _computeOutline(
+        self,
+        glyphName: str,
+        sourceLocation: dict[str, float],
+        dependencies: dict[str, str | None],
+    ) -> dict:
+        fontInstancer = self._getFontInstancer(dependencies)
+        glyphInstancer = await fontInstancer.getGlyphInstancer(glyphName)
+        instance = glyphInstancer.instantiate(sourceLocation)
+        path = await instance.getDecomposedPath()
+        svgPen = SVGPathPen(None, ntos=_formatNumber)
+        path.drawPoints(PointToSegmentPen(svgPen))
+        sourceIndex = glyphInstancer.getSourceIndex(sourceLocation)
+        status = (
+            glyphInstancer.glyph.sources[sourceIndex].customData.get(
+                "fontra.development.status"
+            )
+            if sourceIndex is not None
+            else None
+        )
+        return {
+            "path": svgPen.getCommands(),
+            "xAdvance": instance.glyph.xAdvance,
+            "sourceIndex": sourceIndex,
+            "status": status,
+        }
+
+    def _getFontInstancer(self, dependencies: dict[str, str | None]) -> FontInstancer:
+        if self._fontInstancer is None:
+            self._fontInstancer = FontInstancer(
+                backend=cast(ReadableFontBackend, _FontHandlerReader(self.fontHandler))
+            )
+            self._instancerRevisions = {}
+        for glyphName, revision in dependencies.items():
+            if self._instancerRevisions.get(glyphName) != revision:
+                self._fontInstancer.dropGlyphInstancerFromCache(glyphName)
+                self._instancerRevisions[glyphName] = revision
+        return self._fontInstancer
+
+    def _openDatabase(self, path: pathlib.Path) -> sqlite3.Connection:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            db = sqlite3.connect(path)
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS outlines (key TEXT PRIMARY KEY, data TEXT)"
+            )
+        except sqlite3.DatabaseError as e:
+            logger.warning(f"discarding unreadable glyph outline cache {path}: {e}")
+            path.unlink()
+            db = sqlite3.connect(path)
+            db.execute("CREATE TABLE outlines (key TEXT PRIMARY KEY, data TEXT)")
+        (numOutlines,) = db.execute("SELECT COUNT(*) FROM outlines").fetchone()
+        if numOutlines > MAX_PERSISTENT_OUTLINES:
+            db.execute("DELETE FROM outlines")
+            db.commit()
+        return db
+
+    def _readOutline(self, key: str) -> dict | None:
+        if self._db is None:
+            return None
+        row = self._db.execute(
+            "SELECT data FROM outlines WHERE key = ?", (key,)
+        ).fetchone()
+        return json.loads(row[0]) if row is not None else None
+
+    def _writeOutline(self, key: str, outline: dict) -> None:
+        if self._db is None:
+            return
+        self._db.execute(
+            "INSERT OR REPLACE INTO outlines VALUES (?, ?)", (key, json.dumps(outline))
+        )
+        if self._commitHandle is None:
+            loop = asyncio.get_running_loop()
+            self._commitHandle = loop.call_later(COMMIT_DELAY, self._commit)
+
+    def _commit(self) -> None:
+        self._commitHandle = None
+        if self._db is not None:
+            self._db.commit()
+
+
+@dataclass
+class _FontHandlerReader:
+    # The subset of the backend API that FontInstancer uses, reading from the
+    # FontHandler, so it sees unsaved edits
+    fontHandler: Any
+
+    async def getGlyph(self, glyphName):
+        return await self.fontHandler.getGlyph(glyphName)
+
+    async def getAxes(self):
+        return await self.fontHandler.getData("axes")
+
+    async def getSources(self):
+        return await self.fontHandler.getData("sources")
+
+
+def _hashData(data: Any) -> str:
+    return hashlib.sha256(json.dumps(data).encode("utf-8")).hexdigest()[:32]
+
+
+def _formatNumber(value: float) -> str:
+    # Two decimals is plenty for display purposes
+    value = round(float(value), 2)
+    return str(int(value)) if value.is_integer() else str(value)
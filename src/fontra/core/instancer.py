@@ -41,6 +41,10 @@ from .varutils import (
 logger = logging.getLogger(__name__)
 
 
+# The maximum number of variation models FontInstancer keeps around for reuse
+MODEL_CACHE_SIZE = 100
+
+
 class LocationCoordinateSystem(Enum):
     USER = 1
     SOURCE = 2  # "designspace coords"
@@ -61,6 +65,7 @@ class FontInstancer:
         self._fontSources: dict[str, FontSource] | None = None
         self._glyphErrors: set[str] = set()
         self.variableGlyphAxisRanges: dict[str, dict[str, AxisRange]] | None = None
+        self._modelCache: LRUCache = LRUCache(MODEL_CACHE_SIZE)
 
     async def _ensureSetup(self):
         if self._fontAxes is None:
@@ -98,6 +103,27 @@ class FontInstancer:
     def fontAxisNames(self) -> set[str]:
         return {axis.name for axis in self.fontAxes}
 
+    def getVariationModel(
+        self,
+        locations: list[dict[str, float]],
+        axes: list[FontAxis | DiscreteFontAxis | GlyphAxis],
+    ) -> DiscreteVariationModel:
+        """Return a DiscreteVariationModel for `locations` and `axes`. Most glyphs
+        of a font share the same source locations, so models are cached and shared
+        between glyphs.
+        """
+        # A model with softFail=False doesn't hold glyph-specific state, so it
+        # is safe to share
+        cacheKey = (
+            tuple(locationToTuple(location) for location in locations),
+            tuple(_axisCacheKey(axis) for axis in axes),
+        )
+        model = self._modelCache.get(cacheKey)
+        if model is None:
+            model = DiscreteVariationModel(locations, axes, softFail=False)
+            self._modelCache[cacheKey] = model
+        return model
+
     def getGlyphSourceLocation(self, glyphSource: GlyphSource) -> dict[str, float]:
         fontSource = (
             self.fontSources.get(glyphSource.locationBase)
@@ -185,6 +211,12 @@ class FontInstancer:
         )
 
 
+def _axisCacheKey(axis: FontAxis | DiscreteFontAxis | GlyphAxis) -> tuple:
+    if isinstance(axis, DiscreteFontAxis):
+        return (axis.name, tuple(axis.values), axis.defaultValue)
+    return (axis.name, axis.minValue, axis.defaultValue, axis.maxValue)
+
+
 def _areComponentLocationsCompatible(
     glyphs: Iterable[StaticGlyph],
 ) -> tuple[bool, list[set[str]]]:
@@ -420,7 +452,7 @@ class GlyphInstancer:
             self.fontInstancer.getGlyphSourceLocation(source)
             for source in self.activeSources
         ]
-        return DiscreteVariationModel(locations, self.combinedAxes, softFail=False)
+        return self.fontInstancer.getVariationModel(locations, self.combinedAxes)
 
     @cached_property
     def deltas(self) -> DiscreteDeltas:
@@ -439,6 +471,24 @@ class GlyphInstancer:
     def checkCompatibility(self):
         return self.model.checkCompatibilityFromDeltas(self.deltas)
 
+    def getSourceIndex(self, location: dict[str, float]) -> int | None:
+        """Return the index into glyph.sources of the active source at `location`
+        (in source coordinates), or None if there is no source at `location`.
+        """
+        defaultSourceLocation = self.defaultSourceLocation
+        location = defaultSourceLocation | subsetLocationKeep(
+            location, self.combinedAxisNames
+        )
+        for sourceIndex, source in enumerate(self.glyph.sources):
+            if source.inactive:
+                continue
+            sourceLocation = defaultSourceLocation | subsetLocationKeep(
+                self.getGlyphSourceLocation(source), self.combinedAxisNames
+            )
+            if sourceLocation == location:
+                return sourceIndex
+        return None
+
     def getGlyphSourceLocation(self, glyphSource: GlyphSource) -> dict[str, float]:
         return self.fontInstancer.getGlyphSourceLocation(glyphSource)
 
@@ -30,3 +30,145 @@ class LRUCache(dict):
         super().__setitem__(key, value)
         while len(self) > self._maxSize:
             del self[next(iter(self))]
+
+
+class SizedLRUCache(dict):
+    """A Least Recently Used cache that evicts items based on an estimated total
+    size, as computed by `sizeFunc(value)`, instead of on the number of items.
+
+    Items for which `isPinnedKey(key)` returns True are never evicted, and do not
+    count toward the size budget.
+
+    The size of an item is computed when it is set. If a value is modified in
+    place, call `updateItemSize(key)` to compute it again.
+
+    The `hits`, `misses` and `evictions` counters are updated by `get()` and by
+    the eviction mechanism.
+    """
+
+    def __init__(self, maxSize, sizeFunc, isPinnedKey=None):
+        assert isinstance(maxSize, int)
+        assert maxSize > 0
+        self._maxSize = maxSize
+        self._sizeFunc = sizeFunc
+        self._isPinnedKey = isPinnedKey if isPinnedKey is not None else _neverPinned
+        self._itemSizes = {}
+        self.totalSize = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def maxSize(self):
+        return self._maxSize
+
+    def get(self, key, default=None):
+        # Override so we get our custom __getitem__ behavior
+        try:
+            value = self[key]
+        except KeyError:
+            self.misses += 1
+            value = default
+        else:
+            self.hits += 1
+        return value
+
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        # Move key/value to the end
+        super().__delitem__(key)
+        super().__setitem__(key, value)
+        return value
+
+    def __setitem__(self, key, value):
+        if key in self:
+            # Ensure key/value get inserted at the end
+            del self[key]
+        super().__setitem__(key, value)
+        if not self._isPinnedKey(key):
+            itemSize = self._sizeFunc(value)
+            self._itemSizes[key] = itemSize
+            self.totalSize += itemSize
+            self._evict(key)
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self.totalSize -= self._itemSizes.pop(key, 0)
+
+    def pop(self, key, *args):
+        value = super().pop(key, *args)
+        self.totalSize -= self._itemSizes.pop(key, 0)
+        return value
+
+    def popitem(self):
+        key, value = super().popitem()
+        self.totalSize -= self._itemSizes.pop(key, 0)
+        return key, value
+
+    def setdefault(self, key, default=None):
+        if key in self:
+            return self[key]
+        self[key] = default
+        return default
+
+    def update(self, *args, **kwargs):
+        # Go through __setitem__, so the sizes are accounted for
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def __ior__(self, other):  # type: ignore[misc]
+        self.update(other)
+        return self
+
+    def updateItemSize(self, key):
+        # Compute the size of the item for `key` again, for example after its
+        # value was modified in place. This does not affect the item's LRU
+        # position.
+        oldSize = self._itemSizes.get(key)
+        if oldSize is None:
+            # Pinned or unknown key
+            return
+        newSize = self._sizeFunc(super().__getitem__(key))
+        self._itemSizes[key] = newSize
+        self.totalSize += newSize - oldSize
+        self._evict(key)
+
+    def clear(self):
+        super().clear()
+        self._itemSizes.clear()
+        self.totalSize = 0
+
+    def _evict(self, newestKey):
+        excessSize = self.totalSize - self._maxSize
+        if excessSize <= 0:
+            return
+        # Collect the least recently used items first, as we can't delete
+        # items while iterating. The newest item is kept, even if it exceeds
+        # the budget by itself.
+        keysToEvict = []
+        for key in self:
+            if excessSize <= 0 or key == newestKey:
+                break
+            itemSize = self._itemSizes.get(key)
+            if itemSize is None:
+                # Pinned item
+                continue
+            keysToEvict.append(key)
+            excessSize -= itemSize
+        for key in keysToEvict:
+            del self[key]
+        self.evictions += len(keysToEvict)
+
+    def getStatistics(self) -> dict:
+        return dict(
+            numItems=len(self),
+            totalSize=self.totalSize,
+            maxSize=self._maxSize,
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+        )
+
+
+def _neverPinned(key):
+    return False
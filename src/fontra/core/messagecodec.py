@@ -0,0 +1,160 @@
+"""Encodings for the messages exchanged over the remote object websocket.
+
+The client lists the encodings it supports in the "message-encodings" field of
+its handshake message, and the server picks the first one it supports as well.
+JSON messages are sent as text frames, MessagePack messages as binary frames.
+
+The MessagePack encoding uses MessagePack extension types for the large
+numeric arrays of packed paths, so these can be transferred and decoded as
+typed arrays:
+
+- EXT_FLOAT32_ARRAY: little-endian float32 values, used for coordinates when
+  all values can be represented exactly as float32
+- EXT_FLOAT64_ARRAY: little-endian float64 values, used for other coordinates
+- EXT_UINT8_ARRAY: unsigned bytes, used for point types
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+from array import array
+from typing import Any, Protocol
+
+import msgpack
+
+EXT_FLOAT32_ARRAY = 1
+EXT_FLOAT64_ARRAY = 2
+EXT_UINT8_ARRAY = 3
+
+_needsByteSwap = sys.byteorder != "little"
+
+
+class MessageCodec(Protocol):
+    name: str
+
+    def encode(self, message: Any) -> str | bytes:
+        pass
+
+    def decode(self, data: str | bytes) -> Any:
+        pass
+
+
+class JSONMessageCodec:
+    name = "json"
+
+    def encode(self, message: Any) -> str:
+        return json.dumps(message)
+
+    def decode(self, data: str | bytes) -> Any:
+        return json.loads(data)
+
+
+class MessagePackMessageCodec:
+    name = "msgpack"
+
+    def encode(self, message: Any) -> bytes:
+        return msgpack.packb(_packTypedArrays(message), default=_packDefault)
+
+    def decode(self, data: str | bytes) -> Any:
+        return msgpack.unpackb(data, ext_hook=_unpackExtType)
+
+
+_messageCodecList: list[MessageCodec] = [MessagePackMessageCodec(), JSONMessageCodec()]
+
+messageCodecs: dict[str, MessageCodec] = {
+    codec.name: codec for codec in _messageCodecList
+}
+
+defaultMessageCodec = messageCodecs["json"]
+
+
+def negotiateMessageCodec(requestedEncodings: list[str]) -> MessageCodec:
+    """Return the codec for the first encoding in `requestedEncodings` that we
+    support, or the JSON codec if there is no such encoding.
+    """
+    for encoding in requestedEncodings:
+        codec = messageCodecs.get(encoding)
+        if codec is not None:
+            return codec
+    return defaultMessageCodec
+
+
+_typedArrayKeys = {"coordinates": "d", "pointTypes": "B"}
+_packedPathKeys = {"coordinates", "pointTypes", "contourInfo"}
+
+
+def _packTypedArrays(obj: Any) -> Any:
+    # Return a copy of `obj` in which the numeric arrays of packed paths are
+    # replaced by array.array objects, which _packDefault will pack as typed
+    # arrays. Only dicts and lists that contain containers are copied, to keep
+    # this cheap.
+    if isinstance(obj, dict):
+        isPackedPath = _packedPathKeys.issubset(obj)
+        newObj = None
+        for key, value in obj.items():
+            if isinstance(value, (dict, list)):
+                typeCode = _typedArrayKeys.get(key) if isPackedPath else None
+                if typeCode is not None:
+                    newValue = _toTypedArray(value, typeCode)
+                else:
+                    newValue = _packTypedArrays(value)
+                if newValue is not value:
+                    if newObj is None:
+                        newObj = dict(obj)
+                    newObj[key] = newValue
+        return obj if newObj is None else newObj
+    elif isinstance(obj, (list, tuple)):
+        if not obj or not isinstance(obj[0], (dict, list, tuple)):
+            return obj
+        return [_packTypedArrays(item) for item in obj]
+    return obj
+
+
+def _toTypedArray(value: Any, typeCode: str) -> Any:
+    if not isinstance(value, list):
+        return value
+    try:
+        return array(typeCode, value)
+    except (TypeError, OverflowError):
+        # Not a homogeneous array of numbers, leave it alone
+        return value
+
+
+def _packDefault(obj: Any) -> Any:
+    if isinstance(obj, array):
+        if obj.typecode == "B":
+            return msgpack.ExtType(EXT_UINT8_ARRAY, obj.tobytes())
+        extType = EXT_FLOAT64_ARRAY
+        floats32 = array("f", obj)
+        if floats32 == obj:
+            obj = floats32
+            extType = EXT_FLOAT32_ARRAY
+        if _needsByteSwap:
+            obj = array(obj.typecode, obj)
+            obj.byteswap()
+        return msgpack.ExtType(extType, obj.tobytes())
+    raise TypeError(f"can't serialize {obj!r}")
+
+
+_extTypeCodes = {
+    EXT_FLOAT32_ARRAY: "f",
+    EXT_FLOAT64_ARRAY: "d",
+    EXT_UINT8_ARRAY: "B",
+}
+
+
+def _unpackExtType(code: int, data: bytes) -> Any:
+    typeCode = _extTypeCodes.get(code)
+    if typeCode is None:
+        return msgpack.ExtType(code, data)
+    values = array(typeCode, data)
+    if _needsByteSwap and typeCode != "B":
+        values.byteswap()
+    return [_intIfIntegral(v) for v in values] if typeCode != "B" else list(values)
+
+
+def _intIfIntegral(v: float) -> float | int:
+    # Mirror the behavior of fontra.core.classes, which unstructures integral
+    # floats as ints
+    return int(v) if v.is_integer() else v
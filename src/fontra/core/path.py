@@ -401,6 +401,18 @@ class PackedPath:
             deepcopy(self.pointAttributes),
         )
 
+    def __deepcopy__(self, memo) -> PackedPath:
+        # The coordinates and point types are immutable numbers, so copying
+        # the lists is enough, and much faster than the generic deepcopy
+        result = PackedPath(
+            list(self.coordinates),
+            list(self.pointTypes),
+            copyContourInfo(self.contourInfo),
+            deepcopy(self.pointAttributes, memo),
+        )
+        memo[id(self)] = result
+        return result
+
 
 def joinPaths(paths: list[PackedPath]) -> PackedPath:
     result = PackedPath()
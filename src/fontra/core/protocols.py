@@ -93,6 +93,64 @@ class WatchableFontBackend(Protocol):
         pass
 
 
+@runtime_checkable
+class ReadGlyphs(Protocol):
+    # Optional: backends that can load many glyphs more efficiently than
+    # one by one may implement this. FontHandler falls back to concurrent
+    # getGlyph() calls otherwise.
+    async def getGlyphs(self, glyphNames: list[str]) -> dict[str, VariableGlyph | None]:
+        pass
+
+
+@runtime_checkable
+class WriteGlyphs(Protocol):
+    # Optional: backends that can write many glyphs more efficiently than
+    # one by one may implement this, for example by updating shared files
+    # only once. The effect must be the same as calling putGlyph() for each
+    # item, in order.
+    async def putGlyphs(
+        self, glyphs: dict[str, tuple[VariableGlyph, list[int]]]
+    ) -> None:
+        pass
+
+
+@runtime_checkable
+class FlushWrites(Protocol):
+    # Optional: backends that defer part of their writes, for example to
+    # update shared files only once for many glyphs, may implement this.
+    # FontHandler calls it each time its write queue has been written. The
+    # backend must also flush in aclose().
+    async def flushWrites(self) -> None:
+        pass
+
+
+@runtime_checkable
+class WriteGlyphFiles(Protocol):
+    # Optional: backends that store each glyph in a file of its own may
+    # implement this, so fontra-copy can write glyphs from multiple processes,
+    # that each open the destination with fromPath(). putGlyphFile() writes the
+    # glyph's own file only, and leaves shared files such as the glyph map
+    # alone: the process that created the backend adds the written glyphs
+    # with updateGlyphMap() afterwards.
+    async def putGlyphFile(self, glyphName: str, glyph: VariableGlyph) -> None:
+        pass
+
+    async def updateGlyphMap(self, glyphMap: dict[str, list[int]]) -> None:
+        pass
+
+
+@runtime_checkable
+class ReadGlyphOutlines(Protocol):
+    # Optional: remote subjects that can render decomposed glyph outlines
+    # may implement this, so FontraServer can serve them over HTTP. The
+    # result is a (key, outline) tuple, or None if the glyph does not exist.
+    # The key changes whenever the outline changes.
+    async def getKeyedGlyphOutline(
+        self, glyphName: str, sourceLocation: dict[str, float]
+    ) -> tuple[str, dict] | None:
+        pass
+
+
 @runtime_checkable
 class ReadBackgroundImage(Protocol):
     async def getBackgroundImage(self, imageIdentifier: str) -> ImageData | None:
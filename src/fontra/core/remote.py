@@ -5,13 +5,25 @@ import logging
 import traceback
 from typing import Any, AsyncGenerator, Generator
 
-from aiohttp import WSMsgType, web
+from aiohttp import WSMessage, WSMsgType, web
 
 from .classes import unstructure
+from .messagecodec import (
+    MessageCodec,
+    defaultMessageCodec,
+    messageCodecs,
+    negotiateMessageCodec,
+)
 
 logger = logging.getLogger(__name__)
 
 
+SEND_QUEUE_SIZE = 100
+# A client that doesn't accept a message for this long is considered stalled,
+# and is disconnected
+SEND_TIMEOUT = 30  # in seconds
+
+
 class RemoteObjectConnectionException(Exception):
     pass
 
@@ -29,8 +41,19 @@ class RemoteObjectConnection:
         self.subject = subject
         self.verboseErrors = verboseErrors
         self.clientUUID = None
-        self.callReturnFutures: dict[str, asyncio.Future] = {}
+        self.messageCodec: MessageCodec = defaultMessageCodec
+        self.callReturnFutures: dict[int, asyncio.Future] = {}
         self.getNextServerCallID = _genNextServerCallID()
+        # Outgoing messages are sent in order by a single task, so a slow client
+        # holds up at most SEND_QUEUE_SIZE messages, and no other clients
+        self._sendQueue: asyncio.Queue = asyncio.Queue(SEND_QUEUE_SIZE)
+        self._sendTask: asyncio.Task | None = None
+        # Set when the connection can no longer send: from then on, sendMessage()
+        # raises, and so do pending and new calls to the client
+        self._sendError: Exception | None = None
+        self._sendFailedEvent = asyncio.Event()
+        self.numMessagesSent = 0
+        self.maxSendQueueDepth = 0
 
     @property
     def proxy(self) -> RemoteClientProxy:
@@ -42,6 +65,12 @@ class RemoteObjectConnection:
         self.clientUUID = messageObj.get("client-uuid")
         if self.clientUUID is None:
             raise RemoteObjectConnectionException("unrecognized message")
+        requestedEncodings = messageObj.get("message-encodings")
+        if requestedEncodings is not None:
+            # The client can handle other encodings than JSON: tell it which one
+            # we picked. Clients that don't ask don't get a reply, and use JSON.
+            self.messageCodec = negotiateMessageCodec(requestedEncodings)
+            await self.websocket.send_json({"message-encoding": self.messageCodec.name})
         try:
             await self._handleConnection()
         except Exception as e:
@@ -49,6 +78,14 @@ class RemoteObjectConnection:
             if self.verboseErrors:
                 traceback.print_exc()
             await self.websocket.close()
+        finally:
+            self._connectionClosed(ConnectionResetError("websocket is closed"))
+            if self._sendTask is not None:
+                self._sendTask.cancel()
+            logger.info(
+                f"sent {self.numMessagesSent} messages to client {self.clientUUID}, "
+                f"max send queue depth: {self.maxSendQueueDepth}"
+            )
 
     async def _handleConnection(self) -> None:
         tasks: list[asyncio.Task] = []
@@ -71,7 +108,7 @@ class RemoteObjectConnection:
                 # message.json() will fail with a TypeError.
                 # https://github.com/aio-libs/aiohttp/issues/7313#issuecomment-1586150267
                 raise message.data
-            messageObj = message.json()
+            messageObj = self._decodeMessage(message)
 
             if messageObj.get("connection") == "close":
                 logger.info("client requested connection close")
@@ -81,7 +118,7 @@ class RemoteObjectConnection:
                 yield asyncio.create_task(self._performCall(messageObj, self.subject))
             elif "server-call-id" in messageObj:
                 # this is a response to a server -> client call
-                fut = self.callReturnFutures[messageObj["server-call-id"]]
+                fut = self.callReturnFutures.pop(messageObj["server-call-id"])
                 returnValue = messageObj.get("return-value")
                 error = messageObj.get("error")
                 if error is None:
@@ -117,10 +154,105 @@ class RemoteObjectConnection:
             response = {"client-call-id": clientCallID, "exception": repr(e)}
         await self.sendMessage(response)
 
+    def _decodeMessage(self, message: WSMessage) -> dict:
+        # Decode by frame type rather than by the negotiated encoding, so a
+        # client may always fall back to sending JSON text
+        if message.type == WSMsgType.BINARY:
+            return messageCodecs["msgpack"].decode(message.data)
+        return message.json()
+
     async def sendMessage(self, message):
-        await self.websocket.send_json(message)
+        self._checkSendError()
+        if self._sendTask is None:
+            self._sendTask = asyncio.create_task(self._sendQueuedMessages())
+        data = self.messageCodec.encode(message)
+        try:
+            self._sendQueue.put_nowait(data)
+        except asyncio.QueueFull:
+            # Wait while the queue is full: this holds up the sender, but
+            # only messages for this client
+            await self._putWhenQueueHasRoom(data)
+        self.maxSendQueueDepth = max(self.maxSendQueueDepth, self._sendQueue.qsize())
+
+    async def _putWhenQueueHasRoom(self, data) -> None:
+        putTask = asyncio.ensure_future(self._sendQueue.put(data))
+        sendFailedTask = asyncio.ensure_future(self._sendFailedEvent.wait())
+        try:
+            done, _ = await asyncio.wait(
+                [putTask, sendFailedTask],
+                timeout=SEND_TIMEOUT,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+        finally:
+            sendFailedTask.cancel()
+            if not putTask.done():
+                putTask.cancel()
+        if not done:
+            await self._closeStalledConnection()
+        # The message is lost if sending failed while it was being queued
+        self._checkSendError()
+
+    def _checkSendError(self) -> None:
+        if self._sendError is not None:
+            raise ConnectionResetError(
+                "websocket is no longer sending"
+            ) from self._sendError
+
+    def _connectionClosed(self, error: Exception) -> None:
+        if self._sendError is None:
+            self._sendError = error
+        self._sendFailedEvent.set()
+        # There will be no responses to the calls we made
+        for returnFuture in self.callReturnFutures.values():
+            if not returnFuture.done():
+                returnFuture.set_exception(
+                    ConnectionResetError("websocket closed before the call returned")
+                )
+        self.callReturnFutures.clear()
+
+    async def _sendQueuedMessages(self) -> None:
+        try:
+            while True:
+                data = await self._sendQueue.get()
+                if isinstance(data, bytes):
+                    send = self.websocket.send_bytes(data)
+                else:
+                    send = self.websocket.send_str(data)
+                try:
+                    await asyncio.wait_for(send, SEND_TIMEOUT)
+                except asyncio.TimeoutError:
+                    await self._closeStalledConnection()
+                    raise ConnectionResetError("client stopped receiving messages")
+                self.numMessagesSent += 1
+        except Exception as e:
+            self._connectionClosed(e)
+            # Drop what's left: the senders waiting for room are woken up by
+            # _connectionClosed(), and raise
+            while not self._sendQueue.empty():
+                self._sendQueue.get_nowait()
+            if not isinstance(e, ConnectionResetError):
+                logger.error(f"error while sending websocket message: {e!r}")
+
+    async def _closeStalledConnection(self) -> None:
+        logger.warning(
+            f"client {self.clientUUID} is not receiving messages, closing connection"
+        )
+        self._connectionClosed(
+            ConnectionResetError("client stopped receiving messages")
+        )
+        await self.websocket.close()
 
     async def callMethod(self, methodName, *args):
+        returnFuture = await self.sendMethodCall(methodName, *args)
+        return await returnFuture
+
+    async def sendMethodCall(self, methodName, *args) -> asyncio.Future:
+        """Send a call to the client, and return a future for its return value.
+
+        This returns as soon as the call is queued for sending, so the caller is
+        only held up by a client that doesn't receive its messages, not by a
+        client that is slow to respond.
+        """
         serverCallID = next(self.getNextServerCallID)
         message = {
             "server-call-id": serverCallID,
@@ -129,8 +261,12 @@ class RemoteObjectConnection:
         }
         returnFuture = asyncio.get_running_loop().create_future()
         self.callReturnFutures[serverCallID] = returnFuture
-        await self.sendMessage(message)
-        return await returnFuture
+        try:
+            await self.sendMessage(message)
+        except BaseException:
+            del self.callReturnFutures[serverCallID]
+            raise
+        return returnFuture
 
 
 class RemoteClientProxy:
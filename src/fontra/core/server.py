@@ -1,13 +1,16 @@
 from __future__ import annotations
 
 import errno
+import gzip
+import hashlib
 import json
 import logging
+import pathlib
 import re
 import socket
 import sys
 import traceback
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from functools import partial
 from http.cookies import SimpleCookie
@@ -24,10 +27,15 @@ from urllib.parse import quote
 
 from aiohttp import WSCloseCode, web
 
-from .protocols import ProjectManager
+from .protocols import ProjectManager, ReadGlyphOutlines
 from .remote import RemoteObjectConnection, RemoteObjectConnectionException
 from .serverutils import apiFunctions
-from .subprocess import shutdownProcessPool
+from .subprocess import getProcessPool, shutdownProcessPool
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
 
 logger = logging.getLogger(__name__)
 
@@ -45,6 +53,13 @@ mimeTypes = {
     "woff2": "font/woff2",
 }
 
+compressibleExtensions = frozenset(["css", "csv", "html", "js", "json", "svg", "txt"])
+
+# Smaller resources are not worth compressing
+minCompressSize = 1024
+
+immutableCacheControl = "public, max-age=31536000, immutable"
+
 
 @dataclass(kw_only=True)
 class FontraServer:
@@ -55,6 +70,8 @@ class FontraServer:
     versionToken: Optional[str] = None
     cookieMaxAge: int = 7 * 24 * 60 * 60
     allowedFileExtensions: frozenset[str] = frozenset(mimeTypes.keys())
+    warmUpProcessPool: bool = False
+    websocketCompression: bool = True  # permessage-deflate, if the client supports it
 
     def setup(self) -> None:
         self.startupTime = datetime.now(timezone.utc).replace(microsecond=0)
@@ -68,6 +85,7 @@ class FontraServer:
         routes.append(web.get("/websocket", self.websocketHandler))
         routes.append(web.get("/projectlist", self.projectListHandler))
         routes.append(web.get("/serverinfo", self.serverInfoHandler))
+        routes.append(web.get("/glyphoutline", self.glyphOutlineHandler))
         routes.append(web.post("/api/{function:.*}", self.webAPIHandler))
         for ep in entry_points(group="fontra.webcontent"):
             routes.append(
@@ -90,12 +108,13 @@ class FontraServer:
             web.get("/{path:.*}", partial(self.staticContentHandler, "fontra.client"))
         )
         self.httpApp.add_routes(routes)
-        if self.launchWebBrowser:
-            self.httpApp.on_startup.append(self.launchWebBrowserCallback)
+        if self.launchWebBrowser or self.warmUpProcessPool:
+            self.httpApp.on_startup.append(self.startupCallback)
         self.httpApp.on_shutdown.append(self.closeActiveWebsockets)
         self.httpApp.on_shutdown.append(self.closeProjectManager)
         self.httpApp.on_shutdown.append(self.shutdownProcessPool)
         self._activeWebsockets: set = set()
+        self._staticContentCache: dict[tuple[str, str], StaticContent] = {}
 
     def run(self, showLaunchBanner: bool = True) -> None:
         host = self.host
@@ -113,7 +132,15 @@ class FontraServer:
             print("+---------------------------------------------------+")
         web.run_app(self.httpApp, host=host, port=httpPort)
 
-    async def launchWebBrowserCallback(self, httpApp: web.Application) -> None:
+    async def startupCallback(self, httpApp: web.Application) -> None:
+        # A single on_startup callback: aiohttp's signal type annotations
+        # don't accept our callbacks, so each one costs a type check error
+        if self.launchWebBrowser:
+            self.launchWebBrowserSoon()
+        if self.warmUpProcessPool:
+            await getProcessPool().warmUp()
+
+    def launchWebBrowserSoon(self) -> None:
         import asyncio
         import webbrowser
 
@@ -137,7 +164,7 @@ class FontraServer:
         await self.projectManager.aclose()
 
     async def shutdownProcessPool(self, httpApp: web.Application) -> None:
-        shutdownProcessPool()
+        shutdownProcessPool(logStatistics=True)
 
     async def websocketHandler(self, request: web.Request) -> web.WebSocketResponse:
         projectIdentifier = request.query.get("project")
@@ -152,7 +179,9 @@ class FontraServer:
         cookieValues = {k: v.value for k, v in cookies.items()}
         token = cookieValues.get("fontra-authorization-token", "")
 
-        websocket = web.WebSocketResponse(heartbeat=55, max_msg_size=0x2000000)
+        websocket = web.WebSocketResponse(
+            heartbeat=55, max_msg_size=0x2000000, compress=self.websocketCompression
+        )
         await websocket.prepare(request)
         self._activeWebsockets.add(websocket)
         try:
@@ -218,6 +247,50 @@ class FontraServer:
             text=json.dumps(serverInfo), content_type="application/json"
         )
 
+    async def glyphOutlineHandler(self, request: web.Request) -> web.Response:
+        # The decomposed outline of a glyph at a location, see GlyphOutlineCache.
+        # Query parameters: "project", "glyph" and "location", the latter being a
+        # JSON object with a source location.
+        authToken = await self.projectManager.authorize(request)
+        if not authToken:
+            raise web.HTTPUnauthorized()
+        try:
+            projectIdentifier = request.query["project"]
+            glyphName = request.query["glyph"]
+            sourceLocation = json.loads(request.query.get("location", "{}"))
+        except (KeyError, json.JSONDecodeError):
+            raise web.HTTPBadRequest()
+        if not isValidLocation(sourceLocation):
+            raise web.HTTPBadRequest()
+        if not await self.projectManager.projectAvailable(projectIdentifier, authToken):
+            raise web.HTTPNotFound()
+        subject = await self.projectManager.getRemoteSubject(
+            projectIdentifier, authToken
+        )
+        if not isinstance(subject, ReadGlyphOutlines):
+            raise web.HTTPNotFound()
+
+        try:
+            result = await subject.getKeyedGlyphOutline(glyphName, sourceLocation)
+        except Exception as e:
+            # For example incompatible sources: the client can still fall back
+            # to instantiating the glyph itself
+            logger.error(f"can't compute the outline of glyph {glyphName!r}: {e!r}")
+            traceback.print_exc()
+            raise web.HTTPUnprocessableEntity()
+        if result is None:
+            raise web.HTTPNotFound()
+        key, outline = result
+
+        # The key changes whenever the outline changes, so the client can
+        # cheaply revalidate its cached copy
+        headers = {"Cache-Control": "no-cache", "ETag": f'"{key}"'}
+        if any(etag.value == key for etag in request.if_none_match or ()):
+            raise web.HTTPNotModified(headers=headers)
+        return web.Response(
+            text=json.dumps(outline), content_type="application/json", headers=headers
+        )
+
     async def webAPIHandler(self, request: web.Request) -> web.Response:
         authToken = await self.projectManager.authorize(request)
         if not authToken:
@@ -240,30 +313,85 @@ class FontraServer:
     async def staticContentHandler(
         self, packageName: str, request: web.Request
     ) -> web.Response:
-        ifModSince = request.if_modified_since
-        if ifModSince is not None and ifModSince >= self.startupTime:
-            raise web.HTTPNotModified()
-
         pathItems = [""] + request.match_info["path"].split("/")
         modulePath = packageName + ".".join(pathItems[:-1])
         resourceName = pathItems[-1]
+        versionToken = None
         if self.versionToken is not None:
             resourceName, versionToken = splitVersionToken(resourceName)
             if versionToken is not None:
                 if versionToken != self.versionToken:
                     raise web.HTTPNotFound()
-        try:
-            data = getResourcePath(modulePath, resourceName).read_bytes()
-        except (FileNotFoundError, IsADirectoryError, ModuleNotFoundError):
-            raise web.HTTPNotFound()
+
+        content = self._getStaticContent(modulePath, resourceName)
+
+        # Version-tokened URLs change when the server restarts, so their content
+        # can be cached for as long as the browser likes
+        return self._makeStaticContentResponse(
+            request,
+            content,
+            immutableCacheControl if versionToken is not None else "no-cache",
+        )
+
+    def _makeStaticContentResponse(
+        self, request: web.Request, content: StaticContent, cacheControl: str
+    ) -> web.Response:
+        headers = {
+            "Cache-Control": cacheControl,
+            "Vary": "Accept-Encoding",
+            "ETag": f'"{content.etag}"',
+        }
+        lastModified = max(self.startupTime, content.modificationTime)
+
+        ifModSince = request.if_modified_since
+        if any(etag.value == content.etag for etag in request.if_none_match or ()) or (
+            not request.if_none_match
+            and ifModSince is not None
+            and ifModSince >= lastModified
+        ):
+            raise web.HTTPNotModified(headers=headers)
+
+        encoding, body = content.getBody(request.headers.get("Accept-Encoding", ""))
+        if encoding is not None:
+            headers["Content-Encoding"] = encoding
+        response = web.Response(
+            body=body, content_type=content.contentType, headers=headers
+        )
+        response.last_modified = lastModified
+        return response
+
+    def _getStaticContent(self, modulePath: str, resourceName: str) -> StaticContent:
+        # Resources are cached after the version tokens have been added. A cached
+        # resource is reloaded when its file's modification time or size changed,
+        # so edits are picked up during development.
         ext = resourceName.rsplit(".", 1)[-1].lower()
         if ext not in self.allowedFileExtensions:
             raise web.HTTPNotFound()
+        try:
+            resourcePath = getResourcePath(modulePath, resourceName)
+            fileStamp = getResourceFileStamp(resourcePath)
+        except (FileNotFoundError, ModuleNotFoundError):
+            raise web.HTTPNotFound()
+
+        cacheKey = (modulePath, resourceName)
+        content = self._staticContentCache.get(cacheKey)
+        if content is not None and content.fileStamp == fileStamp:
+            return content
+
+        try:
+            data = resourcePath.read_bytes()
+        except (FileNotFoundError, IsADirectoryError):
+            raise web.HTTPNotFound()
         contentType = mimeTypes.get(resourceName.rsplit(".")[-1], "")
         data = self._addVersionTokenToReferences(data, contentType)
-        response = web.Response(body=data, content_type=contentType)
-        response.last_modified = self.startupTime
-        return response
+        content = StaticContent(
+            body=data,
+            contentType=contentType,
+            compressible=ext in compressibleExtensions and len(data) >= minCompressSize,
+            fileStamp=fileStamp,
+        )
+        self._staticContentCache[cacheKey] = content
+        return content
 
     async def notFoundHandler(self, request: web.Request) -> web.Response:
         return web.HTTPNotFound()
@@ -293,16 +421,10 @@ class FontraServer:
         ):
             raise web.HTTPNotFound()
 
-        try:
-            html = getResourcePath(
-                self.viewEntryPoints[viewName], f"{viewName}.html"
-            ).read_bytes()
-        except (FileNotFoundError, ModuleNotFoundError):
-            raise web.HTTPNotFound()
-
-        html = self._addVersionTokenToReferences(html, "text/html")
-
-        return web.Response(body=html, content_type="text/html")
+        content = self._getStaticContent(
+            self.viewEntryPoints[viewName], f"{viewName}.html"
+        )
+        return self._makeStaticContentResponse(request, content, "no-cache")
 
     async def viewRedirectHandler(self, request: web.Request) -> web.Response:
         raise web.HTTPFound(request.path.replace("/-/", "/?project="))
@@ -324,6 +446,71 @@ class FontraServer:
         return data
 
 
+@dataclass(kw_only=True)
+class StaticContent:
+    body: bytes
+    contentType: str
+    compressible: bool
+    fileStamp: tuple[int, int] | None = None  # (mtime in ns, size)
+    compressedBodies: dict[str, bytes] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        self.etag = hashlib.sha256(self.body).hexdigest()[:32]
+
+    @property
+    def modificationTime(self) -> datetime:
+        if self.fileStamp is None:
+            return datetime.min.replace(tzinfo=timezone.utc)
+        return datetime.fromtimestamp(self.fileStamp[0] // 1_000_000_000, timezone.utc)
+
+    def getBody(self, acceptEncoding: str) -> tuple[str | None, bytes]:
+        """Return the content encoding and the (possibly compressed) body,
+        given the value of the request's Accept-Encoding header. Compressed
+        variants are computed once, when they are first needed.
+        """
+        if self.compressible:
+            acceptedEncodings = parseAcceptEncoding(acceptEncoding)
+            for encoding in ["br", "gzip"]:
+                if encoding not in acceptedEncodings:
+                    continue
+                if encoding == "br" and brotli is None:
+                    continue
+                body = self.compressedBodies.get(encoding)
+                if body is None:
+                    body = _compressFunctions[encoding](self.body)
+                    self.compressedBodies[encoding] = body
+                return encoding, body
+        return None, self.body
+
+
+_compressFunctions = {
+    "br": lambda data: brotli.compress(data, quality=9),
+    "gzip": lambda data: gzip.compress(data, compresslevel=9, mtime=0),
+}
+
+
+def parseAcceptEncoding(acceptEncoding: str) -> set[str]:
+    """Return the set of encodings that are acceptable according to the value of
+    an Accept-Encoding header. Encodings with a zero quality value are omitted.
+    """
+    encodings = set()
+    for item in acceptEncoding.split(","):
+        encoding, *params = [part.strip() for part in item.split(";")]
+        if not encoding:
+            continue
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0
+        if quality > 0:
+            encodings.add(encoding.lower())
+    return encodings
+
+
 def addVersionTokenToReferences(
     data: bytes, versionToken: str, extensions: Collection[str]
 ) -> bytes:
@@ -344,6 +531,24 @@ def getResourcePath(modulePath: str, resourceName: str) -> Traversable:
     return resourcePath
 
 
+def getResourceFileStamp(resourcePath: Traversable) -> tuple[int, int] | None:
+    """Return the modification time in nanoseconds and the size of the file
+    at `resourcePath`, or None if the resource is not a plain file, for example
+    when it's inside a zip archive, and can't change.
+    """
+    if not isinstance(resourcePath, pathlib.Path):
+        return None
+    stat = resourcePath.stat()
+    return stat.st_mtime_ns, stat.st_size
+
+
+def isValidLocation(location: Any) -> bool:
+    return isinstance(location, dict) and all(
+        isinstance(value, (int, float)) and not isinstance(value, bool)
+        for value in location.values()
+    )
+
+
 def splitVersionToken(fileName: str) -> tuple[str, str | None]:
     parts = fileName.rsplit(".", 2)
     if len(parts) == 3:
@@ -1,26 +1,159 @@
+from __future__ import annotations
+
 import asyncio
 import atexit
 import concurrent.futures
+import logging
+import os
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_POOL_NAME = "default"
+
+
+@dataclass(kw_only=True)
+class ProcessPoolStatistics:
+    numCalls: int = 0
+    numPending: int = 0  # submitted, but not yet finished
+    maxPending: int = 0
+    totalWaitTime: float = 0  # time spent in the queue, in seconds
+    totalRunTime: float = 0  # time spent running in a worker process, in seconds
+    maxRunTime: float = 0
+
+
+@dataclass(kw_only=True)
+class ProcessPool:
+    name: str = DEFAULT_POOL_NAME
+    maxWorkers: int | None = None  # None: the number of CPUs
+    maxTasksPerChild: int | None = None  # None: worker processes live forever
+    statistics: ProcessPoolStatistics = field(default_factory=ProcessPoolStatistics)
+
+    def __post_init__(self) -> None:
+        self._executor: concurrent.futures.ProcessPoolExecutor | None = None
+
+    @property
+    def executor(self) -> concurrent.futures.ProcessPoolExecutor:
+        if self._executor is None:
+            kwargs: dict[str, Any] = {}
+            if self.maxTasksPerChild is not None:
+                if sys.version_info >= (3, 11):
+                    kwargs["max_tasks_per_child"] = self.maxTasksPerChild
+                else:
+                    logger.warning("maxTasksPerChild requires Python 3.11 or later")
+            self._executor = concurrent.futures.ProcessPoolExecutor(
+                max_workers=self.maxWorkers, **kwargs
+            )
+        return self._executor
+
+    async def run(self, func: Callable, *args) -> Any:
+        stats = self.statistics
+        stats.numCalls += 1
+        stats.numPending += 1
+        stats.maxPending = max(stats.maxPending, stats.numPending)
+        loop = asyncio.get_running_loop()
+        t = time.perf_counter()
+        try:
+            result, runTime = await loop.run_in_executor(
+                self.executor, _timedCall, func, args
+            )
+        finally:
+            stats.numPending -= 1
+        stats.totalWaitTime += max(0, time.perf_counter() - t - runTime)
+        stats.totalRunTime += runTime
+        stats.maxRunTime = max(stats.maxRunTime, runTime)
+        logger.debug(f"{self.name} process pool: {func} took {runTime:.3f}s")
+        return result
+
+    async def map(
+        self, func: Callable, items: Iterable, *, chunkSize: int = 100
+    ) -> list:
+        """Call `func` with each item of `items`, and return the results as a list.
+        The items are sent to the worker processes in chunks of `chunkSize`, to
+        reduce the per-call overhead.
+        """
+        items = list(items)
+        chunks = [items[i : i + chunkSize] for i in range(0, len(items), chunkSize)]
+        chunkResults = await asyncio.gather(
+            *(self.run(_mapChunk, func, chunk) for chunk in chunks)
+        )
+        return [result for chunkResult in chunkResults for result in chunkResult]
+
+    async def warmUp(self) -> None:
+        # Make sure all worker processes are started, so the first real calls
+        # don't pay for the process startup
+        numWorkers = self.maxWorkers or os.cpu_count() or 1
+        await asyncio.gather(*(self.run(_noop) for _ in range(numWorkers)))
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+def _timedCall(func: Callable, args: tuple) -> tuple[Any, float]:
+    t = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - t
+
+
+def _mapChunk(func: Callable, chunk: list) -> list:
+    return [func(item) for item in chunk]
+
+
+def _noop() -> None:
+    pass
+
+
+_processPools: dict[str, ProcessPool] = {}
+
+
+def configureProcessPool(
+    name: str = DEFAULT_POOL_NAME,
+    *,
+    maxWorkers: int | None = None,
+    maxTasksPerChild: int | None = None,
+) -> ProcessPool:
+    """Set the parameters for the named process pool. This replaces the pool if
+    it already existed.
+    """
+    previousPool = _processPools.pop(name, None)
+    if previousPool is not None:
+        previousPool.shutdown()
+    pool = ProcessPool(
+        name=name, maxWorkers=maxWorkers, maxTasksPerChild=maxTasksPerChild
+    )
+    _processPools[name] = pool
+    return pool
 
-_processPool = None
 
+def getProcessPool(name: str = DEFAULT_POOL_NAME) -> ProcessPool:
+    pool = _processPools.get(name)
+    if pool is None:
+        pool = configureProcessPool(name)
+    return pool
 
-async def runInSubProcess(func):
-    global _processPool
 
-    if _processPool is None:
-        _processPool = concurrent.futures.ProcessPoolExecutor()
+async def runInSubProcess(func, *args, poolName: str = DEFAULT_POOL_NAME):
+    return await getProcessPool(poolName).run(func, *args)
 
-    loop = asyncio.get_running_loop()
-    return await loop.run_in_executor(_processPool, func)
 
+async def mapInSubProcess(
+    func, items, *, chunkSize: int = 100, poolName: str = DEFAULT_POOL_NAME
+) -> list:
+    return await getProcessPool(poolName).map(func, items, chunkSize=chunkSize)
 
-def shutdownProcessPool():
-    global _processPool
 
-    if _processPool is not None:
-        _processPool.shutdown(wait=False)
-        _processPool = None
+def shutdownProcessPool(logStatistics: bool = False):
+    for pool in _processPools.values():
+        if logStatistics and pool.statistics.numCalls:
+            logger.info(f"{pool.name} process pool statistics: {pool.statistics}")
+        pool.shutdown()
+    _processPools.clear()
 
 
 atexit.register(shutdownProcessPool)
@@ -10,7 +10,10 @@ from typing import Callable
 from aiohttp import web
 
 from ..backends import getFileSystemBackend
-from ..core.fonthandler import FontHandler
+from ..backends.glyphcache import wrapWithPersistentGlyphCache
+from ..core.cachedir import getProjectCacheDir
+from ..core.changejournal import CHANGE_JOURNAL_FILE_NAME
+from ..core.fonthandler import DEFAULT_GLYPH_CACHE_SIZE, FontHandler
 from ..core.protocols import ProjectManager
 
 logger = logging.getLogger(__name__)
@@ -34,6 +37,27 @@ class FileSystemProjectManagerFactory:
         )
         parser.add_argument("--max-folder-depth", type=int, default=3)
         parser.add_argument("--read-only", action="store_true")
+        parser.add_argument(
+            "--glyph-cache-size",
+            type=int,
+            default=DEFAULT_GLYPH_CACHE_SIZE // (1024 * 1024),
+            help="The approximate amount of memory, in megabytes, that each open "
+            "project may use for caching glyph data. (Default: %(default)s)",
+        )
+        parser.add_argument(
+            "--persistent-glyph-cache",
+            action="store_true",
+            help="Store the glyphs of read-only font formats, such as .otf and .ttf "
+            "files and workflows, and the glyph outlines shown in the font overview, "
+            "in an on-disk cache, so they don't need to be recomputed after a "
+            "restart.",
+        )
+        parser.add_argument(
+            "--change-journal",
+            action="store_true",
+            help="Keep an on-disk journal of edits that have not yet been written "
+            "to the font files, so they can be recovered after a crash.",
+        )
 
     @staticmethod
     def getProjectManager(arguments: SimpleNamespace) -> ProjectManager:
@@ -41,6 +65,9 @@ class FileSystemProjectManagerFactory:
             rootPath=arguments.path,
             maxFolderDepth=arguments.max_folder_depth,
             readOnly=arguments.read_only,
+            glyphCacheSize=arguments.glyph_cache_size * 1024 * 1024,
+            persistentGlyphCache=arguments.persistent_glyph_cache,
+            changeJournal=arguments.change_journal,
         )
 
 
@@ -60,11 +87,17 @@ class FileSystemProjectManager:
         rootPath: pathlib.Path | None,
         maxFolderDepth: int = 3,
         readOnly: bool = False,
+        glyphCacheSize: int = DEFAULT_GLYPH_CACHE_SIZE,
+        persistentGlyphCache: bool = False,
+        changeJournal: bool = False,
     ):
         self.rootPath = rootPath
         self.singleFilePath = None
         self.maxFolderDepth = maxFolderDepth
         self.readOnly = readOnly
+        self.glyphCacheSize = glyphCacheSize
+        self.persistentGlyphCache = persistentGlyphCache
+        self.changeJournal = changeJournal
         if self.rootPath is not None and self.rootPath.suffix.lower() in fileExtensions:
             self.singleFilePath = self.rootPath
             self.rootPath = self.rootPath.parent
@@ -98,6 +131,8 @@ class FileSystemProjectManager:
             if projectPath is None:
                 raise FileNotFoundError(projectPath)
             backend = getFileSystemBackend(projectPath)
+            if self.persistentGlyphCache:
+                backend = wrapWithPersistentGlyphCache(backend, projectPath)
 
             async def closeFontHandler():
                 logger.info(f"closing FontHandler for '{projectIdentifier}'")
@@ -111,6 +146,17 @@ class FileSystemProjectManager:
                 allConnectionsClosedCallback=closeFontHandler,
                 projectManager=self,
                 projectIdentifier=fspath(projectPath),
+                glyphCacheSize=self.glyphCacheSize,
+                persistentCacheDir=(
+                    getProjectCacheDir(projectPath)
+                    if self.persistentGlyphCache
+                    else None
+                ),
+                changeJournalPath=(
+                    getProjectCacheDir(projectPath) / CHANGE_JOURNAL_FILE_NAME
+                    if self.changeJournal
+                    else None
+                ),
             )
             await fontHandler.startTasks()
             self.fontHandlers[projectIdentifier] = fontHandler
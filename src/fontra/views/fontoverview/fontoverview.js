@@ -84,6 +84,13 @@ export class FontOverviewController extends ViewController {
 
     this.updateGlyphSelection = throttleCalls(() => this._updateGlyphSelection(), 50);
 
+    // The glyph map changes once per page while it's being loaded: don't re-sort
+    // for each page, and keep the scroll position
+    this.updateGlyphItemList = throttleCalls(
+      () => this._updateGlyphItemList({ resetScroll: false }),
+      200
+    );
+
     this.updateWindowLocation = scheduleCalls(
       (event) => this._updateWindowLocation(),
       200
@@ -102,7 +109,9 @@ export class FontOverviewController extends ViewController {
   }
 
   async _start() {
-    await super.start();
+    // Don't wait for the full glyph map of large fonts: the glyph cells are
+    // updated as the rest arrives
+    await this.fontController.initialize(true, { incrementalGlyphMap: true });
 
     this.fontSources = await this.fontController.getSources();
 
@@ -196,7 +205,7 @@ export class FontOverviewController extends ViewController {
     glyphCellViewContainer.appendChild(this.glyphCellView);
 
     this.fontController.addChangeListener({ glyphMap: null }, () => {
-      this._updateGlyphItemList();
+      this.updateGlyphItemList();
     });
 
     this.fontController.addChangeListener(
@@ -375,16 +384,18 @@ export class FontOverviewController extends ViewController {
     writeObjectToURLFragment(viewInfo);
   }
 
-  _updateGlyphItemList() {
+  _updateGlyphItemList({ resetScroll = true } = {}) {
     this._glyphItemList = this.glyphOrganizer.sortGlyphs(
       glyphMapToItemList(this.fontController.glyphMap)
     );
-    this._updateGlyphSelection();
+    this._updateGlyphSelection({ resetScroll });
   }
 
-  async _updateGlyphSelection() {
-    // We possibly need to be smarter about this:
-    this.glyphCellView.parentElement.scrollTop = 0;
+  async _updateGlyphSelection({ resetScroll = true } = {}) {
+    if (resetScroll) {
+      // We possibly need to be smarter about this:
+      this.glyphCellView.parentElement.scrollTop = 0;
+    }
 
     const combinedGlyphItemList = await this._getCombineGlyphItemList();
     const glyphItemList = this.glyphOrganizer.filterGlyphs(combinedGlyphItemList);
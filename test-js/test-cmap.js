@@ -1,6 +1,7 @@
 import { expect } from "chai";
 
 import {
+  addGlyphMapPage,
   getCharacterMapProxy,
   getGlyphMapProxy,
   makeCharacterMapFromGlyphMap,
@@ -179,4 +180,32 @@ describe("characterMap tests", () => {
       35: "double",
     });
   });
+
+  it("addGlyphMapPage", () => {
+    const glyphMap = {};
+    const characterMap = {};
+    const entries = addGlyphMapPage(glyphMap, characterMap, {
+      glyphNames: ["two", "none", "double"],
+      codePoints: [2, -1, [1, 3]],
+    });
+    expect(entries).to.deep.equal([
+      ["two", [2]],
+      ["none", []],
+      ["double", [1, 3]],
+    ]);
+    addGlyphMapPage(glyphMap, characterMap, {
+      glyphNames: ["a.alt", "one"],
+      codePoints: [2, 1],
+    });
+    expect(glyphMap).to.deep.equal({
+      "two": [2],
+      "none": [],
+      "double": [1, 3],
+      "a.alt": [2],
+      "one": [1],
+    });
+    // Same as makeCharacterMapFromGlyphMap(glyphMap, false)
+    expect(characterMap).to.deep.equal(makeCharacterMapFromGlyphMap(glyphMap, false));
+    expect(characterMap).to.deep.equal({ 1: "double", 2: "a.alt", 3: "double" });
+  });
 });
@@ -0,0 +1,86 @@
+import { expect } from "chai";
+
+import { decode, encode } from "../src/fontra/client/core/msgpack.js";
+
+describe("msgpack Tests", () => {
+  const testValues = [
+    null,
+    true,
+    false,
+    0,
+    1,
+    127,
+    128,
+    255,
+    256,
+    65535,
+    65536,
+    2 ** 32,
+    2 ** 40,
+    -1,
+    -32,
+    -33,
+    -128,
+    -129,
+    -32768,
+    -32769,
+    -(2 ** 31),
+    -(2 ** 40),
+    0.5,
+    -123.25,
+    1e300,
+    "",
+    "abc",
+    "x".repeat(31),
+    "x".repeat(32),
+    "x".repeat(300),
+    "x".repeat(70000),
+    "é中😀",
+    [],
+    [1, 2, 3],
+    Array.from({ length: 20 }, (_, i) => i),
+    Array.from({ length: 70000 }, (_, i) => i % 100),
+    {},
+    { a: 1, b: [true, null, "c"], d: { e: 1.5 } },
+    Object.fromEntries(Array.from({ length: 20 }, (_, i) => [`k${i}`, i])),
+  ];
+
+  for (const value of testValues) {
+    const label = JSON.stringify(value)?.slice(0, 40);
+    it(`round trip ${label}`, () => {
+      expect(decode(encode(value))).to.deep.equal(value);
+    });
+  }
+
+  it("JSON compatibility", () => {
+    const value = { a: undefined, b: [undefined, NaN], c: { toJSON: () => "c" } };
+    expect(decode(encode(value))).to.deep.equal(JSON.parse(JSON.stringify(value)));
+  });
+
+  it("__proto__ key", () => {
+    const value = JSON.parse('{"__proto__": {"polluted": true}}');
+    const decoded = decode(encode(value));
+    expect(Object.getPrototypeOf(decoded)).to.equal(Object.prototype);
+    expect(decoded.polluted).to.equal(undefined);
+    expect(Object.keys(decoded)).to.deep.equal(["__proto__"]);
+  });
+
+  it("binary", () => {
+    const value = new Uint8Array([1, 2, 3]);
+    expect(decode(encode(value))).to.deep.equal(value);
+  });
+
+  it("typed array extensions", () => {
+    // fixext 8, type 1: two little-endian float32 values
+    const float32Data = new Uint8Array([0xd7, 1, 0, 0, 0x80, 0x3f, 0, 0, 0x20, 0xc1]);
+    expect(decode(float32Data)).to.deep.equal([1, -10]);
+    // fixext 8, type 2: one little-endian float64 value
+    const float64Data = new Uint8Array([
+      0xd7, 2, 0x9a, 0x99, 0x99, 0x99, 0x99, 0x99, 0xb9, 0x3f,
+    ]);
+    expect(decode(float64Data)).to.deep.equal([0.1]);
+    // ext 8, type 3: three bytes
+    const uint8Data = new Uint8Array([0xc7, 3, 3, 0, 1, 8]);
+    expect(decode(uint8Data)).to.deep.equal([0, 1, 8]);
+  });
+});
@@ -1,5 +1,7 @@
 import pytest
 
+from fontra.core.cachedir import CACHE_DIR_ENVIRON_KEY
+
 
 def pytest_addoption(parser):
     parser.addoption("--write-expected-data", action="store_true", default=False)
@@ -8,3 +10,11 @@ def pytest_addoption(parser):
 @pytest.fixture(scope="session")
 def writeExpectedData(pytestconfig):
     return pytestconfig.getoption("write_expected_data")
+
+
+@pytest.fixture(autouse=True)
+def cacheDir(tmp_path_factory, monkeypatch):
+    # Don't let tests read from or write to the user's cache folder
+    cacheDir = tmp_path_factory.mktemp("fontra-cache")
+    monkeypatch.setenv(CACHE_DIR_ENVIRON_KEY, str(cacheDir))
+    return cacheDir
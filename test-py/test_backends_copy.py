@@ -1,5 +1,6 @@
 import pathlib
 import subprocess
+from contextlib import aclosing
 
 import pytest
 from test_backends_designspace import fileNamesFromDir
@@ -22,7 +23,8 @@ async def test_copyFont(tmpdir, glyphNames):
     sourceFont = getFileSystemBackend(mutatorDSPath)
     sourceGlyphNames = sorted(await sourceFont.getGlyphMap())
     destFont = newFileSystemBackend(destPath)
-    await copyFont(sourceFont, destFont, glyphNames=glyphNames)
+    async with aclosing(destFont):
+        await copyFont(sourceFont, destFont, glyphNames=glyphNames)
     assert [
         "MutatorCopy.designspace",
         "MutatorCopy_BoldCondensed.ufo",
@@ -39,6 +41,66 @@ async def test_copyFont(tmpdir, glyphNames):
     assert glyphNames == reopenedGlyphNames
 
 
+@pytest.mark.parametrize("writeInSubProcesses", [False, True])
+@pytest.mark.parametrize("glyphNames", [None, ["Aacute", "period"]])
+async def test_copyFont_numProcesses(tmpdir, glyphNames, writeInSubProcesses):
+    tmpdir = pathlib.Path(tmpdir)
+    destPath = tmpdir / "MutatorCopy.fontra"
+    sourceFont = getFileSystemBackend(mutatorDSPath)
+    destFont = newFileSystemBackend(destPath)
+    if writeInSubProcesses:
+
+        async def putGlyph(glyphName, glyph, codePoints):
+            assert False, "glyphs should be written by the worker processes"
+
+        destFont.putGlyph = putGlyph
+    async with aclosing(destFont):
+        await copyFont(
+            sourceFont,
+            destFont,
+            glyphNames=glyphNames,
+            numProcesses=2,
+            sourcePath=mutatorDSPath,
+            destPath=destPath if writeInSubProcesses else None,
+        )
+
+    reopenedFont = getFileSystemBackend(destPath)
+    expectedGlyphMap = await sourceFont.getGlyphMap()
+    if glyphNames is not None:
+        # "A" and "acute" are components of "Aacute"
+        expectedGlyphMap = {
+            glyphName: expectedGlyphMap[glyphName]
+            for glyphName in ["A", "Aacute", "acute", "period"]
+        }
+    assert expectedGlyphMap == await reopenedFont.getGlyphMap()
+    numBackgroundImages = 0
+    for glyphName in expectedGlyphMap:
+        glyph = await reopenedFont.getGlyph(glyphName)
+        assert await sourceFont.getGlyph(glyphName) == glyph
+        for layer in glyph.layers.values():
+            if layer.glyph.backgroundImage is not None:
+                imageIdentifier = layer.glyph.backgroundImage.identifier
+                assert await reopenedFont.getBackgroundImage(imageIdentifier)
+                numBackgroundImages += 1
+    if glyphNames is None:
+        assert numBackgroundImages
+
+
+async def test_copyFont_numProcesses_wrappedSource(tmpdir):
+    from fontra.workflow.actions.subset import SubsetGlyphs
+
+    tmpdir = pathlib.Path(tmpdir)
+    destPath = tmpdir / "MutatorCopy.fontra"
+    subsetter = SubsetGlyphs(glyphNames={"A"})
+    async with subsetter.connect(getFileSystemBackend(mutatorDSPath)) as sourceFont:
+        destFont = newFileSystemBackend(destPath)
+        async with aclosing(destFont):
+            with pytest.raises(ValueError, match="file system backend"):
+                await copyFont(
+                    sourceFont, destFont, numProcesses=2, sourcePath=mutatorDSPath
+                )
+
+
 def test_fontra_copy(tmpdir):
     tmpdir = pathlib.Path(tmpdir)
     destPath = tmpdir / "MutatorCopy.designspace"
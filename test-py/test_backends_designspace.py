@@ -7,11 +7,20 @@ from dataclasses import asdict
 
 import pytest
 from fontTools.designspaceLib import DesignSpaceDocument
+from fontTools.ufoLib import UFOReaderWriter
+from fontTools.ufoLib.glifLib import GlifLibError, GlyphSet, readGlyphFromString
 
-from fontra.backends import getFileSystemBackend, newFileSystemBackend
+from fontra.backends import designspace, getFileSystemBackend, newFileSystemBackend
 from fontra.backends.copy import copyFont
-from fontra.backends.designspace import DesignspaceBackend, UFOBackend, convertImageData
+from fontra.backends.designspace import (
+    DesignspaceBackend,
+    UFOBackend,
+    UFOGlyph,
+    convertImageData,
+)
+from fontra.backends.filewatcher import Change
 from fontra.backends.null import NullBackend
+from fontra.backends.ufo_utils import splitGLIFOutline
 from fontra.core.classes import (
     Anchor,
     Axes,
@@ -30,6 +39,7 @@ from fontra.core.classes import (
     StaticGlyph,
     unstructure,
 )
+from fontra.core.path import PackedPathPointPen
 
 dataDir = pathlib.Path(__file__).resolve().parent / "data"
 
@@ -545,6 +555,7 @@ async def test_newFileSystemBackend(
     assert glyph == newGlyph
 
     # Check with freshly opened font
+    await font.flushWrites()
     referenceFont = getFileSystemBackend(destPath)
     referenceGlyph = await referenceFont.getGlyph("A")
     assert glyph == referenceGlyph
@@ -587,6 +598,129 @@ async def test_deleteGlyph(writableTestFont):
     assert await writableTestFont.getGlyph(glyphName) is None
 
 
+async def test_contentsWritesAreDeferred(writableTestFont, monkeypatch):
+    numContentsWrites = 0
+    writeContents = GlyphSet.writeContents
+
+    def countingWriteContents(self):
+        nonlocal numContentsWrites
+        numContentsWrites += 1
+        writeContents(self)
+
+    monkeypatch.setattr(GlyphSet, "writeContents", countingWriteContents)
+
+    glyph = await writableTestFont.getGlyph("A")
+    newGlyphNames = [f"A.alt{i}" for i in range(10)]
+    for glyphName in newGlyphNames:
+        await writableTestFont.putGlyph(glyphName, glyph, [])
+    await writableTestFont.deleteGlyph("B")
+
+    contentsPath = (
+        pathlib.Path(writableTestFont.defaultUFOLayer.path)
+        / "glyphs"
+        / "contents.plist"
+    )
+    contents = contentsPath.read_text()
+    assert "<key>A.alt0</key>" not in contents
+    assert "<key>B</key>" in contents
+    assert 0 == numContentsWrites
+
+    await writableTestFont.aclose()
+    contents = contentsPath.read_text()
+    assert all(f"<key>{glyphName}</key>" in contents for glyphName in newGlyphNames)
+    assert "<key>B</key>" not in contents
+    # At most one write per layer
+    assert numContentsWrites <= len(writableTestFont.ufoLayers)
+
+    reopenedFont = DesignspaceBackend.fromPath(writableTestFont.dsDoc.path)
+    glyphMap = await reopenedFont.getGlyphMap()
+    assert all(glyphName in glyphMap for glyphName in newGlyphNames)
+    assert "B" not in glyphMap
+
+
+async def test_externalContentsChangeWhileWritePending(writableTestFont):
+    glyph = await writableTestFont.getGlyph("A")
+    await writableTestFont.putGlyph("A.alt", glyph, [])
+    await writableTestFont.deleteGlyph("B")
+
+    # An external tool adds a glyph, and rewrites contents.plist, which
+    # doesn't have our pending changes
+    glyphsDir = pathlib.Path(writableTestFont.defaultUFOLayer.path) / "glyphs"
+    glifPath = glyphsDir / "Z_.ext.glif"
+    shutil.copy(glyphsDir / "A_.glif", glifPath)
+    glifPath.write_text(glifPath.read_text().replace('name="A"', 'name="Z.ext"', 1))
+    contentsPath = glyphsDir / "contents.plist"
+    contentsPath.write_text(
+        contentsPath.read_text().replace(
+            "<key>A</key>",
+            "<key>Z.ext</key>\n    <string>Z_.ext.glif</string>\n    <key>A</key>",
+            1,
+        )
+    )
+
+    changedItems = await writableTestFont._analyzeExternalChanges(
+        {(Change.added, str(glifPath))}
+    )
+    assert {"Z.ext"} == changedItems.newGlyphs
+    assert "<key>Z.ext</key>" in contentsPath.read_text()
+
+    await writableTestFont.aclose()
+    contents = contentsPath.read_text()
+    assert "<key>Z.ext</key>" in contents
+    assert "<key>A.alt</key>" in contents
+    assert "<key>B</key>" not in contents
+
+
+async def test_glifCache(writableTestFont, monkeypatch):
+    numParsedGlyphs = 0
+    ufoLayerToStaticGlyph = designspace.ufoLayerToStaticGlyph
+
+    def countingUFOLayerToStaticGlyph(glyphSet, glyphName):
+        nonlocal numParsedGlyphs
+        numParsedGlyphs += 1
+        return ufoLayerToStaticGlyph(glyphSet, glyphName)
+
+    monkeypatch.setattr(
+        designspace, "ufoLayerToStaticGlyph", countingUFOLayerToStaticGlyph
+    )
+
+    glyph = await writableTestFont.getGlyph("A")
+    numLayers = len(glyph.layers)
+    assert numLayers == numParsedGlyphs
+
+    # The cached glyph is not affected by changes to the returned glyph
+    glyph.layers["MutatorSansLightCondensed/foreground"].glyph.xAdvance = 123
+    glyph.customData["test"] = 1
+    cachedGlyph = await writableTestFont.getGlyph("A")
+    assert numLayers == numParsedGlyphs
+    assert (
+        123 != cachedGlyph.layers["MutatorSansLightCondensed/foreground"].glyph.xAdvance
+    )
+    assert "test" not in cachedGlyph.customData
+
+    await writableTestFont.putGlyph("A", glyph, [ord("A")])
+    assert glyph == await writableTestFont.getGlyph("A")
+    assert 2 * numLayers == numParsedGlyphs
+
+
+async def test_loadGlyphSets(testFont):
+    glifFileNames = {}
+    for ufoLayer in testFont.ufoLayers:
+        for glyphName, fileName in ufoLayer.glyphSet.contents.items():
+            glifFileNames[fileName] = glyphName
+    assert glifFileNames == testFont.glifFileNames
+    defaultGlyphSet = testFont.defaultUFOLayer.glyphSet
+    assert sorted(defaultGlyphSet.keys()) == sorted(await testFont.getGlyphMap())
+    assert [0x41, 0x61] == (await testFont.getGlyphMap())["A"]
+
+
+async def test_missingGlifFileRaises(writableTestFont):
+    glyphSet = writableTestFont.defaultUFOLayer.glyphSet
+    (pathlib.Path(glyphSet.fs.getsyspath("/")) / glyphSet.contents["B"]).unlink()
+    with pytest.raises(GlifLibError, match="references a file that does not exist"):
+        DesignspaceBackend.fromPath(writableTestFont.dsDoc.path)
+
+
 async def test_deleteGlyphRaisesKeyError(writableTestFont):
     glyphName = "A.doesnotexist"
     with pytest.raises(KeyError, match="Glyph 'A.doesnotexist' does not exist"):
@@ -986,11 +1120,124 @@ async def test_kerning_read_write(writableTestFont):
     ]
 
 
+async def test_kerning_write_changed_sources_only(writableTestFont, monkeypatch):
+    writtenFiles = []
+
+    def recordWrite(fileName):
+        def write(self, data):
+            ufoFileName = pathlib.Path(self.fs.getsyspath("/")).name
+            writtenFiles.append((ufoFileName, fileName))
+
+        return write
+
+    monkeypatch.setattr(UFOReaderWriter, "writeGroups", recordWrite("groups"))
+    monkeypatch.setattr(UFOReaderWriter, "writeKerning", recordWrite("kerning"))
+
+    kerning = await writableTestFont.getKerning()
+    await writableTestFont.putKerning(kerning)
+    # Only UFOs whose groups differ from the merged groups get written
+    assert all(fileName == "groups" for _, fileName in writtenFiles)
+
+    writtenFiles.clear()
+    await writableTestFont.putKerning(kerning)
+    assert [] == writtenFiles
+
+    kerning["kern"].values["A"]["J"] = [None, -25, None, None, None]
+    await writableTestFont.putKerning(kerning)
+    assert [("MutatorSansBoldCondensed.ufo", "kerning")] == writtenFiles
+
+
+glifOutlineTestData = [
+    # Closed cubic contour, with names and identifiers
+    """
+    <contour identifier="c1">
+      <point x="0" y="0" type="line" name="start"/>
+      <point x="100" y="0" type="line" identifier="p1"/>
+      <point x="150.5" y="50"/>
+      <point x="150" y="150"/>
+      <point x="100" y="200" type="curve" smooth="yes"/>
+      <point x="0" y="200"/>
+    </contour>
+    """,
+    # Open contour
+    """
+    <contour>
+      <point x="0" y="0" type="move"/>
+      <point x="100" y="0"/>
+      <point x="100" y="100" type="qcurve"/>
+      <point x="0" y="100" type="line"/>
+    </contour>
+    """,
+    # Quadratic off-curve points wrapping around the start of the contour
+    """
+    <contour>
+      <point x="0" y="0" type="qcurve"/>
+      <point x="100" y="0" type="line"/>
+      <point x="100" y="100"/>
+      <point x="0" y="100"/>
+    </contour>
+    """,
+    # Contour without on-curve points, and an empty contour
+    """
+    <contour>
+      <point x="0" y="0"/>
+      <point x="100" y="0"/>
+      <point x="100" y="100"/>
+    </contour>
+    <contour>
+    </contour>
+    """,
+    # Components
+    """
+    <component base="A"/>
+    <component base="B" xScale="0.5" yScale="-1" xOffset="10" yOffset="20.5"/>
+    """,
+    # An empty outline
+    "",
+]
+
+
+@pytest.mark.parametrize("outline", glifOutlineTestData)
+@pytest.mark.parametrize("formatVersion", [1, 2])
+def test_splitGLIFOutline(outline, formatVersion):
+    glifData = f"""<?xml version='1.0' encoding='UTF-8'?>
+    <glyph name="test" format="{formatVersion}">
+      <advance width="500"/>
+      <unicode hex="0041"/>
+      <outline>{outline}</outline>
+      <lib>
+        <dict>
+          <key>test</key>
+          <string>&lt;outline&gt;</string>
+        </dict>
+      </lib>
+    </glyph>
+    """.encode()
+
+    expectedGlyph = UFOGlyph()
+    pen = PackedPathPointPen()
+    readGlyphFromString(glifData, expectedGlyph, pen, validate=False)
+
+    splitData = splitGLIFOutline(glifData)
+    if formatVersion == 1:
+        assert splitData is None
+        return
+    assert splitData is not None
+
+    glifDataWithoutOutline, path, components = splitData
+    glyph = UFOGlyph()
+    readGlyphFromString(glifDataWithoutOutline, glyph, validate=False)
+    assert expectedGlyph == glyph
+    assert pen.getPath() == path
+    assert pen.components == components
+
+
 async def test_roundtrip_single_UFO(testFontSingleUFO, tmpdir):
     tmpdir = pathlib.Path(tmpdir)
     outPath = tmpdir / "roundtripped.ufo"
     outBackend = newFileSystemBackend(outPath)
-    await copyFont(testFontSingleUFO, outBackend)
+    async with aclosing(outBackend):
+        await copyFont(testFontSingleUFO, outBackend)
     reopenedBackend = getFileSystemBackend(outPath)
     assert await testFontSingleUFO.getGlyph("A") == await reopenedBackend.getGlyph("A")
     assert await testFontSingleUFO.getGlyph("Q") == await reopenedBackend.getGlyph("Q")
@@ -1018,7 +1265,8 @@ async def test_empty_layers_have_contents_plist(tmpdir, suffix, testFont):
     sources = await testFont.getSources()
 
     outBackend = newFileSystemBackend(outPath)
-    await outBackend.putSources(sources)
+    async with aclosing(outBackend):
+        await outBackend.putSources(sources)
 
     for ufoPath in tmpdir.glob("*.ufo"):
         for glyphsDir in ufoPath.glob("glyphs*"):
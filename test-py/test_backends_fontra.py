@@ -7,6 +7,7 @@ import pytest
 
 from fontra.backends import getFileSystemBackend, newFileSystemBackend
 from fontra.backends.copy import copyFont
+from fontra.backends.fontra import readGlyphDependencyIndex, writeGlyphDependencyIndex
 from fontra.core.classes import ImageType, OpenTypeFeatures
 
 dataDir = pathlib.Path(__file__).resolve().parent / "data"
@@ -159,6 +160,35 @@ async def test_findGlyphsThatUseGlyph(writableFontraFont):
         ] == await writableFontraFont.findGlyphsThatUseGlyph("A")
 
 
+async def test_glyphDependencyIndex(writableFontraFont, cacheDir):
+    async with aclosing(writableFontraFont):
+        assert ["Aacute", "Adieresis", "varcotest1"] == (
+            await writableFontraFont.findGlyphsThatUseGlyph("A")
+        )
+        indexPath = writableFontraFont.glyphDependencyIndexPath
+        assert indexPath.is_relative_to(cacheDir)
+        index = readGlyphDependencyIndex(indexPath)
+        assert ["A", "acute"] == index["Aacute^1.json"][2]
+
+        await writableFontraFont.deleteGlyph("Adieresis")
+        glyph = await writableFontraFont.getGlyph("Aacute")
+        await writableFontraFont.putGlyph("B", glyph, [ord("B")])
+
+    index = readGlyphDependencyIndex(indexPath)
+    assert "Adieresis^1.json" not in index
+    assert ["A", "acute"] == index["B^1.json"][2]
+
+    # Poison the index entry for an unchanged file, to verify that the index
+    # gets used instead of the glyph file
+    index["Aacute^1.json"][2] = ["poisoned"]
+    writeGlyphDependencyIndex(indexPath, index)
+
+    reopenedFont = getFileSystemBackend(writableFontraFont.path)
+    async with aclosing(reopenedFont):
+        assert ["Aacute"] == await reopenedFont.findGlyphsThatUseGlyph("poisoned")
+        assert ["B", "varcotest1"] == await reopenedFont.findGlyphsThatUseGlyph("A")
+
+
 async def test_getBackgroundImage(testFontraFont):
     glyph = await testFontraFont.getGlyph("C")
     bgImage = None
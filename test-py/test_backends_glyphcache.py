@@ -0,0 +1,94 @@
+import os
+import pathlib
+import shutil
+
+import pytest
+
+from fontra.backends import getFileSystemBackend
+from fontra.backends.glyphcache import (
+    PersistentGlyphCacheBackend,
+    computeSourceIdentity,
+    wrapWithPersistentGlyphCache,
+)
+from fontra.core.protocols import ReadableFontBackend, WritableFontBackend
+
+dataDir = pathlib.Path(__file__).resolve().parent / "data"
+mutatorSansDir = dataDir / "mutatorsans"
+
+
+@pytest.fixture
+def cacheDir(tmpdir, monkeypatch):
+    cacheDir = pathlib.Path(tmpdir) / "cache"
+    monkeypatch.setenv("FONTRA_CACHE_DIR", os.fspath(cacheDir))
+    return cacheDir
+
+
+@pytest.fixture
+def testFontPath(tmpdir):
+    fontPath = pathlib.Path(tmpdir) / "MutatorSans.ttf"
+    shutil.copy(mutatorSansDir / "MutatorSans.ttf", fontPath)
+    return fontPath
+
+
+class FailingBackend:
+    async def aclose(self):
+        pass
+
+    async def getGlyph(self, glyphName):
+        raise AssertionError("glyph should have been read from the cache")
+
+
+async def test_persistentGlyphCache(cacheDir, testFontPath):
+    glyphNames = ["A", "B", "nonexistent"]
+    sourceBackend = getFileSystemBackend(testFontPath)
+    expectedGlyphs = {
+        glyphName: await sourceBackend.getGlyph(glyphName) for glyphName in glyphNames
+    }
+
+    backend = wrapWithPersistentGlyphCache(sourceBackend, testFontPath)
+    assert isinstance(backend, PersistentGlyphCacheBackend)
+    assert isinstance(backend, ReadableFontBackend)
+    assert not isinstance(backend, WritableFontBackend)
+    assert expectedGlyphs["A"] == await backend.getGlyph("A")
+    assert expectedGlyphs == await backend.getGlyphs(glyphNames)
+    assert (backend.numHits, backend.numMisses) == (1, 3)
+    await backend.aclose()
+
+    # A new instance, as after a server restart, doesn't need the source backend
+    backend = wrapWithPersistentGlyphCache(
+        getFileSystemBackend(testFontPath), testFontPath
+    )
+    backend.backend = FailingBackend()
+    assert expectedGlyphs == await backend.getGlyphs(glyphNames)
+    assert (backend.numHits, backend.numMisses) == (3, 0)
+    await backend.aclose()
+
+    # Changing the source file invalidates the cache
+    st = testFontPath.stat()
+    os.utime(testFontPath, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    backend = wrapWithPersistentGlyphCache(
+        getFileSystemBackend(testFontPath), testFontPath
+    )
+    assert expectedGlyphs["A"] == await backend.getGlyph("A")
+    assert (backend.numHits, backend.numMisses) == (0, 1)
+    await backend.aclose()
+
+
+def test_wrapWithPersistentGlyphCache_writable(cacheDir):
+    backend = getFileSystemBackend(mutatorSansDir / "MutatorSans.designspace")
+    assert wrapWithPersistentGlyphCache(backend, "MutatorSans.designspace") is backend
+
+
+def test_computeSourceIdentity_workflow(tmpdir):
+    tmpdir = pathlib.Path(tmpdir)
+    shutil.copytree(mutatorSansDir, tmpdir / "mutatorsans")
+    workflowPath = tmpdir / "mutatorsans" / "MutatorSans_workflow.yaml"
+    identity = computeSourceIdentity(workflowPath)
+    assert identity == computeSourceIdentity(workflowPath)
+
+    # The workflow reads a designspace file, which reads the UFOs
+    glifPath = (
+        tmpdir / "mutatorsans" / "MutatorSansLightWide.ufo" / "glyphs" / "A_.glif"
+    )
+    glifPath.write_text(glifPath.read_text() + "\n")
+    assert identity != computeSourceIdentity(workflowPath)
@@ -5,7 +5,9 @@ from copy import deepcopy
 import pytest
 
 from fontra.core.changes import (
+    MatchPatternIndex,
     applyChange,
+    collectAssignmentTargets,
     collectChangePaths,
     filterChangePattern,
     matchChangePattern,
@@ -14,6 +16,8 @@ from fontra.core.changes import (
     patternIntersect,
     patternUnion,
 )
+from fontra.core.classes import Layer, StaticGlyph, VariableGlyph
+from fontra.core.path import PackedPath
 
 
 def getTestData(fileName):
@@ -45,6 +49,37 @@ def test_applyChange(testName, inputDataName, change, expectedData):
     assert subject == expectedData
 
 
+def test_applyChange_childChanges():
+    # Child changes that take the fast path, and ones that need an item cast
+    path = PackedPath(coordinates=[0, 0, 10, 10, 20, 20])
+    glyph = VariableGlyph(
+        name="A", layers={"default": Layer(glyph=StaticGlyph(path=path))}
+    )
+    applyChange(
+        glyph,
+        {
+            "c": [
+                {
+                    "p": ["layers", "default", "glyph", "path"],
+                    "c": [{"f": "=xy", "a": [0, 1, 2]}, {"f": "=xy", "a": [2, 5, 6]}],
+                },
+                {
+                    "p": ["layers", "default", "glyph", "path", "coordinates"],
+                    "c": [{"f": "=", "a": [2, 11]}, {"f": ":", "a": [3, 1, 12, 13]}],
+                },
+                {
+                    "p": ["layers"],
+                    "c": [{"f": "=", "a": ["new", {"glyph": {"xAdvance": 500}}]}],
+                },
+                {"p": ["customData"], "c": [{"f": "=", "a": ["key", "value"]}]},
+            ]
+        },
+    )
+    assert [1, 2, 11, 12, 13, 5, 6] == path.coordinates
+    assert Layer(glyph=StaticGlyph(xAdvance=500)) == glyph.layers["new"]
+    assert {"key": "value"} == glyph.customData
+
+
 @pytest.mark.parametrize(
     "patternA, path, expectedPattern",
     [
@@ -175,6 +210,38 @@ def test_matchChangePattern(change, pattern, expectedResult):
     assert expectedResult == result
 
 
+def test_matchPatternIndex():
+    testData = getTestData("match-change-pattern-test-data.json")
+    index = MatchPatternIndex()
+    for i, (_, pattern, _) in enumerate(testData):
+        index.setPattern(i, pattern)
+    for change, _, _ in testData:
+        expectedSubscribers = {
+            i
+            for i, (_, pattern, _) in enumerate(testData)
+            if matchChangePattern(change, pattern)
+        }
+        assert expectedSubscribers == index.match(change)
+
+    for i in range(len(testData)):
+        index.setPattern(i, {})
+    assert {} == index._root.children
+    assert not index._patterns
+
+
+def test_matchPatternIndex_setPattern():
+    index = MatchPatternIndex()
+    change = {"p": ["glyphs", "A"], "f": "=", "a": ["xAdvance", 500]}
+    index.setPattern("a", {"glyphs": {"A": None}})
+    index.setPattern("b", {"glyphs": {"B": None}})
+    assert {"a"} == index.match(change)
+    index.setPattern("b", {"glyphs": {"A": {"xAdvance": None}}})
+    assert {"a", "b"} == index.match(change)
+    index.setPattern("a", {"glyphs": {"B": None}})
+    assert {"b"} == index.match(change)
+    assert {"glyphs": {"B": None}} == index.getPattern("a")
+
+
 @pytest.mark.parametrize(
     "change, pattern, inverse, expectedResult",
     getTestData("filter-change-pattern-test-data.json"),
@@ -206,3 +273,31 @@ def test_collectChangePaths(change, depth, expectedPaths):
 def test_patternFromPath(path, expectedPattern):
     pattern = patternFromPath(path)
     assert expectedPattern == pattern
+
+
+@pytest.mark.parametrize(
+    "change, expectedTargets",
+    [
+        ({}, set()),
+        ({"p": ["a"], "f": "=", "a": ["b", 1]}, {(("a",), "b")}),
+        (
+            {
+                "p": ["glyphs", "A"],
+                "c": [
+                    {"p": ["path"], "f": "=xy", "a": [3, 10, 20]},
+                    {"p": ["path"], "f": "=xy", "a": [4, 10, 20]},
+                    {"f": "=", "a": ["xAdvance", 500]},
+                ],
+            },
+            {
+                (("glyphs", "A", "path"), 3),
+                (("glyphs", "A", "path"), 4),
+                (("glyphs", "A"), "xAdvance"),
+            },
+        ),
+        ({"p": ["a"], "f": "+", "a": [0, 1]}, None),
+        ({"c": [{"f": "=", "a": ["x", 1]}, {"f": "d", "a": ["y"]}]}, None),
+    ],
+)
+def test_collectAssignmentTargets(change, expectedTargets):
+    assert expectedTargets == collectAssignmentTargets(change)
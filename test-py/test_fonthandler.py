@@ -7,7 +7,14 @@ from contextlib import aclosing
 import pytest
 
 from fontra.backends.designspace import DesignspaceBackend
-from fontra.core.fonthandler import FontHandler
+from fontra.core.classes import unstructure
+from fontra.core.fonthandler import (
+    ChangeBroadcastQueue,
+    FontHandler,
+    estimateGlyphSize,
+    makeReloadPattern,
+    packGlyphMapCodePoints,
+)
 
 mutatorSansDir = pathlib.Path(__file__).resolve().parent / "data" / "mutatorsans"
 
@@ -23,6 +30,15 @@ mutatorFiles = [
 ]
 
 
+def _copyTestFont(dirPath):
+    for fn in mutatorFiles:
+        if (mutatorSansDir / fn).is_dir():
+            shutil.copytree(mutatorSansDir / fn, dirPath / fn)
+        else:
+            shutil.copy(mutatorSansDir / fn, dirPath / fn)
+    return dirPath / dsFileName
+
+
 @pytest.fixture(scope="session")
 def testFontPath(tmp_path_factory):
     tmpDir = tmp_path_factory.mktemp("font")
@@ -55,6 +71,210 @@ async def test_fontHandler_basic(testFontHandler):
     assert 20 == layer.glyph.path.coordinates[0]
 
 
+@pytest.mark.asyncio
+async def test_fontHandler_getGlyphs(testFontHandler):
+    async with aclosing(testFontHandler):
+        await testFontHandler.startTasks()
+        glyphA = await testFontHandler.getGlyph("A", connection=None)
+        glyphs = await testFontHandler.getGlyphs(
+            ["B", "A", "does-not-exist"], connection=None
+        )
+
+    assert ["B", "A", "does-not-exist"] == list(glyphs)
+    assert glyphs["A"] is glyphA
+    assert "B" == glyphs["B"].name
+    assert glyphs["does-not-exist"] is None
+    assert glyphs["B"] is testFontHandler.localData[("glyphs", "B")]
+
+
+@pytest.mark.asyncio
+async def test_fontHandler_getGlyphs_withRevisions(testFontHandler):
+    async with aclosing(testFontHandler):
+        await testFontHandler.startTasks()
+        responses = await testFontHandler.getGlyphs(
+            ["A", "does-not-exist"], True, connection=None
+        )
+        assert responses["A"] == await testFontHandler.getGlyph("A", "")
+        assert {"revision": None, "glyph": None} == responses["does-not-exist"]
+
+
+class FakeClientProxy:
+    def __init__(self):
+        self.receivedChanges = []
+        self.reloadPatterns = []
+        self.messages = []
+        self.proceedEvent = asyncio.Event()
+
+    async def externalChange(self, change, isLiveChange):
+        self.receivedChanges.append((change, isLiveChange))
+        # Until proceedEvent is set, the connection's send queue is full
+        await self.proceedEvent.wait()
+
+    async def reloadData(self, reloadPattern):
+        self.reloadPatterns.append(reloadPattern)
+
+    async def messageFromServer(self, headline, msg):
+        self.messages.append(headline)
+
+
+class FakeConnection:
+    def __init__(self, clientUUID=None):
+        self.clientUUID = clientUUID
+        self.proxy = FakeClientProxy()
+
+    async def sendMethodCall(self, methodName, *args):
+        await getattr(self.proxy, methodName)(*args)
+        returnFuture = asyncio.get_running_loop().create_future()
+        returnFuture.set_result(None)
+        return returnFuture
+
+
+def _makeDragChange(x):
+    return {"p": ["glyphs", "A", "path"], "f": "=xy", "a": [0, x, 0]}
+
+
+async def test_changeBroadcastQueue():
+    connection = FakeConnection()
+    queue = ChangeBroadcastQueue(connection=connection, frameWindow=0)
+    queue.push(_makeDragChange(1), True)
+    await asyncio.sleep(0)  # the first change is now being sent
+    queue.push(_makeDragChange(2), True)
+    queue.push(_makeDragChange(3), True)  # replaces the previous one
+    queue.push({"p": ["glyphs", "A", "path"], "f": "+", "a": []}, True)
+    queue.push(_makeDragChange(4), True)
+    queue.push(_makeDragChange(5), False)  # drops the previous one
+    queue.push(_makeDragChange(6), True)
+    assert 1 == queue.numCoalesced
+    assert 1 == queue.numDropped
+    connection.proxy.proceedEvent.set()
+    while queue.pending:
+        await asyncio.sleep(0)
+    await asyncio.sleep(0)
+
+    assert [
+        (_makeDragChange(1), True),
+        (_makeDragChange(3), True),
+        ({"p": ["glyphs", "A", "path"], "f": "+", "a": []}, True),
+        (_makeDragChange(5), False),
+        (_makeDragChange(6), True),
+    ] == connection.proxy.receivedChanges
+
+
+async def test_changeBroadcastQueue_resync():
+    connection = FakeConnection()
+    queue = ChangeBroadcastQueue(connection=connection, frameWindow=0, maxPending=2)
+    queue.push(_makeDragChange(1), False)
+    await asyncio.sleep(0)  # the first change is now being sent
+    queue.push(_makeDragChange(2), False)
+    queue.push({"p": ["glyphs", "B", "path"], "f": "+", "a": []}, False)
+    queue.push({"p": ["glyphs"], "f": "d", "a": ["C"]}, False)  # too many
+    queue.push({"p": ["glyphs", "D", "path"], "f": "+", "a": []}, False)
+    assert 1 == queue.numResyncs
+    assert 4 == queue.numDropped
+    connection.proxy.proceedEvent.set()
+    while queue.pending or queue.reloadPattern is not None:
+        await asyncio.sleep(0)
+    await asyncio.sleep(0)
+
+    assert [(_makeDragChange(1), False)] == connection.proxy.receivedChanges
+    assert [
+        {"glyphs": {"A": None, "B": None, "C": None, "D": None}}
+    ] == connection.proxy.reloadPatterns
+
+
+@pytest.mark.parametrize(
+    "change, expectedPattern",
+    [
+        (
+            {"p": ["glyphs", "A", "path"], "f": "=xy", "a": [0, 1, 2]},
+            {"glyphs": {"A": None}},
+        ),
+        ({"p": ["glyphs"], "f": "=", "a": ["A", {}]}, {"glyphs": {"A": None}}),
+        (
+            {
+                "c": [
+                    {"p": ["glyphs", "A"], "c": []},
+                    {"p": ["sources"], "f": "d", "a": ["x"]},
+                ]
+            },
+            {"sources": None},
+        ),
+        ({"p": [], "f": "=", "a": ["axes", {}]}, {"axes": None}),
+        ({"p": ["glyphs"], "f": "=", "a": []}, None),
+        ({"p": [], "c": [{"p": ["glyphs"], "f": "-", "a": []}]}, None),
+    ],
+)
+def test_makeReloadPattern(change, expectedPattern):
+    assert expectedPattern == makeReloadPattern(change)
+
+
+async def test_fontHandler_singleFlightLoading(testFontHandler):
+    backend = testFontHandler.backend
+    loadedGlyphNames = []
+    loadedKeys = []
+
+    originalGetGlyph = backend.getGlyph
+    originalGetAxes = backend.getAxes
+
+    async def getGlyph(glyphName):
+        loadedGlyphNames.append(glyphName)
+        await asyncio.sleep(0.01)
+        return await originalGetGlyph(glyphName)
+
+    async def getAxes():
+        loadedKeys.append("axes")
+        await asyncio.sleep(0.01)
+        return await originalGetAxes()
+
+    backend.getGlyph = getGlyph
+    backend.getAxes = getAxes
+
+    async with aclosing(testFontHandler):
+        await testFontHandler.startTasks()
+        results = await asyncio.gather(
+            testFontHandler.getGlyph("A", connection=None),
+            testFontHandler.getGlyph("A", connection=None),
+            testFontHandler.getGlyphs(["A", "B"], connection=None),
+            testFontHandler.getGlyphs(["B", "C"], connection=None),
+            testFontHandler.getData("axes"),
+            testFontHandler.getData("axes"),
+        )
+
+    glyphA = results[0]
+    assert glyphA is results[1]
+    assert glyphA is results[2]["A"]
+    assert results[2]["B"] is results[3]["B"]
+    assert results[4] is results[5]
+    assert ["A", "B", "C"] == sorted(loadedGlyphNames)
+    assert ["axes"] == loadedKeys
+    assert glyphA is testFontHandler.localData[("glyphs", "A")]
+    assert not testFontHandler._loadTasks
+
+
+async def test_fontHandler_broadcastChange(testFontHandler):
+    connections = [FakeConnection(clientUUID) for clientUUID in "abcd"]
+    for connection in connections:
+        connection.proxy.proceedEvent.set()
+        testFontHandler.connections.add(connection)
+    connA, connB, connC, connD = connections
+
+    await testFontHandler.subscribeChanges(["glyphs", "A"], False, connection=connA)
+    await testFontHandler.subscribeChanges(["glyphs", "A"], True, connection=connB)
+    await testFontHandler.subscribeChanges(["glyphs"], True, connection=connC)
+    await testFontHandler.subscribeChanges(["glyphs", "A"], True, connection=connD)
+    await testFontHandler.unsubscribeChanges(["glyphs", "A"], True, connection=connD)
+
+    change = {"p": ["glyphs", "A"], "f": "=", "a": ["xAdvance", 500]}
+    await testFontHandler.broadcastChange(change, connB, True)
+    await testFontHandler.broadcastChange(change, connC, False)
+    await asyncio.sleep(0)
+
+    assert [(change, False)] == connA.proxy.receivedChanges
+    assert [(change, False)] == connB.proxy.receivedChanges
+    assert [(change, True)] == connC.proxy.receivedChanges
+    assert [] == connD.proxy.receivedChanges
+
+
 @pytest.mark.asyncio
 async def test_fontHandler_externalChange(testFontHandler):
     async with aclosing(testFontHandler):
@@ -84,6 +304,289 @@ async def test_fontHandler_externalChange(testFontHandler):
         assert -100 == layer.glyph.path.coordinates[0]
 
 
+@pytest.mark.asyncio
+async def test_fontHandler_glyphSizeAfterEdit(testFontHandler):
+    async with aclosing(testFontHandler):
+        await testFontHandler.startTasks()
+        glyph = await testFontHandler.getGlyph("A")
+        sizeBefore = testFontHandler.localData.totalSize
+        assert estimateGlyphSize(glyph) == sizeBefore
+
+        layerName, layer = firstLayerItem(glyph)
+        contour = {
+            "coordinates": [0, 0, 100, 0, 100, 100, 0, 100],
+            "pointTypes": [0, 0, 0, 0],
+            "isClosed": True,
+        }
+        change = {
+            "p": ["glyphs", "A", "layers", layerName, "glyph", "path"],
+            "f": "insertContour",
+            "a": [0, contour],
+        }
+        await testFontHandler.updateLocalDataWithExternalChange(change)
+        assert estimateGlyphSize(glyph) == testFontHandler.localData.totalSize
+        assert testFontHandler.localData.totalSize > sizeBefore
+
+
+@pytest.mark.asyncio
+async def test_fontHandler_getGlyphMapPage(testFontHandler):
+    async with aclosing(testFontHandler):
+        await testFontHandler.startTasks()
+        glyphMap = await testFontHandler.getGlyphMap(connection=None)
+        glyphMapFromPages = {}
+        for start in range(0, len(glyphMap), 10):
+            page = await testFontHandler.getGlyphMapPage(start, 10, connection=None)
+            assert len(glyphMap) == page["totalCount"]
+            for glyphName, packedCodePoints in zip(
+                page["glyphNames"], page["codePoints"], strict=True
+            ):
+                if packedCodePoints == -1:
+                    codePoints = []
+                elif isinstance(packedCodePoints, int):
+                    codePoints = [packedCodePoints]
+                else:
+                    codePoints = packedCodePoints
+                glyphMapFromPages[glyphName] = codePoints
+        assert glyphMap == glyphMapFromPages
+        assert list(glyphMap) == list(glyphMapFromPages)
+
+
+@pytest.mark.asyncio
+async def test_fontHandler_getGlyphMapPage_glyphMapChanged(testFontHandler):
+    connection = FakeConnection("a")
+    async with aclosing(testFontHandler):
+        await testFontHandler.startTasks()
+        glyphMap = await testFontHandler.getGlyphMap(connection=None)
+        originalGlyphNames = list(glyphMap)
+        page = await testFontHandler.getGlyphMapPage(0, 10, connection=connection)
+        glyphNamesFromPages = page["glyphNames"]
+        # Deleting a glyph from the first page must not shift the later pages
+        del glyphMap[originalGlyphNames[0]]
+        glyphMap["newGlyph"] = []
+        for start in range(10, page["totalCount"], 10):
+            page = await testFontHandler.getGlyphMapPage(
+                start, 10, connection=connection
+            )
+            glyphNamesFromPages += page["glyphNames"]
+        assert originalGlyphNames == glyphNamesFromPages
+
+
+def test_packGlyphMapCodePoints():
+    assert [-1, 65, [66, 98]] == packGlyphMapCodePoints([[], [65], [66, 98]])
+
+
+@pytest.mark.asyncio
+async def test_fontHandler_getGlyph_ifNotRevision(testFontHandler):
+    async with aclosing(testFontHandler):
+        await testFontHandler.startTasks()
+        response = await testFontHandler.getGlyph("A", "")
+        revision = response["revision"]
+        assert revision
+        assert response["glyph"] == await testFontHandler.getGlyph("A")
+
+        response = await testFontHandler.getGlyph("A", revision)
+        assert {"revision": revision, "unchanged": True} == response
+
+        # Reloading from the backend keeps the revision, as the glyph is the same
+        await testFontHandler.reloadData({"glyphs": {"A": None}})
+        response = await testFontHandler.getGlyph("A", revision)
+        assert {"revision": revision, "unchanged": True} == response
+
+        layerName, layer = firstLayerItem(await testFontHandler.getGlyph("A"))
+        change = {
+            "p": ["glyphs", "A", "layers", layerName, "glyph", "path"],
+            "f": "=xy",
+            "a": [0, 21, 0],
+        }
+        await testFontHandler.updateLocalDataWithExternalChange(change)
+        response = await testFontHandler.getGlyph("A", revision)
+        assert response["revision"] != revision
+        layerName, layer = firstLayerItem(response["glyph"])
+        assert [21, 0] == layer.glyph.path.coordinates[:2]
+
+        assert {"revision": None, "glyph": None} == await testFontHandler.getGlyph(
+            "A.doesnotexist", revision
+        )
+
+
+@pytest.mark.asyncio
+async def test_fontHandler_getGlyphOutline(testFontHandler):
+    async with aclosing(testFontHandler):
+        await testFontHandler.startTasks()
+        outlineCache = testFontHandler.glyphOutlineCache
+        key, outline = await outlineCache.getOutline("A", {})
+        assert outline["path"].startswith("M")
+        assert 396 == outline["xAdvance"]
+        assert 0 == outline["sourceIndex"]
+        assert outline == await testFontHandler.getGlyphOutline("A", {})
+        assert (key, outline) == await outlineCache.getOutline("A", {})
+
+        otherKey, otherOutline = await outlineCache.getOutline("A", {"weight": 500})
+        assert otherKey != key
+        assert otherOutline["sourceIndex"] is None
+
+        # Editing a component base glyph changes the outline of the composite
+        keyAacute, outlineAacute = await outlineCache.getOutline("Aacute", {})
+        layerName, layer = firstLayerItem(await testFontHandler.getGlyph("A"))
+        change = {
+            "p": ["glyphs", "A", "layers", layerName, "glyph", "path"],
+            "f": "=xy",
+            "a": [0, 21, 0],
+        }
+        await testFontHandler.updateLocalDataWithExternalChange(change)
+        newKey, newOutline = await outlineCache.getOutline("A", {})
+        assert newKey != key
+        assert newOutline["path"] != outline["path"]
+        newKeyAacute, newOutlineAacute = await outlineCache.getOutline("Aacute", {})
+        assert newKeyAacute != keyAacute
+        assert newOutlineAacute["path"] != outlineAacute["path"]
+
+        assert await outlineCache.getOutline("A.doesnotexist", {}) is None
+
+
+@pytest.mark.asyncio
+async def test_fontHandler_changeJournal(tmpdir):
+    tmpdir = pathlib.Path(tmpdir)
+    fontPath = _copyTestFont(tmpdir)
+    journalPath = tmpdir / "journal" / "change-journal.jsonl"
+
+    # Simulate a crash while a glyph write is still pending
+    backend = DesignspaceBackend.fromPath(fontPath)
+    writeCanProceed = asyncio.Event()
+
+    async def blockedPutGlyph(*args, **kwargs):
+        await writeCanProceed.wait()
+
+    backend.putGlyph = blockedPutGlyph
+    fontHandler = FontHandler(backend, changeJournalPath=journalPath)
+    await fontHandler.startTasks()
+    layerName, layer = firstLayerItem(await fontHandler.getGlyph("A"))
+    change = {
+        "p": ["glyphs", "A", "layers", layerName, "glyph", "path"],
+        "f": "=xy",
+        "a": [0, 21, 0],
+    }
+    await fontHandler.updateLocalDataAndWriteToBackend(change, None)
+    fontHandler.changeJournal.sync()
+    journalItems = fontHandler.changeJournal.readItems()
+    assert [("glyphs", "A")] == list(journalItems)
+    assert unstructure(await fontHandler.getGlyph("A")) == journalItems["glyphs", "A"]
+    fontHandler._processWritesTask.cancel()
+    fontHandler.changeJournal.close()
+    await backend.aclose()
+
+    # A new FontHandler restores the glyph, and writes it to the backend
+    fontHandler = FontHandler(
+        DesignspaceBackend.fromPath(fontPath), changeJournalPath=journalPath
+    )
+    async with aclosing(fontHandler):
+        await fontHandler.startTasks()
+        layer = (await fontHandler.getGlyph("A")).layers[layerName]
+        assert [21, 0] == layer.glyph.path.coordinates[:2]
+        await fontHandler.finishWriting()
+        assert not journalPath.exists()
+
+    layer = (await DesignspaceBackend.fromPath(fontPath).getGlyph("A")).layers[
+        layerName
+    ]
+    assert [21, 0] == layer.glyph.path.coordinates[:2]
+
+    # Edits that are written don't leave a journal behind
+    fontHandler = FontHandler(
+        DesignspaceBackend.fromPath(fontPath), changeJournalPath=journalPath
+    )
+    async with aclosing(fontHandler):
+        await fontHandler.startTasks()
+        change["a"] = [0, 20, 0]
+        await fontHandler.updateLocalDataAndWriteToBackend(change, None)
+        await fontHandler.finishWriting()
+        assert not journalPath.exists()
+
+
+@pytest.mark.asyncio
+async def test_fontHandler_changeJournal_crashDuringBatch(tmpdir):
+    tmpdir = pathlib.Path(tmpdir)
+    fontPath = _copyTestFont(tmpdir)
+    journalPath = tmpdir / "journal" / "change-journal.jsonl"
+
+    def contourCounts(glyph):
+        return {
+            layerName: len(layer.glyph.path.contourInfo)
+            for layerName, layer in glyph.layers.items()
+        }
+
+    def makeInsertContourChange(glyphName, glyph):
+        contour = {
+            "coordinates": [0, 0, 100, 0, 100, 100, 0, 100],
+            "pointTypes": [0, 0, 0, 0],
+            "isClosed": True,
+        }
+        return {
+            "p": ["glyphs", glyphName, "layers"],
+            "c": [
+                {
+                    "p": [layerName, "glyph", "path"],
+                    "f": "insertContour",
+                    "a": [0, contour],
+                }
+                for layerName in glyph.layers
+            ],
+        }
+
+    # Simulate a crash after "A" was written, but before "B" of the same batch
+    backend = DesignspaceBackend.fromPath(fontPath)
+    originalPutGlyph = backend.putGlyph
+    writingB = asyncio.Event()
+
+    async def crashingPutGlyph(glyphName, glyph, codePoints):
+        if glyphName == "B":
+            writingB.set()
+            await asyncio.Event().wait()  # never returns
+        await originalPutGlyph(glyphName, glyph, codePoints)
+
+    backend.putGlyph = crashingPutGlyph
+    fontHandler = FontHandler(backend, changeJournalPath=journalPath)
+    await fontHandler.startTasks()
+    glyphA = await fontHandler.getGlyph("A")
+    glyphB = await fontHandler.getGlyph("B")
+    expectedCountsA = {
+        layerName: count + 1 for layerName, count in contourCounts(glyphA).items()
+    }
+    expectedCountsB = {
+        layerName: count + 1 for layerName, count in contourCounts(glyphB).items()
+    }
+    change = {
+        "c": [
+            makeInsertContourChange("A", glyphA),
+            makeInsertContourChange("B", glyphB),
+        ],
+    }
+    await fontHandler.updateLocalDataAndWriteToBackend(change, None)
+    await writingB.wait()
+    fontHandler.changeJournal.sync()
+    fontHandler._processWritesTask.cancel()
+    fontHandler.changeJournal.close()
+    await backend.aclose()
+
+    writtenGlyphA = await DesignspaceBackend.fromPath(fontPath).getGlyph("A")
+    assert expectedCountsA == contourCounts(writtenGlyphA)
+
+    # Restoring the journal must not insert the contour into "A" a second time
+    fontHandler = FontHandler(
+        DesignspaceBackend.fromPath(fontPath), changeJournalPath=journalPath
+    )
+    async with aclosing(fontHandler):
+        await fontHandler.startTasks()
+        assert expectedCountsA == contourCounts(await fontHandler.getGlyph("A"))
+        assert expectedCountsB == contourCounts(await fontHandler.getGlyph("B"))
+        await fontHandler.finishWriting()
+        assert not journalPath.exists()
+
+    reopenedBackend = DesignspaceBackend.fromPath(fontPath)
+    assert expectedCountsA == contourCounts(await reopenedBackend.getGlyph("A"))
+    assert expectedCountsB == contourCounts(await reopenedBackend.getGlyph("B"))
+
+
 @pytest.mark.asyncio
 async def test_fontHandler_editGlyph(testFontHandler):
     async with aclosing(testFontHandler):
@@ -125,6 +628,106 @@ async def test_fontHandler_editGlyph(testFontHandler):
     await asyncio.sleep(0)
 
 
+@pytest.mark.asyncio
+async def test_fontHandler_editGlyphs_batched(testFontHandler, caplog):
+    caplog.set_level(logging.INFO)
+    async with aclosing(testFontHandler):
+        await testFontHandler.startTasks()
+        glyphA = await testFontHandler.getGlyph("A", connection=None)
+        await testFontHandler.getGlyph("B", connection=None)
+        newGlyphs = {}
+        for glyphName in ["A.alt1", "A.alt2"]:
+            newGlyph = unstructure(glyphA)
+            newGlyph["name"] = glyphName
+            newGlyphs[glyphName] = newGlyph
+
+        change = {
+            "p": ["glyphs"],
+            "c": [
+                {"f": "=", "a": [glyphName, newGlyph]}
+                for glyphName, newGlyph in newGlyphs.items()
+            ]
+            + [
+                {"p": [glyphName], "f": "=", "a": ["name", glyphName]}
+                for glyphName in ["A", "B"]
+            ],
+        }
+        rollbackChange = {}  # dummy
+
+        await testFontHandler.editFinal(
+            change, rollbackChange, "Test edit", False, connection=None
+        )
+        await testFontHandler.finishWriting()
+
+        dsDoc = testFontHandler.backend.dsDoc
+        ufoPath = pathlib.Path(dsDoc.sources[0].path)
+        contents = (ufoPath / "glyphs" / "contents.plist").read_text()
+        for glyphName in newGlyphs:
+            assert f"<key>{glyphName}</key>" in contents
+
+    assert ["write 4 glyphs to backend"] == [
+        r.message for r in caplog.records if r.message.startswith("write ")
+    ]
+
+
+@pytest.mark.asyncio
+async def test_fontHandler_editGlyphs_batchError(tmpdir):
+    fontPath = _copyTestFont(pathlib.Path(tmpdir))
+    backend = DesignspaceBackend.fromPath(fontPath)
+    originalPutGlyph = backend.putGlyph
+    proceedWriting = asyncio.Event()
+
+    async def failingPutGlyph(glyphName, glyph, codePoints):
+        if glyphName == "E":
+            # Hold up the writes, so the next edits are written as a batch
+            await proceedWriting.wait()
+        elif glyphName == "B":
+            raise ValueError("can't write B")
+        await originalPutGlyph(glyphName, glyph, codePoints)
+
+    backend.putGlyph = failingPutGlyph
+    fontHandler = FontHandler(backend)
+    connA, connB = FakeConnection("a"), FakeConnection("b")
+
+    async with aclosing(fontHandler):
+        await fontHandler.startTasks()
+        for connection in [connA, connB]:
+            connection.proxy.proceedEvent.set()
+            fontHandler.connections.add(connection)
+            await fontHandler.subscribeChanges(
+                {"glyphs": None}, False, connection=connection
+            )
+        edits = [("E", connA), ("A", connA), ("B", connB), ("C", connA)]
+        for glyphName, connection in edits:
+            glyph = await fontHandler.getGlyph(glyphName, connection=None)
+            layerName, _ = firstLayerItem(glyph)
+            change = {
+                "p": ["glyphs", glyphName, "layers", layerName, "glyph"],
+                "f": "=",
+                "a": ["xAdvance", 777],
+            }
+            await fontHandler.editFinal(
+                change, {}, "Test edit", False, connection=connection
+            )
+        assert ["A", "B", "C"] == [
+            glyphName for _, glyphName in fontHandler._dataScheduledForWriting
+        ]
+        proceedWriting.set()
+        await fontHandler.finishWriting()
+
+        ufoPath = pathlib.Path(backend.dsDoc.sources[0].path)
+        for glifFileName in ["E_.glif", "A_.glif", "C_.glif"]:
+            glifData = (ufoPath / "glyphs" / glifFileName).read_text()
+            assert """<advance width="777"/>""" in glifData
+        glyphB = await fontHandler.getGlyph("B", connection=None)
+        _, layerB = firstLayerItem(glyphB)
+        assert 777 != layerB.glyph.xAdvance
+
+    assert [] == connA.proxy.messages
+    assert ["The data could not be saved due to an error."] == connB.proxy.messages
+    assert [{"glyphs": {"B": None}}] == connB.proxy.reloadPatterns
+
+
 @pytest.mark.asyncio
 async def test_fontHandler_editGlyph_delete_layer(testFontHandler):
     async with aclosing(testFontHandler):
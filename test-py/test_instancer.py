@@ -699,6 +699,17 @@ async def test_anchorInterpolation(instancer):
     _ = glyphInstancer.instantiate({"Weight": 400})
 
 
+async def test_sharedVariationModel(instancer):
+    glyphInstancerA = await instancer.getGlyphInstancer("A")
+    glyphInstancerC = await instancer.getGlyphInstancer("C")
+    glyphInstancerB = await instancer.getGlyphInstancer("B")
+    # A and C have the same source locations, B has an extra source
+    assert glyphInstancerA.model is glyphInstancerC.model
+    assert glyphInstancerA.model is not glyphInstancerB.model
+    _ = glyphInstancerA.instantiate({"weight": 400})
+    _ = glyphInstancerC.instantiate({"weight": 400})
+
+
 testData_FontSourcesInstancer = [
     (
         {},
@@ -1,4 +1,4 @@
-from fontra.core.lrucache import LRUCache
+from fontra.core.lrucache import LRUCache, SizedLRUCache
 
 
 def test_lruCache():
@@ -19,3 +19,66 @@ def test_lruCache():
     _ = cache["a"]
     cache["f"] = None
     assert ["c", "e", "a", "f"] == list(cache.keys())
+
+
+def test_sizedLRUCache():
+    cache = SizedLRUCache(10, len, isPinnedKey=lambda key: key.startswith("pinned"))
+    cache["pinned"] = "xxxxxxxxxxxxxxxxxxxx"
+    assert 0 == cache.totalSize
+    cache["a"] = "aaaa"
+    cache["b"] = "bbbb"
+    assert 8 == cache.totalSize
+    _ = cache["a"]
+    cache["c"] = "cc"
+    assert ["pinned", "b", "a", "c"] == list(cache.keys())
+    assert 10 == cache.totalSize
+    cache["d"] = "d"
+    assert ["pinned", "a", "c", "d"] == list(cache.keys())
+    assert 7 == cache.totalSize
+    assert 1 == cache.evictions
+    cache["e"] = "eeeeeeeeeeee"
+    assert ["pinned", "e"] == list(cache.keys())
+    assert 12 == cache.totalSize
+    assert 4 == cache.evictions
+    assert cache.get("a") is None
+    assert "eeeeeeeeeeee" == cache.get("e")
+    assert 1 == cache.misses
+    assert 1 == cache.hits
+    assert "eeeeeeeeeeee" == cache.pop("e")
+    assert 0 == cache.totalSize
+    cache["f"] = "ff"
+    cache.clear()
+    assert 0 == cache.totalSize
+    assert [] == list(cache.keys())
+
+
+def test_sizedLRUCache_updateItemSize():
+    cache = SizedLRUCache(10, len)
+    cache["a"] = ["a"] * 4
+    cache["b"] = ["b"] * 4
+    assert 8 == cache.totalSize
+    cache["a"].extend(["a"] * 2)
+    cache.updateItemSize("a")
+    assert ["b", "a"] == list(cache.keys())
+    assert 10 == cache.totalSize
+    cache["b"].extend(["b"] * 2)
+    cache.updateItemSize("b")
+    assert ["b"] == list(cache.keys())
+    assert 6 == cache.totalSize
+    assert 1 == cache.evictions
+    cache.updateItemSize("does-not-exist")
+    assert 6 == cache.totalSize
+
+
+def test_sizedLRUCache_mutators():
+    cache = SizedLRUCache(10, len)
+    cache.update({"a": "aaa"}, b="bbb")
+    assert 6 == cache.totalSize
+    assert "ccc" == cache.setdefault("c", "ccc")
+    assert "ccc" == cache.setdefault("c", "cccc")
+    assert 9 == cache.totalSize
+    cache |= {"d": "dd"}
+    assert ["b", "c", "d"] == list(cache.keys())
+    assert 8 == cache.totalSize
+    assert ("d", "dd") == cache.popitem()
+    assert 6 == cache.totalSize
@@ -0,0 +1,69 @@
+import pytest
+
+from fontra.core.messagecodec import (
+    JSONMessageCodec,
+    MessagePackMessageCodec,
+    negotiateMessageCodec,
+)
+
+testMessages = [
+    {"client-call-id": 1, "method-name": "getGlyph", "arguments": ["A"]},
+    {
+        "client-call-id": 2,
+        "return-value": {
+            "name": "A",
+            "layers": {
+                "default": {
+                    "glyph": {
+                        "path": {
+                            "coordinates": [0, 0, 100.5, 200, 0.1, -3],
+                            "pointTypes": [0, 8, 0],
+                            "contourInfo": [{"endPoint": 2, "isClosed": True}],
+                        },
+                        "xAdvance": 500,
+                    }
+                }
+            },
+        },
+    },
+    {"server-call-id": 3, "arguments": [{"coordinates": "not an array"}, None]},
+    {"unicode": "é中😀", "coordinates": [], "pointTypes": [300]},
+]
+
+
+@pytest.mark.parametrize("message", testMessages)
+@pytest.mark.parametrize("codec", [JSONMessageCodec(), MessagePackMessageCodec()])
+def test_messageCodecRoundTrip(codec, message):
+    assert message == codec.decode(codec.encode(message))
+
+
+def test_messagePackTypedArrays():
+    codec = MessagePackMessageCodec()
+    coordinates = [float(i) for i in range(1000)]
+    path = {"coordinates": coordinates, "pointTypes": [], "contourInfo": []}
+    data = codec.encode(path)
+    # float32 values are packed as 4 bytes, where a MessagePack float would
+    # take 9 bytes
+    assert len(data) < 4 * len(coordinates) + 50
+
+
+def test_messagePackTypedArraysOnlyForPackedPaths():
+    codec = MessagePackMessageCodec()
+    customData = {"coordinates": [1.5, 2.5], "pointTypes": [1, 2]}
+    data = codec.encode({"customData": customData})
+    assert b"\xd7" not in data  # no fixext 8
+    assert {"customData": customData} == codec.decode(data)
+
+
+@pytest.mark.parametrize(
+    "requestedEncodings, expectedEncoding",
+    [
+        ([], "json"),
+        (["json"], "json"),
+        (["msgpack", "json"], "msgpack"),
+        (["unknown", "msgpack"], "msgpack"),
+        (["unknown"], "json"),
+    ],
+)
+def test_negotiateMessageCodec(requestedEncodings, expectedEncoding):
+    assert expectedEncoding == negotiateMessageCodec(requestedEncodings).name
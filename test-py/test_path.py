@@ -154,7 +154,8 @@ def test_pathConversion(path):
     assert packedPath == packedPath2
 
 
-expectedPackedPathRepr = "PackedPath(coordinates=[232, -10, 338, -10, 403, 38, 403, 182, \
+expectedPackedPathRepr = (
+    "PackedPath(coordinates=[232, -10, 338, -10, 403, 38, 403, 182, \
 403, 700, 363, 700, 363, 182, 363, 60, 313, 26, 232, 26, 151, 26, 100, 60, 100, 182, \
 100, 280, 60, 280, 60, 182, 60, 38, 124, -10], pointTypes=[<PointType.ON_CURVE_SMOOTH: \
 8>, <PointType.OFF_CURVE_CUBIC: 2>, <PointType.OFF_CURVE_CUBIC: 2>, \
@@ -166,6 +167,7 @@ expectedPackedPathRepr = "PackedPath(coordinates=[232, -10, 338, -10, 403, 38, 4
 <PointType.ON_CURVE_SMOOTH: 8>, <PointType.OFF_CURVE_CUBIC: 2>, \
 <PointType.OFF_CURVE_CUBIC: 2>], contourInfo=[ContourInfo(endPoint=17, isClosed=True)], \
 pointAttributes=None)"
+)
 
 
 def test_packedPathRepr():
@@ -174,7 +176,8 @@ def test_packedPathRepr():
     assert expectedPackedPathRepr == str(packedPath)
 
 
-expectedPathRepr = "Path(contours=[Contour(points=[{'x': 232, 'y': -10, 'smooth': True}, \
+expectedPathRepr = (
+    "Path(contours=[Contour(points=[{'x': 232, 'y': -10, 'smooth': True}, \
 {'x': 338, 'y': -10, 'type': 'cubic'}, {'x': 403, 'y': 38, 'type': 'cubic'}, {'x': 403, \
 'y': 182, 'smooth': True}, {'x': 403, 'y': 700}, {'x': 363, 'y': 700}, {'x': 363, 'y': \
 182, 'smooth': True}, {'x': 363, 'y': 60, 'type': 'cubic'}, {'x': 313, 'y': 26, 'type': \
@@ -182,6 +185,7 @@ expectedPathRepr = "Path(contours=[Contour(points=[{'x': 232, 'y': -10, 'smooth'
 {'x': 100, 'y': 60, 'type': 'cubic'}, {'x': 100, 'y': 182, 'smooth': True}, {'x': 100, \
 'y': 280}, {'x': 60, 'y': 280}, {'x': 60, 'y': 182, 'smooth': True}, {'x': 60, 'y': 38, \
 'type': 'cubic'}, {'x': 124, 'y': -10, 'type': 'cubic'}], isClosed=True)])"
+)
 
 
 def test_pathRepr():
@@ -410,6 +414,19 @@ def test_deleteNTrailingContours():
     assert path1 == PackedPath()
 
 
+def test_packedPathDeepcopy():
+    path = pathMathPath2.asPackedPath()
+    path.insertPoint(0, 2, {"x": 100, "y": 100, "attrs": {"test": 654}})
+    pathCopy = deepcopy(path)
+    assert path == pathCopy
+    pathCopy.coordinates[0] = 1234
+    pathCopy.contourInfo[0].isClosed = not pathCopy.contourInfo[0].isClosed
+    pathCopy.pointAttributes[2]["test"] = 321
+    assert 1234 != path.coordinates[0]
+    assert pathCopy.contourInfo[0].isClosed != path.contourInfo[0].isClosed
+    assert {"test": 654} == path.pointAttributes[2]
+
+
 def test_insertPoint_deletePoint_deleteContour():
     path = pathMathPath2.asPackedPath()
     assert path.pointAttributes is None
@@ -0,0 +1,96 @@
+import asyncio
+
+import pytest
+
+from fontra.core import remote
+from fontra.core.remote import RemoteObjectConnection
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.sentMessages = []
+        self.proceedEvent = asyncio.Event()
+        self.sendError = None
+        self.closed = False
+
+    async def send_str(self, data):
+        await self.proceedEvent.wait()
+        if self.sendError is not None:
+            raise self.sendError
+        self.sentMessages.append(data)
+
+    async def close(self):
+        self.closed = True
+
+
+async def test_sendMessage_queue():
+    websocket = FakeWebSocket()
+    connection = RemoteObjectConnection(websocket, "test", None, False)
+    for i in range(5):
+        await connection.sendMessage({"message": i})
+    assert connection.maxSendQueueDepth in (4, 5)  # one may be being sent
+    websocket.proceedEvent.set()
+    while connection.numMessagesSent < 5:
+        await asyncio.sleep(0)
+    assert ['{"message": 0}', '{"message": 4}'] == websocket.sentMessages[::4]
+    connection._sendTask.cancel()
+
+
+async def test_sendMethodCall():
+    websocket = FakeWebSocket()
+    websocket.proceedEvent.set()
+    connection = RemoteObjectConnection(websocket, "test", None, False)
+    # Returns when the call is queued, not when the client responds
+    returnFuture = await connection.sendMethodCall("externalChange", {}, False)
+    assert not returnFuture.done()
+    assert [0] == list(connection.callReturnFutures)
+    while connection.numMessagesSent < 1:
+        await asyncio.sleep(0)
+    assert [
+        '{"server-call-id": 0, "method-name": "externalChange", '
+        '"arguments": [{}, false]}'
+    ] == websocket.sentMessages
+    connection._sendTask.cancel()
+
+
+async def test_sendMessage_stalledClient(monkeypatch):
+    monkeypatch.setattr(remote, "SEND_QUEUE_SIZE", 2)
+    monkeypatch.setattr(remote, "SEND_TIMEOUT", 0.01)
+    websocket = FakeWebSocket()
+    connection = RemoteObjectConnection(websocket, "test", None, False)
+    with pytest.raises(ConnectionResetError):
+        for i in range(10):
+            await connection.sendMessage({"message": i})
+    assert websocket.closed
+    assert [] == websocket.sentMessages
+    await asyncio.sleep(0.02)  # the send task times out, too
+    assert connection._sendTask.done()
+    with pytest.raises(ConnectionResetError):
+        await connection.sendMessage({"message": "more"})
+
+
+async def test_sendMessage_failedConnection(monkeypatch):
+    monkeypatch.setattr(remote, "SEND_QUEUE_SIZE", 2)
+    websocket = FakeWebSocket()
+    websocket.sendError = RuntimeError("the websocket broke")
+    connection = RemoteObjectConnection(websocket, "test", None, False)
+    callTask = asyncio.create_task(connection.callMethod("reloadData", None))
+    while not connection._sendTask or connection._sendQueue.qsize():
+        await asyncio.sleep(0)  # the call is now being sent
+    for i in range(2):
+        await connection.sendMessage({"message": i})
+    blockedSendTask = asyncio.create_task(connection.sendMessage({"message": 2}))
+    await asyncio.sleep(0)
+    assert not blockedSendTask.done()  # the queue is full
+
+    websocket.proceedEvent.set()
+    # Neither the sender waiting for room, nor the caller waiting for the
+    # client's response, are left hanging
+    with pytest.raises(ConnectionResetError):
+        await blockedSendTask
+    with pytest.raises(ConnectionResetError):
+        await callTask
+    with pytest.raises(ConnectionResetError):
+        await connection.sendMessage({"message": "more"})
+    assert [] == websocket.sentMessages
+    assert not connection.callReturnFutures
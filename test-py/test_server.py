@@ -0,0 +1,155 @@
+import pathlib
+
+import pytest
+from aiohttp.test_utils import TestClient, TestServer
+
+from fontra.core import server as serverModule
+from fontra.core.fonthandler import FontHandler
+from fontra.core.server import FontraServer, parseAcceptEncoding
+from fontra.filesystem.projectmanager import FileSystemProjectManager
+
+dataDir = pathlib.Path(__file__).resolve().parent / "data"
+
+
+@pytest.fixture
+async def testClient():
+    projectManager = FileSystemProjectManager(dataDir / "mutatorsans")
+    server = FontraServer(
+        host="localhost",
+        httpPort=0,
+        projectManager=projectManager,
+        versionToken="abcdef",
+    )
+    server.setup()
+    async with TestClient(TestServer(server.httpApp)) as client:
+        yield client
+    await projectManager.aclose()
+
+
+async def test_staticContent(testClient):
+    response = await testClient.get(
+        "/core/remote.abcdef.js", headers={"Accept-Encoding": "gzip"}
+    )
+    assert 200 == response.status
+    assert "immutable" in response.headers["Cache-Control"]
+    assert "gzip" == response.headers["Content-Encoding"]
+    etag = response.headers["ETag"]
+    body = await response.read()  # aiohttp decompresses for us
+    assert b"./msgpack.abcdef.js" in body
+
+    response = await testClient.get(
+        "/core/remote.js",
+        headers={"Accept-Encoding": "identity", "If-None-Match": etag},
+    )
+    assert 304 == response.status
+    assert "no-cache" == response.headers["Cache-Control"]
+
+    response = await testClient.get(
+        "/core/remote.js", headers={"Accept-Encoding": "identity"}
+    )
+    assert 200 == response.status
+    assert "Content-Encoding" not in response.headers
+    assert body == await response.read()
+
+    response = await testClient.get("/core/remote.000000.js")
+    assert 404 == response.status
+
+    response = await testClient.get("/core/does-not-exist.js")
+    assert 404 == response.status
+
+
+async def test_staticContent_fileChanged(testClient, tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        serverModule,
+        "getResourcePath",
+        lambda modulePath, resourceName: tmp_path / resourceName,
+    )
+    resourcePath = tmp_path / "test.txt"
+    resourcePath.write_text("before")
+    response = await testClient.get("/test.txt")
+    assert b"before" == await response.read()
+    etag = response.headers["ETag"]
+
+    resourcePath.write_text("after the edit")
+    response = await testClient.get("/test.txt", headers={"If-None-Match": etag})
+    assert 200 == response.status
+    assert b"after the edit" == await response.read()
+    assert etag != response.headers["ETag"]
+
+
+async def test_viewContent(testClient):
+    query = {"project": "MutatorSans.designspace"}
+    response = await testClient.get("/editor/", params=query)
+    assert 200 == response.status
+    assert "text/html" == response.content_type
+    etag = response.headers["ETag"]
+
+    response = await testClient.get(
+        "/editor/", params=query, headers={"If-None-Match": etag}
+    )
+    assert 304 == response.status
+
+
+async def test_glyphOutline(testClient):
+    query = {"project": "MutatorSans.designspace", "glyph": "A", "location": "{}"}
+    response = await testClient.get("/glyphoutline", params=query)
+    assert 200 == response.status
+    assert "no-cache" == response.headers["Cache-Control"]
+    etag = response.headers["ETag"]
+    outline = await response.json()
+    assert outline["path"].startswith("M")
+    assert 0 == outline["sourceIndex"]
+
+    response = await testClient.get(
+        "/glyphoutline", params=query, headers={"If-None-Match": etag}
+    )
+    assert 304 == response.status
+
+    response = await testClient.get(
+        "/glyphoutline", params=query | {"location": '{"weight": 500}'}
+    )
+    assert 200 == response.status
+    assert etag != response.headers["ETag"]
+
+    response = await testClient.get(
+        "/glyphoutline", params=query | {"glyph": "A.doesnotexist"}
+    )
+    assert 404 == response.status
+
+    response = await testClient.get(
+        "/glyphoutline", params=query | {"project": "DoesNotExist.designspace"}
+    )
+    assert 404 == response.status
+
+    response = await testClient.get("/glyphoutline", params={"project": "x"})
+    assert 400 == response.status
+
+    for location in ["[]", '{"weight": "bold"}', '{"weight": true}', "null"]:
+        response = await testClient.get(
+            "/glyphoutline", params=query | {"location": location}
+        )
+        assert 400 == response.status
+
+
+async def test_glyphOutline_error(testClient, monkeypatch):
+    async def getKeyedGlyphOutline(self, glyphName, sourceLocation):
+        raise ValueError("incompatible sources")
+
+    monkeypatch.setattr(FontHandler, "getKeyedGlyphOutline", getKeyedGlyphOutline)
+    query = {"project": "MutatorSans.designspace", "glyph": "A", "location": "{}"}
+    response = await testClient.get("/glyphoutline", params=query)
+    assert 422 == response.status
+
+
+@pytest.mark.parametrize(
+    "acceptEncoding, expectedEncodings",
+    [
+        ("", set()),
+        ("gzip", {"gzip"}),
+        ("gzip, deflate, br", {"gzip", "deflate", "br"}),
+        ("br;q=0, gzip;q=0.5", {"gzip"}),
+        ("GZIP ; q=1.0", {"gzip"}),
+    ],
+)
+def test_parseAcceptEncoding(acceptEncoding, expectedEncodings):
+    assert expectedEncodings == parseAcceptEncoding(acceptEncoding)
@@ -0,0 +1,16 @@
+import operator
+
+from fontra.core.subprocess import ProcessPool
+
+
+async def test_processPool():
+    pool = ProcessPool(name="test", maxWorkers=2)
+    try:
+        assert 5 == await pool.run(operator.add, 2, 3)
+        results = await pool.map(operator.neg, range(10), chunkSize=3)
+        assert [-i for i in range(10)] == results
+        assert 5 == pool.statistics.numCalls  # 1 run + 4 chunks
+        assert 0 == pool.statistics.numPending
+        assert pool.statistics.maxRunTime <= pool.statistics.totalRunTime
+    finally:
+        pool.shutdown()
@@ -77,6 +77,15 @@ interface RemoteFont {
 
   getGlyph(identifier: string): Promise<IntoVariableGlyph>;
 
+  /**
+   * Get multiple glyphs at once. If `withRevisions` is true, each value is an
+   * object with the glyph's `revision` and the `glyph` itself.
+   */
+  getGlyphs(
+    identifiers: string[],
+    withRevisions?: boolean
+  ): Promise<Record<string, any>>;
+
   getSources(): Promise<Record<string, FontSource>>;
 
   getUnitsPerEm(): Promise<number>;